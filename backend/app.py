@@ -25,15 +25,23 @@ Endpoints:
 """
 
 import os
+import atexit
 import csv
 import io
-import uuid
+from secrets import token_hex
 import hashlib
+import hmac
+import math
 import time
 import bcrypt
 import logging
 import sys
-from flask import Flask, request, jsonify, session
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from itertools import groupby
+from flask import Flask, request, jsonify, session, Response, stream_with_context, make_response, g
 from flask_cors import CORS
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
@@ -41,9 +49,11 @@ from flask_limiter.errors import RateLimitExceeded
 from marshmallow import ValidationError
 from dotenv import load_dotenv
 import psycopg
+from psycopg.pq import TransactionStatus
+from psycopg.rows import dict_row
 from psycopg_pool import ConnectionPool
 from token_storage import get_token_storage
-from cache import cached, invalidate_cache
+from cache import cached, schedule_invalidate, get_cache, invalidate_cache
 from schemas import (
     RadiusSearchSchema,
     NearestSearchSchema,
@@ -55,6 +65,16 @@ from schemas import (
     ExportSchema
 )
 
+# Schemas are stateless once built, so build each one once and reuse it for every request
+RADIUS_SEARCH_SCHEMA = RadiusSearchSchema()
+NEAREST_SEARCH_SCHEMA = NearestSearchSchema()
+BOUNDING_BOX_SCHEMA = BoundingBoxSchema()
+ADD_PLACE_SCHEMA = AddPlaceSchema()
+LOGIN_SCHEMA = LoginSchema()
+ANALYTICS_DENSITY_SCHEMA = AnalyticsDensitySchema()
+DISTANCE_MATRIX_SCHEMA = DistanceMatrixSchema()
+EXPORT_SCHEMA = ExportSchema()
+
 # CRITICAL FIX: Structured logging for production monitoring
 try:
     from pythonjsonlogger import jsonlogger
@@ -72,6 +92,14 @@ except ImportError:
     SENTRY_AVAILABLE = False
     print("⚠️  sentry-sdk not installed. Error tracking disabled.")
 
+# Fast JSON encoding for large feature collections (falls back to jsonify)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    print("⚠️  orjson not installed. Using standard JSON encoding.")
+
 load_dotenv()
 BASE_DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://postgres@localhost:5432/geoapp")
 
@@ -132,7 +160,7 @@ if redis_available:
             key_func=get_remote_address,
             default_limits=["5000 per day", "500 per hour"],
             storage_uri=redis_url,
-            strategy="fixed-window",
+            strategy="moving-window",  # Sliding window - no 2x burst at window boundaries
             swallow_errors=True  # Don't crash if Redis fails during request
         )
         app.logger.info("✅ Rate limiting initialized with Redis")
@@ -142,6 +170,13 @@ if redis_available:
         redis_available = False
 
 if not redis_available:
+    # Each worker process would keep its own counters, multiplying every limit
+    # (e.g. 5/minute on login) by the number of workers - refuse in production
+    if os.getenv("ENVIRONMENT") == "production":
+        raise ValueError(
+            "CRITICAL: Rate limiting needs Redis in production. "
+            "Could not use REDIS_URL - in-memory limits aren't shared between workers."
+        )
     limiter = Limiter(
         app=app,
         key_func=get_remote_address,
@@ -150,6 +185,16 @@ if not redis_available:
         swallow_errors=True
     )
 
+@limiter.request_filter
+def exempt_preflight_requests():
+    """Don't count CORS preflights against rate limits.
+    
+    The limiter's check runs before handle_options_request, so every browser
+    POST/PUT/DELETE otherwise paid a storage round-trip for its preflight and
+    used up two hits of the endpoint's limit (e.g. 5 of the 10/hour on /places/add).
+    """
+    return request.method == 'OPTIONS'
+
 # CRITICAL FIX: Configure structured logging for production monitoring
 if JSON_LOGGING_AVAILABLE:
     # Use JSON logging for structured output (easier to parse in production)
@@ -198,36 +243,34 @@ if SENTRY_AVAILABLE and os.getenv("ENVIRONMENT") == "production":
 elif not SENTRY_AVAILABLE:
     app.logger.info("Sentry not available (install sentry-sdk for error tracking)")
 
+# CORS preflight responses are identical apart from the echoed origin, so the
+# headers are built once at import instead of on every preflight
+PREFLIGHT_ALLOWED_ORIGINS = frozenset(["http://localhost:3000", "http://127.0.0.1:3000", "http://localhost:8000", "http://127.0.0.1:8000"])
+PREFLIGHT_DEFAULT_ORIGIN = "http://localhost:3000"
+PREFLIGHT_HEADERS = {
+    'Access-Control-Allow-Headers': 'Content-Type, Authorization, X-Auth-Token, X-User-Role',
+    'Access-Control-Allow-Methods': 'GET, POST, PUT, DELETE, OPTIONS',
+    'Access-Control-Allow-Credentials': 'true',
+    'Access-Control-Max-Age': '3600',
+    'Vary': 'Origin',
+}
+
+def preflight_response():
+    """Empty 204 answer to a CORS preflight, echoing the origin if it's allowed."""
+    origin = request.headers.get('Origin')
+    if origin not in PREFLIGHT_ALLOWED_ORIGINS:
+        origin = PREFLIGHT_DEFAULT_ORIGIN
+    return '', 204, {**PREFLIGHT_HEADERS, 'Access-Control-Allow-Origin': origin}
+
 # Add request context to all logs
 @app.before_request
 def handle_options_request():
-    """Handle OPTIONS requests globally before any other processing."""
+    """Handle OPTIONS requests globally before any other processing.
+    
+    This runs before every route, so routes don't need their own OPTIONS branch.
+    """
     if request.method == 'OPTIONS':
-        try:
-            # Create response with proper CORS headers
-            response = jsonify({})
-            origin = request.headers.get('Origin', 'http://localhost:3000')
-            # Only allow known origins
-            allowed_origins = ["http://localhost:3000", "http://127.0.0.1:3000", "http://localhost:8000", "http://127.0.0.1:8000"]
-            if origin in allowed_origins:
-                response.headers.add('Access-Control-Allow-Origin', origin)
-            else:
-                response.headers.add('Access-Control-Allow-Origin', 'http://localhost:3000')
-            response.headers.add('Access-Control-Allow-Headers', 'Content-Type, Authorization, X-Auth-Token, X-User-Role')
-            response.headers.add('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS')
-            response.headers.add('Access-Control-Allow-Credentials', 'true')
-            response.headers.add('Access-Control-Max-Age', '3600')
-            return response
-        except Exception as e:
-            # If anything fails, return a simple response
-            app.logger.error(f"Error in OPTIONS handler: {e}", exc_info=True)
-            from flask import Response
-            resp = Response(status=200)
-            resp.headers.add('Access-Control-Allow-Origin', 'http://localhost:3000')
-            resp.headers.add('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS')
-            resp.headers.add('Access-Control-Allow-Headers', 'Content-Type, Authorization, X-Auth-Token')
-            resp.headers.add('Access-Control-Allow-Credentials', 'true')
-            return resp
+        return preflight_response()
 
 @app.before_request
 def log_request_info():
@@ -326,7 +369,16 @@ def generate_token(username, user_id=None):
     return token
 
 def get_user_id_from_request():
-    """Get user_id from token (for personal lists)."""
+    """Get user_id from token (for personal lists).
+    
+    Remembered on flask.g, so repeated calls within a request don't repeat
+    the token lookup.
+    """
+    if 'user_id' not in g:
+        g.user_id = _user_id_from_token()
+    return g.user_id
+
+def _user_id_from_token():
     token = request.headers.get('X-Auth-Token') or (request.headers.get('Authorization', '').replace('Bearer ', '').strip())
     if not token:
         return None
@@ -335,57 +387,141 @@ def get_user_id_from_request():
     token_data = storage.get_token_data(token)
     return token_data.get("user_id") if token_data else None
 
+def require_auth(func):
+    """Reject requests without a valid token; the caller's id is then in g.user_id."""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        user_id = get_user_id_from_request()
+        if not user_id:
+            app.logger.warning("Unauthenticated request to %s from %s", request.path, request.remote_addr)
+            return jsonify({"error": "Authentication required"}), 401
+        return func(*args, **kwargs)
+    return wrapper
+
+# Shared list status for places the user hasn't saved anywhere (read-only, never mutate)
+_NO_STATUS = {"visited": False, "in_wishlist": False, "liked": False}
+
+# Per-process cache of list status so overlapping searches by the same user
+# don't re-query places they just saw. Maps (user_id, place_id) -> (cached_at, status);
+# bounded LRU, oldest entries evicted first. Entries are dropped when this
+# process changes a list, and expire after the TTL for changes made elsewhere.
+LIST_STATUS_CACHE_TTL = 30  # seconds
+LIST_STATUS_CACHE_MAX_ENTRIES = 100000
+_list_status_cache = OrderedDict()
+_list_status_cache_lock = threading.Lock()
+
+def invalidate_list_status_cache(user_id, place_id):
+    """Drop the cached list status of one place after the user's lists change."""
+    try:
+        key = (user_id, int(place_id))
+    except (TypeError, ValueError):
+        return
+    with _list_status_cache_lock:
+        _list_status_cache.pop(key, None)
+
 def get_places_list_status(user_id, place_ids):
     """Get list status (visited, wishlist, liked) for multiple places.
     Returns dict: {place_id: {"visited": bool, "in_wishlist": bool, "liked": bool}}
+    Only places on at least one list are included; use .get(place_id, _NO_STATUS).
     """
     if not user_id or not place_ids:
         return {}
     
+    # Serve what we can from the cache and only query the misses
+    status = {}
+    place_ids_list = []
+    now = time.time()
+    with _list_status_cache_lock:
+        for pid in place_ids:
+            entry = _list_status_cache.get((user_id, pid))
+            if entry and now - entry[0] < LIST_STATUS_CACHE_TTL:
+                if entry[1] is not _NO_STATUS:
+                    status[pid] = entry[1]
+            else:
+                place_ids_list.append(pid)
+    
+    if not place_ids_list:
+        return status
+    
     try:
-        place_ids_list = list(place_ids)
-        with get_conn() as conn, conn.cursor() as cur:
-            # Get visited
+        with get_read_conn() as conn, conn.cursor() as cur:
+            # All three lists in one round trip, tagged with the list they came from
             cur.execute("""
-                SELECT place_id FROM user_visited_places 
+                SELECT place_id, 'visited' FROM user_visited_places
                 WHERE user_id = %s AND place_id = ANY(%s)
-            """, (user_id, place_ids_list))
-            visited_ids = {row[0] for row in cur.fetchall()}
-            
-            # Get wishlist
-            cur.execute("""
-                SELECT place_id FROM user_wishlist 
+                UNION ALL
+                SELECT place_id, 'in_wishlist' FROM user_wishlist
                 WHERE user_id = %s AND place_id = ANY(%s)
-            """, (user_id, place_ids_list))
-            wishlist_ids = {row[0] for row in cur.fetchall()}
-            
-            # Get liked
-            cur.execute("""
-                SELECT place_id FROM user_liked_places 
+                UNION ALL
+                SELECT place_id, 'liked' FROM user_liked_places
                 WHERE user_id = %s AND place_id = ANY(%s)
-            """, (user_id, place_ids_list))
-            liked_ids = {row[0] for row in cur.fetchall()}
-            
-            # Build result dict
-            status = {}
-            for pid in place_ids_list:
-                status[pid] = {
+            """, (user_id, place_ids_list, user_id, place_ids_list, user_id, place_ids_list))
+            visited_ids, wishlist_ids, liked_ids = set(), set(), set()
+            lists = {"visited": visited_ids, "in_wishlist": wishlist_ids, "liked": liked_ids}
+            for pid, list_name in cur.fetchall():
+                lists[list_name].add(pid)
+            
+            # Build result dict (only for places that appear on some list)
+            fetched = {}
+            for pid in visited_ids | wishlist_ids | liked_ids:
+                fetched[pid] = {
                     "visited": pid in visited_ids,
                     "in_wishlist": pid in wishlist_ids,
                     "liked": pid in liked_ids
                 }
-            
-            return status
+        
+        with _list_status_cache_lock:
+            for pid in place_ids_list:
+                key = (user_id, pid)
+                _list_status_cache[key] = (now, fetched.get(pid, _NO_STATUS))
+                _list_status_cache.move_to_end(key)
+            while len(_list_status_cache) > LIST_STATUS_CACHE_MAX_ENTRIES:
+                _list_status_cache.popitem(last=False)
+        
+        status.update(fetched)
+        return status
     except Exception as e:
         app.logger.error(f"Error getting list status: {e}")
         return {}
 
+# Small in-process cache of recently validated tokens so clients re-sending the
+# same token don't pay a Redis round-trip on every request.
+# Maps token -> (validated_at, user_role); bounded LRU, oldest entries evicted first.
+TOKEN_CACHE_TTL = 30  # seconds
+TOKEN_CACHE_MAX_ENTRIES = 10000
+_token_cache = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+def invalidate_token_cache(token):
+    """Drop a token from the in-process validation cache (e.g. on logout)."""
+    if not token:
+        return
+    with _token_cache_lock:
+        _token_cache.pop(token, None)
+
+# Logout on any worker publishes the token; drop it here too so the cache TTL
+# never keeps a revoked token alive on another process
+try:
+    get_token_storage().subscribe_revocations(invalidate_token_cache)
+except Exception as e:
+    app.logger.warning(f"⚠️  Token revocation listener not started: {e}")
+
 def validate_token(token):
     """Validate token from Redis (or in-memory fallback) and return user role if valid."""
     if not token:
         app.logger.warning(f"validate_token: No token provided")
         return None
     
+    now = time.time()
+    with _token_cache_lock:
+        cached_entry = _token_cache.get(token)
+        if cached_entry is not None:
+            validated_at, user_role = cached_entry
+            if now - validated_at < TOKEN_CACHE_TTL:
+                _token_cache.move_to_end(token)
+                return user_role
+            del _token_cache[token]
+    
     storage = get_token_storage()
     token_data = storage.get_token_data(token)
     
@@ -393,16 +529,32 @@ def validate_token(token):
         app.logger.warning(f"validate_token: Token not found or expired")
         return None
     
-    app.logger.info(f"validate_token: Token valid, role: {token_data.get('user_role')}")
-    return token_data.get("user_role")
+    user_role = token_data.get("user_role")
+    with _token_cache_lock:
+        _token_cache[token] = (now, user_role)
+        _token_cache.move_to_end(token)
+        if len(_token_cache) > TOKEN_CACHE_MAX_ENTRIES:
+            _token_cache.popitem(last=False)
+    
+    app.logger.info(f"validate_token: Token valid, role: {user_role}")
+    return user_role
 
 def get_user_role_from_request():
-    """Get user role from either session, token, or header."""
+    """Get user role from either session, token, or header.
+    
+    get_conn() asks for the role on every checkout, so the answer is remembered
+    on flask.g for the rest of the request.
+    """
     # Handle case where we're outside request context (e.g., during testing)
     from flask import has_request_context
     if not has_request_context():
         return None
     
+    if 'user_role' not in g:
+        g.user_role = _user_role_from_credentials()
+    return g.user_role
+
+def _user_role_from_credentials():
     # Method 1: Check Authorization header (Bearer token)
     auth_header = request.headers.get('Authorization', '')
     if auth_header.startswith('Bearer '):
@@ -433,6 +585,7 @@ def get_user_role_from_request():
 # CRITICAL FIX: Connection pooling for better performance and scalability
 # Instead of creating new connection per request, reuse connections from pool
 _pools = {}  # Cache of connection pools by database URL
+_pools_lock = threading.Lock()  # Guards pool creation so concurrent first requests don't each open a pool
 
 class PooledConnection:
     """Wrapper to automatically return connection to pool when used as context manager."""
@@ -444,6 +597,19 @@ class PooledConnection:
         return self.conn
     
     def __exit__(self, exc_type, exc_val, exc_tb):
+        # Read-only endpoints never commit, so most connections come back inside a
+        # transaction. End it here - putconn would roll back too, but logs a
+        # "rolling back returned connection" warning for every such request.
+        if self.conn.info.transaction_status in (TransactionStatus.INTRANS, TransactionStatus.INERROR):
+            try:
+                self.conn.rollback()
+            except psycopg.Error:
+                pass  # Broken connection - the pool discards it on putconn
+        if self.conn.autocommit:
+            try:
+                self.conn.autocommit = False  # Borrowed via get_read_conn() - restore pool default
+            except psycopg.Error:
+                pass
         # Return connection to pool
         self.pool.putconn(self.conn)
         return False  # Don't suppress exceptions
@@ -453,29 +619,56 @@ class PooledConnection:
         return getattr(self.conn, name)
 
 def get_pool(db_url):
-    """Get or create connection pool for a database URL."""
-    if db_url not in _pools:
-        pool_size = int(os.getenv("DB_POOL_SIZE", "10"))
-        
-        try:
-            pool = ConnectionPool(
-                db_url,
-                min_size=2,
-                max_size=pool_size,
-                max_waiting=10,
-                max_idle=300,  # 5 minutes
-                reconnect_timeout=60,
-                open=False  # Don't open immediately
-            )
-            pool.open()
-            _pools[db_url] = pool
-            app.logger.info(f"✅ Created connection pool (size: {pool_size})")
-        except Exception as e:
-            app.logger.error(f"Failed to create connection pool: {e}")
-            raise
+    """Get or create connection pool for a database URL.
+    
+    Uses double-checked locking: the hot path is a lock-free dict lookup, and
+    only the first request for a URL takes the lock to create the pool.
+    """
+    pool = _pools.get(db_url)
+    if pool is not None:
+        return pool
+    
+    with _pools_lock:
+        # Another thread may have created the pool while we waited for the lock
+        if db_url not in _pools:
+            pool_size = int(os.getenv("DB_POOL_SIZE", "10"))
+            # Connections kept open even when idle - raise this so bursts of writes
+            # don't pay for new connections while the pool grows
+            pool_min_size = min(int(os.getenv("DB_POOL_MIN_SIZE", "2")), pool_size)
+            
+            try:
+                pool = ConnectionPool(
+                    db_url,
+                    min_size=pool_min_size,
+                    max_size=pool_size,
+                    max_waiting=10,
+                    max_idle=300,  # 5 minutes
+                    reconnect_timeout=60,
+                    check=ConnectionPool.check_connection,  # Revalidate idle connections on checkout
+                    open=False  # Don't open immediately
+                )
+                pool.open()
+                _pools[db_url] = pool
+                app.logger.info(f"✅ Created connection pool (size: {pool_min_size}-{pool_size})")
+            except Exception as e:
+                app.logger.error(f"Failed to create connection pool: {e}")
+                raise
     
     return _pools[db_url]
 
+@atexit.register
+def close_pools():
+    """Close every connection pool on interpreter exit so the server isn't left
+    holding idle connections until they time out."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        try:
+            pool.close()
+        except Exception as e:
+            app.logger.warning(f"Failed to close connection pool: {e}")
+
 def get_conn():
     """Get database connection from pool. Uses role-based connection if user is logged in.
     
@@ -510,30 +703,78 @@ def get_conn():
             app.logger.error(f"Fallback connection also failed: {fallback_error}")
             raise
 
+def get_read_conn():
+    """get_conn() for endpoints that only SELECT.
+    
+    The connection is in autocommit mode, so there is no BEGIN before the first
+    query and no ROLLBACK when it goes back to the pool.
+    """
+    conn = get_conn()
+    raw_conn = conn.conn if isinstance(conn, PooledConnection) else conn
+    raw_conn.autocommit = True
+    return conn
+
+LOGIN_PROBE_TIMEOUT = 5  # seconds to wait for a pooled connection when verifying a login
+_role_retry_at = {}  # Role URL -> time.monotonic() before which logins skip its probe
+
+def probe_pool(db_url):
+    """Check that a database URL is usable by running SELECT 1 on a pooled connection.
+    
+    Reuses the same pool get_conn() will serve the role from, so a login costs
+    a pool checkout instead of a fresh TCP/TLS/auth handshake. A role whose
+    pool has never connected is skipped for ROLE_RETRY_BACKOFF after a failed
+    probe; a timeout on a pool that has connected before (a load spike) isn't
+    remembered.
+    """
+    if time.monotonic() < _role_retry_at.get(db_url, 0.0):
+        raise psycopg.OperationalError("role connection failed recently; using base connection")
+    pool = None
+    try:
+        pool = get_pool(db_url)
+        with pool.connection(timeout=LOGIN_PROBE_TIMEOUT) as conn:
+            conn.execute("SELECT 1")
+    except Exception:
+        if db_url != BASE_DATABASE_URL and (pool is None or not role_has_connected(pool)):
+            _role_retry_at[db_url] = time.monotonic() + ROLE_RETRY_BACKOFF
+        raise
+    _role_retry_at.pop(db_url, None)
+
+# A role whose pool never managed to log in (e.g. role not created locally) is
+# skipped for this long before being tried again. A timeout on a pool that has
+# connected before is just contention and never marks the role unavailable.
+ROLE_RETRY_BACKOFF = 60  # seconds
+ADMIN_CONN_TIMEOUT = 5  # seconds to wait for a pooled admin_user connection
+_admin_role_retry_at = 0.0  # time.monotonic() before which admin_user is skipped
+
+def role_has_connected(pool):
+    """True if the pool has ever opened a connection, i.e. its credentials work."""
+    return pool.get_stats().get("connections_num", 0) > 0
+
 def get_admin_conn():
     """Get database connection with admin privileges from pool.
     
     Tries admin_user first, falls back to BASE_DATABASE_URL if admin_user
     doesn't exist or authentication fails (for local development).
     """
+    global _admin_role_retry_at
     try:
         # Try admin_user role first (if configured)
-        if "admin_user" in DB_ROLES and DB_ROLES["admin_user"].get("password"):
+        if not ("admin_user" in DB_ROLES and DB_ROLES["admin_user"].get("password")):
+            app.logger.info("ℹ️  Admin user not configured, using base connection")
+        elif time.monotonic() >= _admin_role_retry_at:
+            # No separate test connection here - the pool validates connections
+            # on checkout, so a bad admin_user login surfaces from getconn()
+            pool = get_pool(get_database_url_for_role("admin_user"))
             try:
-                role_db_url = get_database_url_for_role("admin_user")
-                # Test connection first before getting from pool
-                test_conn = psycopg.connect(role_db_url)
-                test_conn.close()
-                # If test succeeds, use the pool
-                pool = get_pool(role_db_url)
-                conn = pool.getconn()
+                conn = pool.getconn(timeout=ADMIN_CONN_TIMEOUT)
                 return PooledConnection(conn, pool)
-            except (psycopg.OperationalError, psycopg.Error) as e:
+            except psycopg.Error as e:
                 app.logger.warning(f"⚠️  Admin user connection failed: {e}")
                 app.logger.warning("⚠️  Falling back to base database connection")
+                if not role_has_connected(pool):
+                    # Login never worked - don't make the next requests wait on it too
+                    _admin_role_retry_at = time.monotonic() + ROLE_RETRY_BACKOFF
                 # Fall through to base connection
-        else:
-            app.logger.info("ℹ️  Admin user not configured, using base connection")
         
         # Fallback to base URL (postgres user) - works for local development
         pool = get_pool(BASE_DATABASE_URL)
@@ -553,6 +794,68 @@ def get_admin_conn():
         # Always fallback to base connection
         return psycopg.connect(BASE_DATABASE_URL)
 
+MV_REFRESH_DELAY = 2  # seconds; writes within this window share one refresh
+_mv_refresh_lock = threading.Lock()
+_mv_refresh_timer = None
+
+def schedule_mv_refresh():
+    """Queue a places_with_types_mv refresh off the request path.
+    
+    Like schedule_invalidate: writes within MV_REFRESH_DELAY are coalesced into
+    one refresh by a single background timer, so bulk edits don't each rebuild
+    the whole view.
+    """
+    global _mv_refresh_timer
+    with _mv_refresh_lock:
+        if _mv_refresh_timer is None:
+            _mv_refresh_timer = threading.Timer(MV_REFRESH_DELAY, refresh_places_with_types_mv)
+            _mv_refresh_timer.daemon = True
+            _mv_refresh_timer.start()
+
+def refresh_places_with_types_mv():
+    """Refresh the places_with_types_mv materialized view after places change.
+    
+    Uses an admin connection because REFRESH requires ownership of the view.
+    Failures are logged, not raised - searches fall back to slightly stale data.
+    """
+    global _mv_refresh_timer
+    # Clear the timer first so writes landing mid-refresh queue another one
+    with _mv_refresh_lock:
+        _mv_refresh_timer = None
+    try:
+        with get_admin_conn() as conn, conn.cursor() as cur:
+            cur.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY places_with_types_mv")
+            conn.commit()
+    except psycopg.errors.UndefinedTable:
+        pass  # Migration not applied - searches use the regular view
+    except Exception as e:
+        app.logger.warning(f"Failed to refresh places_with_types_mv: {e}")
+
+KM_PER_DEGREE_LAT = 111.32
+
+def radius_envelope(lat, lon, radius_km):
+    """Return a (west, south, east, north) box in degrees enclosing a radius around a point.
+    
+    Used as an index-friendly `geom && envelope` prefilter ahead of the exact
+    geography ST_DWithin check. The longitude half-width is asin(sin(r)/cos(lat))
+    rather than r/cos(lat), which undershoots at high latitudes; when the circle
+    reaches a pole the box spans every longitude. Returns None across the
+    antimeridian, where a single lon/lat box can't enclose the circle.
+    """
+    radius_km *= 1.01  # Pad for the spheroid vs. sphere difference so no edge points are dropped
+    lat_delta = radius_km / KM_PER_DEGREE_LAT
+    south, north = lat - lat_delta, lat + lat_delta
+    if north >= 90 or south <= -90:
+        return (-180, max(south, -90), 180, min(north, 90))
+    sin_ratio = math.sin(math.radians(lat_delta)) / math.cos(math.radians(lat))
+    if sin_ratio >= 1:
+        return (-180, south, 180, north)
+    lon_delta = math.degrees(math.asin(sin_ratio))
+    west, east = lon - lon_delta, lon + lon_delta
+    if west < -180 or east > 180:
+        return None
+    return (west, south, east, north)
+
 def validate_coordinates(lat, lon):
     """Validate latitude and longitude ranges."""
     if not (-90 <= lat <= 90):
@@ -571,6 +874,67 @@ def validate_bbox(north, south, east, west):
         raise ValueError("East must be greater than west")
     return True
 
+# Common state name to abbreviation mapping (used by state-filtered searches)
+STATE_ABBREVIATIONS = {
+    "texas": "TX", "california": "CA", "new york": "NY", "florida": "FL",
+    "illinois": "IL", "pennsylvania": "PA", "ohio": "OH", "georgia": "GA",
+    "north carolina": "NC", "michigan": "MI", "new jersey": "NJ",
+    "virginia": "VA", "washington": "WA", "arizona": "AZ", "massachusetts": "MA",
+    "tennessee": "TN", "indiana": "IN", "missouri": "MO", "maryland": "MD",
+    "wisconsin": "WI", "colorado": "CO", "minnesota": "MN", "south carolina": "SC",
+    "alabama": "AL", "louisiana": "LA", "kentucky": "KY", "oregon": "OR",
+    "oklahoma": "OK", "connecticut": "CT", "utah": "UT", "iowa": "IA",
+    "nevada": "NV", "arkansas": "AR", "mississippi": "MS", "kansas": "KS",
+    "new mexico": "NM", "nebraska": "NE", "west virginia": "WV", "idaho": "ID",
+    "hawaii": "HI", "new hampshire": "NH", "maine": "ME", "montana": "MT",
+    "rhode island": "RI", "delaware": "DE", "south dakota": "SD", "north dakota": "ND",
+    "alaska": "AK", "vermont": "VT", "wyoming": "WY", "district of columbia": "DC"
+}
+
+# Approximate state bounding boxes as (west, south, east, north) in EPSG:4326.
+# Used as an index-friendly `geom && ST_MakeEnvelope(...)` prefilter so state-filtered
+# radius searches don't have to scan a 500km geography buffer.
+# Regenerate with: SELECT state, ST_Extent(geom) FROM places GROUP BY state;
+STATE_BBOXES = {
+    "AL": (-88.48, 30.14, -84.89, 35.01), "AK": (-179.15, 51.21, -129.98, 71.39),
+    "AZ": (-114.82, 31.33, -109.05, 37.00), "AR": (-94.62, 33.00, -89.64, 36.50),
+    "CA": (-124.41, 32.53, -114.13, 42.01), "CO": (-109.06, 36.99, -102.04, 41.00),
+    "CT": (-73.73, 40.98, -71.79, 42.05), "DE": (-75.79, 38.45, -75.05, 39.84),
+    "DC": (-77.12, 38.79, -76.91, 38.99), "FL": (-87.63, 24.52, -80.03, 31.00),
+    "GA": (-85.61, 30.36, -80.84, 35.00), "HI": (-160.25, 18.91, -154.81, 22.24),
+    "ID": (-117.24, 41.99, -111.04, 49.00), "IL": (-91.51, 36.97, -87.49, 42.51),
+    "IN": (-88.10, 37.77, -84.78, 41.76), "IA": (-96.64, 40.38, -90.14, 43.50),
+    "KS": (-102.05, 36.99, -94.59, 40.00), "KY": (-89.57, 36.50, -81.96, 39.15),
+    "LA": (-94.04, 28.93, -88.82, 33.02), "ME": (-71.08, 43.06, -66.95, 47.46),
+    "MD": (-79.49, 37.91, -75.05, 39.72), "MA": (-73.51, 41.24, -69.93, 42.89),
+    "MI": (-90.42, 41.70, -82.41, 48.31), "MN": (-97.24, 43.50, -89.49, 49.38),
+    "MS": (-91.66, 30.17, -88.10, 35.00), "MO": (-95.77, 35.99, -89.10, 40.61),
+    "MT": (-116.05, 44.36, -104.04, 49.00), "NE": (-104.05, 40.00, -95.31, 43.00),
+    "NV": (-120.01, 35.00, -114.04, 42.00), "NH": (-72.56, 42.70, -70.61, 45.31),
+    "NJ": (-75.56, 38.93, -73.89, 41.36), "NM": (-109.05, 31.33, -103.00, 37.00),
+    "NY": (-79.76, 40.50, -71.86, 45.02), "NC": (-84.32, 33.84, -75.46, 36.59),
+    "ND": (-104.05, 45.94, -96.55, 49.00), "OH": (-84.82, 38.40, -80.52, 41.98),
+    "OK": (-103.00, 33.62, -94.43, 37.00), "OR": (-124.57, 41.99, -116.46, 46.29),
+    "PA": (-80.52, 39.72, -74.69, 42.27), "RI": (-71.86, 41.15, -71.12, 42.02),
+    "SC": (-83.35, 32.03, -78.54, 35.22), "SD": (-104.06, 42.48, -96.44, 45.95),
+    "TN": (-90.31, 34.98, -81.65, 36.68), "TX": (-106.65, 25.84, -93.51, 36.50),
+    "UT": (-114.05, 37.00, -109.04, 42.00), "VT": (-73.44, 42.73, -71.46, 45.02),
+    "VA": (-83.68, 36.54, -75.24, 39.47), "WA": (-124.85, 45.54, -116.92, 49.00),
+    "WV": (-82.64, 37.20, -77.72, 40.64), "WI": (-92.89, 42.49, -86.25, 47.31),
+    "WY": (-111.06, 40.99, -104.05, 45.01)
+}
+STATE_BBOX_MARGIN = 0.1  # Degrees of padding so geocoding noise near borders isn't cut off
+
+def resolve_state_abbreviation(state_filter):
+    """Resolve a state name or 2-letter code to its abbreviation, or None if unknown."""
+    state_lower = state_filter.lower().strip()
+    abbrev = STATE_ABBREVIATIONS.get(state_lower)
+    if abbrev:
+        return abbrev
+    if len(state_lower) == 2 and state_lower.upper() in STATE_BBOXES:
+        return state_lower.upper()
+    return None
+
 @app.get("/health")
 def health():
     """Health check endpoint that also tests database connection."""
@@ -582,12 +946,51 @@ def health():
     except Exception as e:
         return jsonify({"status": "error", "database": "disconnected", "error": str(e)}), 503
 
+def conditional_response(max_age=300):
+    """Add a strong ETag and Cache-Control to successful responses of a read-only endpoint.
+    
+    The ETag is a hash of the JSON body, so a client re-sending it in
+    If-None-Match gets an empty 304 while the data hasn't changed.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            response = make_response(func(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            response.set_etag(hashlib.blake2b(response.get_data(), digest_size=8).hexdigest())
+            response.headers['Cache-Control'] = f'public, max-age={max_age}'
+            return response.make_conditional(request)
+        return wrapper
+    return decorator
+
+def json_response(obj):
+    """Encode a large response body with orjson when available.
+    
+    Types orjson doesn't know natively (Decimal, dates) go through Flask's
+    JSON default hook, so output matches jsonify.
+    """
+    if ORJSON_AVAILABLE:
+        return Response(orjson.dumps(obj, default=app.json.default), mimetype='application/json')
+    return jsonify(obj)
+
+# Column order of the within_radius SELECT; each name is also the feature key in the response
+RADIUS_FEATURE_COLUMNS = (
+    "id", "name", "city", "state", "country", "lat", "lon", "place_type",
+    "rating", "phone", "website", "cuisine_type", "price_range",
+    "hours_of_operation", "dietary_options", "outdoor_seating", "delivery",
+    "takeout", "reservations", "entry_fee", "description", "tourist_type",
+    "family_friendly", "accessibility", "pet_friendly", "guided_tours",
+    "tourist_hours", "star_rating", "price_per_night", "brewery_type",
+    "street", "postal_code"
+)
+
 @app.get("/within_radius")
 @limiter.limit("30 per minute")  # Prevent DDoS on search endpoints
 def within_radius():
     """Find all places within a radius of a point."""
     # CRITICAL FIX: Validate input using schema
-    schema = RadiusSearchSchema()
+    schema = RADIUS_SEARCH_SCHEMA
     try:
         data = schema.load(request.args)
     except ValidationError as err:
@@ -607,49 +1010,66 @@ def within_radius():
     if place_type_filter:
         place_types = [t.strip() for t in place_type_filter.split(",") if t.strip()]
     
-    # When a state is selected, use a minimum radius of 500km to ensure we get results
+    # When a known state is selected, scope the search with the state's bounding box
+    # (GiST-indexed `&&`) instead of the radius, so we get state-wide results cheaply.
+    state_bbox = None
+    if state_filter:
+        state_abbrev = resolve_state_abbreviation(state_filter)
+        state_bbox = STATE_BBOXES.get(state_abbrev) if state_abbrev else None
+    
+    # Unknown state: use a minimum radius of 500km to ensure we get results
     # Large states like Texas, California need a larger radius to cover the state
-    if state_filter and km < 500:
+    if state_filter and not state_bbox and km < 500:
         km = 500
         app.logger.info(f"State filter active: expanded radius to {km}km to ensure state-wide results")
     
-    # Use places_with_types view and join with type-specific tables to get ratings and additional info
+    # Use places_with_types_mv (materialized places_with_types) and join with type-specific tables to get ratings and additional info
     sql = """
     SELECT 
         p.id, p.name, p.city, p.state, p.country, p.lat, p.lon, p.place_type,
-        COALESCE(r.rating, tp.rating, h.rating) as rating,
+        COALESCE(r.rating, tp.rating, h.rating)::float8 as rating,
         COALESCE(r.phone, tp.phone, h.phone, b.phone) as phone,
         COALESCE(r.website, tp.website, h.website, b.website) as website,
         r.cuisine_type, r.price_range,
         r.hours_of_operation,
-        r.dietary_options,
-        r.outdoor_seating,
-        r.delivery,
-        r.takeout,
-        r.reservations,
-        tp.entry_fee, tp.description,
+        COALESCE(r.dietary_options, '{}'::text[]) as dietary_options,
+        COALESCE(r.outdoor_seating, false) as outdoor_seating,
+        COALESCE(r.delivery, false) as delivery,
+        COALESCE(r.takeout, false) as takeout,
+        COALESCE(r.reservations, false) as reservations,
+        tp.entry_fee::float8 as entry_fee, tp.description,
         tp.place_type as tourist_type,
-        tp.family_friendly,
-        tp.accessibility,
-        tp.pet_friendly,
-        tp.guided_tours,
+        COALESCE(tp.family_friendly, false) as family_friendly,
+        COALESCE(tp.accessibility, false) as accessibility,
+        COALESCE(tp.pet_friendly, false) as pet_friendly,
+        COALESCE(tp.guided_tours, false) as guided_tours,
         tp.hours_of_operation as tourist_hours,
-        h.star_rating, h.price_per_night,
+        h.star_rating, h.price_per_night::float8 as price_per_night,
         b.brewery_type,
         COALESCE(r.street, tp.street, h.street, b.street) as street,
         COALESCE(r.postal_code, tp.postal_code, h.postal_code, b.postal_code) as postal_code
-    FROM places_with_types p
+    FROM places_with_types_mv p
     LEFT JOIN restaurants r ON p.id = r.place_id AND p.place_type = 'restaurant'
     LEFT JOIN tourist_places tp ON p.id = tp.place_id AND p.place_type = 'tourist_place'
     LEFT JOIN hotels h ON p.id = h.place_id AND p.place_type = 'hotel'
     LEFT JOIN breweries b ON p.id = b.place_id AND p.place_type = 'brewery'
+    """
+    if state_bbox:
+        west, south, east, north = state_bbox
+        sql += "    WHERE p.geom && ST_MakeEnvelope(%s, %s, %s, %s, 4326)\n"
+        params = [
+            west - STATE_BBOX_MARGIN, south - STATE_BBOX_MARGIN,
+            east + STATE_BBOX_MARGIN, north + STATE_BBOX_MARGIN
+        ]
+    else:
+        sql += """
     WHERE ST_DWithin(
         p.geom::geography,
         ST_SetSRID(ST_MakePoint(%s, %s), 4326)::geography,
         %s * 1000
     )
     """
-    params = [lon, lat, km]
+        params = [lon, lat, km]
     
     # Filter by place type(s)
     if place_types:
@@ -661,23 +1081,7 @@ def within_radius():
         # This ensures users get results when searching within a state
         # Handle both full state names and abbreviations (e.g., "Texas" or "TX")
         state_lower = state_filter.lower().strip()
-        # Common state name to abbreviation mapping
-        state_to_abbrev = {
-            "texas": "TX", "california": "CA", "new york": "NY", "florida": "FL",
-            "illinois": "IL", "pennsylvania": "PA", "ohio": "OH", "georgia": "GA",
-            "north carolina": "NC", "michigan": "MI", "new jersey": "NJ",
-            "virginia": "VA", "washington": "WA", "arizona": "AZ", "massachusetts": "MA",
-            "tennessee": "TN", "indiana": "IN", "missouri": "MO", "maryland": "MD",
-            "wisconsin": "WI", "colorado": "CO", "minnesota": "MN", "south carolina": "SC",
-            "alabama": "AL", "louisiana": "LA", "kentucky": "KY", "oregon": "OR",
-            "oklahoma": "OK", "connecticut": "CT", "utah": "UT", "iowa": "IA",
-            "nevada": "NV", "arkansas": "AR", "mississippi": "MS", "kansas": "KS",
-            "new mexico": "NM", "nebraska": "NE", "west virginia": "WV", "idaho": "ID",
-            "hawaii": "HI", "new hampshire": "NH", "maine": "ME", "montana": "MT",
-            "rhode island": "RI", "delaware": "DE", "south dakota": "SD", "north dakota": "ND",
-            "alaska": "AK", "vermont": "VT", "wyoming": "WY", "district of columbia": "DC"
-        }
-        abbrev = state_to_abbrev.get(state_lower)
+        abbrev = STATE_ABBREVIATIONS.get(state_lower)
         if abbrev:
             sql += " AND (p.state ILIKE %s OR p.state ILIKE %s)"
             params.append(f"%{state_filter}%")
@@ -703,54 +1107,58 @@ def within_radius():
     try:
         user_id = get_user_id_from_request()
         with get_conn() as conn, conn.cursor() as cur:
-            cur.execute(sql, params)
+            # Binary results: ints/floats arrive without text parsing
+            try:
+                cur.execute(sql, params, binary=True)
+            except psycopg.errors.UndefinedTable:
+                # Materialized view not created yet (db/schema_places_with_types_mv.sql) - use the regular view
+                conn.rollback()
+                cur.execute(sql.replace("places_with_types_mv", "places_with_types"), params, binary=True)
             rows = cur.fetchall()
-            features = []
-            for r in rows:
-                # Generate a simple description if none exists
-                # Note: description is at index 20, tourist_type is at index 21
-                description = r[20] if len(r) > 20 and r[20] else None
-                place_type = r[7] if len(r) > 7 else "unknown"
+            # Fetch list status up front so it can be attached while building each feature
+            list_status = get_places_list_status(user_id, [r[0] for r in rows]) if user_id else None
+            features = [None] * len(rows)
+            for i, r in enumerate(rows):
+                # The SELECT has a fixed column order, so map it straight onto feature keys
+                feature = dict(zip(RADIUS_FEATURE_COLUMNS, r))
+                place_type = feature["place_type"]
+                city = feature["city"]
+                state = feature["state"]
                 
+                # Generate a simple description if none exists
+                description = feature["description"]
                 if not description or (isinstance(description, str) and not description.strip()):
                     # Create a basic description based on place type
                     if place_type == 'brewery':
-                        brewery_type = r[23] if len(r) > 23 and r[23] else 'brewery'
-                        brewery_type_display = brewery_type.replace('_', ' ').title() if brewery_type else 'Brewery'
-                        description = f"{brewery_type_display} located in {r[2]}, {r[3]}"
+                        brewery_type = feature["brewery_type"] or 'brewery'
+                        brewery_type_display = brewery_type.replace('_', ' ').title()
+                        description = f"{brewery_type_display} located in {city}, {state}"
                     elif place_type == 'restaurant':
-                        cuisine = r[11] if len(r) > 11 and r[11] else 'restaurant'
-                        cuisine_display = cuisine.replace('_', ' ').title() if cuisine else 'Restaurant'
-                        description = f"{cuisine_display} restaurant in {r[2]}, {r[3]}"
+                        cuisine = feature["cuisine_type"] or 'restaurant'
+                        cuisine_display = cuisine.replace('_', ' ').title()
+                        description = f"{cuisine_display} restaurant in {city}, {state}"
                     elif place_type == 'tourist_place':
-                        description = f"Tourist attraction in {r[2]}, {r[3]}"
+                        description = f"Tourist attraction in {city}, {state}"
                     elif place_type == 'hotel':
-                        stars = r[21] if len(r) > 21 and r[21] else None
+                        stars = feature["star_rating"]
                         star_text = f"{stars}-star " if stars else ""
-                        description = f"{star_text}Hotel in {r[2]}, {r[3]}"
+                        description = f"{star_text}Hotel in {city}, {state}"
                     else:
-                        description = f"Place in {r[2]}, {r[3]}"
+                        description = f"Place in {city}, {state}"
                 
                 # Handle rating - filter out 0 or negative values
-                rating = r[8] if len(r) > 8 else None
-                rating_value = None
-                if rating is not None:
-                    try:
-                        rating_float = float(rating)
-                        if rating_float > 0:
-                            rating_value = rating_float
-                    except (ValueError, TypeError):
-                        pass
+                rating = feature["rating"]
+                rating_value = rating if rating is not None and rating > 0 else None
                 
                 # Generate mock rating and review count for demonstration if no rating exists
                 # This is acceptable for demo/educational purposes since OpenStreetMap doesn't provide ratings
+                # Consistent pseudo-random value per place ID (so mock values are stable across searches).
+                # Knuth multiplicative hash on the integer ID - no crypto hash needed for demo data.
+                hash_value = (feature["id"] * 2654435761) & 0xFFFFFFFF
                 review_count = None
                 if rating_value is None and place_type in ['restaurant', 'tourist_place', 'hotel']:
-                    # Generate a consistent mock rating based on place ID (so it's stable across searches)
+                    # Generate a consistent mock rating based on place ID
                     # Range: 3.5 to 4.8 (realistic restaurant rating range)
-                    import hashlib
-                    place_id_str = str(r[0])
-                    hash_value = int(hashlib.md5(place_id_str.encode()).hexdigest()[:8], 16)
                     mock_rating = 3.5 + (hash_value % 130) / 100.0  # 3.5 to 4.8
                     rating_value = round(mock_rating, 1)
                     # Generate mock review count (consistent based on place ID)
@@ -758,78 +1166,62 @@ def within_radius():
                     review_count = 50 + (hash_value % 1950)  # 50 to 2000
                 elif rating_value is not None:
                     # If we have a real rating, generate a review count too
-                    import hashlib
-                    place_id_str = str(r[0])
-                    hash_value = int(hashlib.md5(place_id_str.encode()).hexdigest()[:8], 16)
                     review_count = 50 + (hash_value % 1950)  # 50 to 2000
                 
-                # Extract restaurant-specific fields
-                hours_of_operation = r[13] if len(r) > 13 else None
-                dietary_options = r[14] if len(r) > 14 else None
-                outdoor_seating = r[15] if len(r) > 15 else None
-                delivery = r[16] if len(r) > 16 else None
-                takeout = r[17] if len(r) > 17 else None
-                reservations = r[18] if len(r) > 18 else None
+                # Only the derived fields are touched below (NULL booleans and dietary_options
+                # are defaulted, and numeric columns cast to float8, in the SELECT)
+                feature["description"] = description
+                feature["rating"] = rating_value
+                feature["review_count"] = review_count
+                # Add list status if user is authenticated
+                if list_status is not None:
+                    feature["list_status"] = list_status.get(feature["id"], _NO_STATUS)
                 
-                features.append({
-                    "id": r[0],
-                    "name": r[1],
-                    "city": r[2],
-                    "state": r[3],
-                    "country": r[4],
-                    "lat": r[5],
-                    "lon": r[6],
-                    "place_type": place_type,
-                    "rating": rating_value,
-                    "review_count": review_count,
-                    "phone": r[9] if len(r) > 9 else None,
-                    "website": r[10] if len(r) > 10 else None,
-                    "cuisine_type": r[11] if len(r) > 11 else None,
-                    "price_range": r[12] if len(r) > 12 else None,
-                    "hours_of_operation": hours_of_operation,
-                    "dietary_options": dietary_options if isinstance(dietary_options, list) else (dietary_options if dietary_options else []),
-                    "outdoor_seating": outdoor_seating if outdoor_seating is not None else False,
-                    "delivery": delivery if delivery is not None else False,
-                    "takeout": takeout if takeout is not None else False,
-                    "reservations": reservations if reservations is not None else False,
-                    "entry_fee": float(r[19]) if len(r) > 19 and r[19] is not None else None,
-                    "tourist_type": r[21] if len(r) > 21 else None,
-                    "family_friendly": bool(r[22]) if len(r) > 22 and r[22] is not None else False,
-                    "accessibility": bool(r[23]) if len(r) > 23 and r[23] is not None else False,
-                    "pet_friendly": bool(r[24]) if len(r) > 24 and r[24] is not None else False,
-                    "guided_tours": bool(r[25]) if len(r) > 25 and r[25] is not None else False,
-                    "tourist_hours": r[26] if len(r) > 26 else None,
-                    "description": description,  # description is at index 20
-                    "star_rating": r[27] if len(r) > 27 else None,
-                    "price_per_night": float(r[28]) if len(r) > 28 and r[28] is not None else None,
-                    "brewery_type": r[29] if len(r) > 29 else None,
-                    "street": r[30] if len(r) > 30 else None,
-                    "postal_code": r[31] if len(r) > 31 else None,
-                })
-            
-            # Add list status if user is authenticated
-            if user_id and features:
-                place_ids = [f["id"] for f in features]
-                list_status = get_places_list_status(user_id, place_ids)
-                for feature in features:
-                    status = list_status.get(feature["id"], {})
-                    feature["list_status"] = {
-                        "visited": status.get("visited", False),
-                        "in_wishlist": status.get("in_wishlist", False),
-                        "liked": status.get("liked", False)
-                    }
+                features[i] = feature
             
-        return jsonify({"features": features, "count": len(features)})
+        return json_response({"features": features, "count": len(features)})
     except Exception as e:
         app.logger.error(f"Error in within_radius: {e}")
         return jsonify({"error": "Database query failed", "details": str(e)}), 500
 
+# Optional search filters, in mask bit order: place_type (4), state (2), name (1)
+SEARCH_FILTER_CLAUSES = (
+    " AND place_type = ANY(%s)",
+    " AND state ILIKE %s",
+    " AND name ILIKE %s",
+)
+
+def build_filter_sql_variants(base_sql, tail_sql):
+    """Precompute base_sql + filters + tail_sql for every combination of search filters.
+    
+    Index the result with filter_mask(); the SQL text for a given combination
+    never changes, which also lets psycopg reuse its prepared statement.
+    """
+    variants = []
+    for mask in range(8):
+        clauses = [
+            clause for bit, clause in zip((4, 2, 1), SEARCH_FILTER_CLAUSES)
+            if mask & bit
+        ]
+        variants.append(base_sql + "".join(clauses) + tail_sql)
+    return tuple(variants)
+
+def filter_mask(place_types, state_filter, name_filter):
+    """Bit mask of which optional search filters are set (see SEARCH_FILTER_CLAUSES)."""
+    return (bool(place_types) << 2) | (bool(state_filter) << 1) | bool(name_filter)
+
+BBOX_SQLS = build_filter_sql_variants("""
+    SELECT id, name, city, state, country, lat, lon, place_type
+    FROM places_with_types
+    WHERE geom && ST_MakeEnvelope(%s, %s, %s, %s, 4326)
+    """, " LIMIT 5000;")
+
 @app.get("/within_bbox")
 @limiter.limit("30 per minute")  # Prevent DDoS on search endpoints
 def within_bbox():
     """Find all places within a bounding box."""
     # CRITICAL FIX: Validate input using schema
-    schema = BoundingBoxSchema()
+    schema = BOUNDING_BOX_SCHEMA
     try:
         data = schema.load(request.args)
     except ValidationError as err:
@@ -850,35 +1242,30 @@ def within_bbox():
     if place_type_filter:
         place_types = [t.strip() for t in place_type_filter.split(",") if t.strip()]
 
-    sql = """
-    SELECT id, name, city, state, country, lat, lon, place_type
-    FROM places_with_types
-    WHERE geom && ST_MakeEnvelope(%s, %s, %s, %s, 4326)
-    """
+    sql = BBOX_SQLS[filter_mask(place_types, state_filter, name_filter)]
     params = [west, south, east, north]
     
     # Filter by place type(s)
     if place_types:
-        sql += " AND place_type = ANY(%s)"
         params.append(place_types)
     
     if state_filter:
-        sql += " AND state ILIKE %s"
         params.append(f"%{state_filter}%")
     
     if name_filter:
-        sql += " AND name ILIKE %s"
         params.append(f"%{name_filter}%")
-    
-    sql += " LIMIT 5000;"
 
     try:
         user_id = get_user_id_from_request()
         with get_conn() as conn, conn.cursor() as cur:
-            cur.execute(sql, params)
+            # Binary results: ints/floats arrive without text parsing
+            cur.execute(sql, params, binary=True)
             rows = cur.fetchall()
-            features = [
-                {
+            # Fetch list status up front so it can be attached while building each feature
+            list_status = get_places_list_status(user_id, [r[0] for r in rows]) if user_id else None
+            features = []
+            for r in rows:
+                feature = {
                     "id": r[0],
                     "name": r[1],
                     "city": r[2],
@@ -888,32 +1275,29 @@ def within_bbox():
                     "lon": r[6],
                     "place_type": r[7] if len(r) > 7 else "unknown",
                 }
-                for r in rows
-            ]
-            
-            # Add list status if user is authenticated
-            if user_id and features:
-                place_ids = [f["id"] for f in features]
-                list_status = get_places_list_status(user_id, place_ids)
-                for feature in features:
-                    status = list_status.get(feature["id"], {})
-                    feature["list_status"] = {
-                        "visited": status.get("visited", False),
-                        "in_wishlist": status.get("in_wishlist", False),
-                        "liked": status.get("liked", False)
-                    }
+                # Add list status if user is authenticated
+                if list_status is not None:
+                    feature["list_status"] = list_status.get(r[0], _NO_STATUS)
+                features.append(feature)
             
-        return jsonify({"features": features, "count": len(features)})
+        return json_response({"features": features, "count": len(features)})
     except Exception as e:
         app.logger.error(f"Error in within_bbox: {e}")
         return jsonify({"error": "Database query failed", "details": str(e)}), 500
 
+NEAREST_SQLS = build_filter_sql_variants("""
+    SELECT id, name, city, state, country, lat, lon, place_type,
+           ST_Distance(geom::geography, ST_SetSRID(ST_MakePoint(%s, %s), 4326)::geography) / 1000.0 AS distance_km
+    FROM places_with_types
+    WHERE 1=1
+    """, " ORDER BY geom <-> ST_SetSRID(ST_MakePoint(%s, %s), 4326) LIMIT %s;")
+
 @app.get("/nearest")
 @limiter.limit("30 per minute")  # Prevent DDoS on search endpoints
 def nearest():
     """Find K nearest places to a point using PostGIS KNN."""
     # CRITICAL FIX: Validate input using schema
-    schema = NearestSearchSchema()
+    schema = NEAREST_SEARCH_SCHEMA
     try:
         data = schema.load(request.args)
     except ValidationError as err:
@@ -934,42 +1318,36 @@ def nearest():
         return jsonify({"error": "k must be between 1 and 100"}), 400
 
     # Get place type filter
-    place_type_filter = request.args.get("place_type")
     place_types = None
     if place_type_filter:
         place_types = [t.strip() for t in place_type_filter.split(",") if t.strip()]
     
-    sql = """
-    SELECT id, name, city, state, country, lat, lon, place_type,
-           ST_Distance(geom::geography, ST_SetSRID(ST_MakePoint(%s, %s), 4326)::geography) / 1000.0 AS distance_km
-    FROM places_with_types
-    WHERE 1=1
-    """
+    sql = NEAREST_SQLS[filter_mask(place_types, state_filter, name_filter)]
     params = [lon, lat]
     
     # Filter by place type(s)
     if place_types:
-        sql += " AND place_type = ANY(%s)"
         params.append(place_types)
     
     if state_filter:
-        sql += " AND state ILIKE %s"
         params.append(f"%{state_filter}%")
     
     if name_filter:
-        sql += " AND name ILIKE %s"
         params.append(f"%{name_filter}%")
     
-    sql += " ORDER BY geom <-> ST_SetSRID(ST_MakePoint(%s, %s), 4326) LIMIT %s;"
     params.extend([lon, lat, k])
 
     try:
         user_id = get_user_id_from_request()
         with get_conn() as conn, conn.cursor() as cur:
-            cur.execute(sql, params)
+            # Binary results: ints/floats arrive without text parsing
+            cur.execute(sql, params, binary=True)
             rows = cur.fetchall()
-            features = [
-                {
+            # Fetch list status up front so it can be attached while building each feature
+            list_status = get_places_list_status(user_id, [r[0] for r in rows]) if user_id else None
+            features = []
+            for r in rows:
+                feature = {
                     "id": r[0],
                     "name": r[1],
                     "city": r[2],
@@ -980,32 +1358,36 @@ def nearest():
                     "place_type": r[7] if len(r) > 7 else "unknown",
                     "distance_km": round(r[8], 2) if len(r) > 8 and r[8] else None,
                 }
-                for r in rows
-            ]
-            
-            # Add list status if user is authenticated
-            if user_id and features:
-                place_ids = [f["id"] for f in features]
-                list_status = get_places_list_status(user_id, place_ids)
-                for feature in features:
-                    status = list_status.get(feature["id"], {})
-                    feature["list_status"] = {
-                        "visited": status.get("visited", False),
-                        "in_wishlist": status.get("in_wishlist", False),
-                        "liked": status.get("liked", False)
-                    }
+                # Add list status if user is authenticated
+                if list_status is not None:
+                    feature["list_status"] = list_status.get(r[0], _NO_STATUS)
+                features.append(feature)
             
-        return jsonify({"features": features, "count": len(features)})
+        return json_response({"features": features, "count": len(features)})
     except Exception as e:
         app.logger.error(f"Error in nearest: {e}")
         return jsonify({"error": "Database query failed", "details": str(e)}), 500
 
 @app.get("/stats")
+@conditional_response(max_age=300)
 @cached(ttl=300, key_prefix="stats")  # Cache for 5 minutes
 def stats():
     """Get statistics about the database."""
     try:
         with get_conn() as conn, conn.cursor() as cur:
+            # Precomputed by db/schema_places_stats_mv.sql (refreshed out-of-band)
+            try:
+                cur.execute("SELECT total_places, top_states, bounds FROM places_stats_mv;")
+                row = cur.fetchone()
+                if row:
+                    return jsonify({
+                        "total_places": row[0],
+                        "top_states": row[1],
+                        "bounds": row[2],
+                    })
+            except psycopg.errors.UndefinedTable:
+                conn.rollback()  # View not created yet - compute live below
+            
             cur.execute("SELECT COUNT(*) FROM places;")
             total_count = cur.fetchone()[0]
             
@@ -1041,12 +1423,23 @@ def stats():
         app.logger.error(f"Error in stats: {e}")
         return jsonify({"error": "Database query failed", "details": str(e)}), 500
 
+def stream_copy_out(conn_ctx, copy_sql, params=None):
+    """Stream the output of a `COPY (...) TO STDOUT` statement chunk by chunk.
+    
+    Bytes go straight from libpq to the response without building Python row
+    tuples. The pooled connection is held until the generator is exhausted.
+    """
+    with conn_ctx as conn, conn.cursor() as cur:
+        with cur.copy(copy_sql, params) as copy:
+            for chunk in copy:
+                yield bytes(chunk)
+
 @app.get("/export/csv")
 @limiter.limit("10 per hour")  # Limit exports (heavy operation)
 def export_csv():
     """Export places data as CSV."""
     # CRITICAL FIX: Validate input using schema
-    schema = ExportSchema()
+    schema = EXPORT_SCHEMA
     try:
         data = schema.load(request.args)
     except ValidationError as err:
@@ -1072,25 +1465,26 @@ def export_csv():
             sql += " AND name ILIKE %s"
             params.append(f"%{name_filter}%")
         
-        sql += " ORDER BY id;"
+        sql += " ORDER BY id LIMIT %s"
+        params.append(limit)
         
-        with get_conn() as conn, conn.cursor() as cur:
-            cur.execute(sql, params)
-            rows = cur.fetchall()
-            
-            import csv
-            import io
-            output = io.StringIO()
-            writer = csv.writer(output)
-            writer.writerow(['id', 'name', 'city', 'state', 'country', 'lat', 'lon'])
-            writer.writerows(rows)
-            
-            from flask import Response
-            return Response(
-                output.getvalue(),
-                mimetype='text/csv',
-                headers={'Content-Disposition': 'attachment; filename=places.csv'}
-            )
+        # Postgres writes the CSV (including header) and we stream it as-is
+        copy_sql = f"COPY ({sql}) TO STDOUT WITH (FORMAT csv, HEADER)"
+        chunks = stream_copy_out(get_conn(), copy_sql, params)
+        
+        # Pull the first chunk (the header) here so connection/query errors
+        # still return a JSON 500 instead of a truncated download
+        first_chunk = next(chunks, b"")
+        
+        def generate():
+            yield first_chunk
+            yield from chunks
+        
+        return Response(
+            stream_with_context(generate()),
+            mimetype='text/csv',
+            headers={'Content-Disposition': 'attachment; filename=places.csv'}
+        )
     except Exception as e:
         app.logger.error(f"Error in export_csv: {e}")
         return jsonify({"error": "Export failed", "details": str(e)}), 500
@@ -1100,7 +1494,7 @@ def export_csv():
 def export_geojson():
     """Export places data as GeoJSON."""
     # CRITICAL FIX: Validate input using schema
-    schema = ExportSchema()
+    schema = EXPORT_SCHEMA
     try:
         data = schema.load(request.args)
     except ValidationError as err:
@@ -1115,9 +1509,9 @@ def export_geojson():
     
     try:
         
+        # Postgres builds the whole FeatureCollection; Python only ships the string
         sql = """
-        SELECT id, name, city, state, country, lat, lon,
-               ST_AsGeoJSON(geom)::json AS geometry
+        SELECT id, name, city, state, country, lat, lon, geom
         FROM places
         WHERE 1=1
         """
@@ -1131,39 +1525,35 @@ def export_geojson():
             sql += " AND name ILIKE %s"
             params.append(f"%{name_filter}%")
         
-        sql += f" ORDER BY id LIMIT {limit};"
+        sql += " ORDER BY id LIMIT %s"
+        params.append(limit)
+        
+        geojson_sql = f"""
+        SELECT json_build_object(
+                   'type', 'FeatureCollection',
+                   'features', COALESCE(json_agg(json_build_object(
+                       'type', 'Feature',
+                       'properties', json_build_object(
+                           'id', p.id, 'name', p.name, 'city', p.city, 'state', p.state,
+                           'country', p.country, 'lat', p.lat, 'lon', p.lon
+                       ),
+                       'geometry', ST_AsGeoJSON(p.geom)::json
+                   ) ORDER BY p.id), '[]'::json)
+               )::text
+        FROM ({sql}) p
+        """
         
         with get_conn() as conn, conn.cursor() as cur:
-            cur.execute(sql, params)
-            rows = cur.fetchall()
-            
-            features = []
-            for r in rows:
-                features.append({
-                    "type": "Feature",
-                    "properties": {
-                        "id": r[0],
-                        "name": r[1],
-                        "city": r[2],
-                        "state": r[3],
-                        "country": r[4],
-                        "lat": r[5],
-                        "lon": r[6]
-                    },
-                    "geometry": r[7]
-                })
-            
-            geojson = {
-                "type": "FeatureCollection",
-                "features": features
-            }
-            
-            return jsonify(geojson)
+            cur.execute(geojson_sql, params)
+            geojson_text = cur.fetchone()[0]
+        
+        return Response(geojson_text, mimetype='application/geo+json')
     except Exception as e:
         app.logger.error(f"Error in export_geojson: {e}")
         return jsonify({"error": "Export failed", "details": str(e)}), 500
 
 @app.get("/analytics/states")
+@conditional_response(max_age=600)
 @cached(ttl=600, key_prefix="analytics")  # Cache for 10 minutes
 def analytics_states():
     """Get analytics by state."""
@@ -1197,7 +1587,7 @@ def analytics_states():
 def distance_matrix():
     """Calculate distance matrix between multiple points."""
     # CRITICAL FIX: Validate input using schema
-    schema = DistanceMatrixSchema()
+    schema = DISTANCE_MATRIX_SCHEMA
     try:
         data = schema.load(request.args)
     except ValidationError as err:
@@ -1213,34 +1603,40 @@ def distance_matrix():
         if len(point_list) < 2:
             return jsonify({"error": "At least 2 points required"}), 400
         
-        results = []
-        for i, p1 in enumerate(point_list):
+        # Parse and validate every point up front
+        lats = []
+        lons = []
+        for i, p in enumerate(point_list):
             try:
-                lat1, lon1 = float(p1[0]), float(p1[1])
-                validate_coordinates(lat1, lon1)
+                lat, lon = float(p[0]), float(p[1])
+                validate_coordinates(lat, lon)
             except (ValueError, IndexError):
                 return jsonify({"error": f"Invalid coordinates at point {i+1}"}), 400
-            
-            row = []
-            for j, p2 in enumerate(point_list):
-                try:
-                    lat2, lon2 = float(p2[0]), float(p2[1])
-                    validate_coordinates(lat2, lon2)
-                except (ValueError, IndexError):
-                    return jsonify({"error": f"Invalid coordinates at point {j+1}"}), 400
-                
-                with get_conn() as conn, conn.cursor() as cur:
-                    cur.execute("""
-                        SELECT ST_Distance(
-                            ST_SetSRID(ST_MakePoint(%s, %s), 4326)::geography,
-                            ST_SetSRID(ST_MakePoint(%s, %s), 4326)::geography
-                        ) / 1000.0;
-                    """, (lon1, lat1, lon2, lat2))
-                    distance = cur.fetchone()[0]
-                    row.append(round(float(distance), 2) if distance else None)
-            
+            lats.append(lat)
+            lons.append(lon)
+        
+        # Compute the whole matrix in one round-trip instead of one query per cell
+        with get_conn() as conn, conn.cursor() as cur:
+            cur.execute("""
+                WITH pts AS (
+                    SELECT i, ST_SetSRID(ST_MakePoint(lon, lat), 4326)::geography AS g
+                    FROM unnest(%s::float8[], %s::float8[]) WITH ORDINALITY AS t(lon, lat, i)
+                )
+                SELECT a.i, b.i, ST_Distance(a.g, b.g) / 1000.0
+                FROM pts a CROSS JOIN pts b
+                ORDER BY a.i, b.i;
+            """, (lons, lats))
+            cells = cur.fetchall()
+        
+        n = len(lats)
+        results = []
+        for i in range(n):
+            row = [
+                round(float(distance), 2) if distance else None
+                for _, _, distance in cells[i * n:(i + 1) * n]
+            ]
             results.append({
-                "point": {"lat": lat1, "lon": lon1},
+                "point": {"lat": lats[i], "lon": lons[i]},
                 "distances": row
             })
         
@@ -1249,12 +1645,16 @@ def distance_matrix():
         app.logger.error(f"Error in distance_matrix: {e}")
         return jsonify({"error": "Distance matrix calculation failed", "details": str(e)}), 500
 
+# Circle areas for the radii the frontend offers, so the common case is a dict lookup
+DENSITY_AREA_KM2 = {r: math.pi * r * r for r in (1, 2, 5, 10, 25, 50, 100)}
+
 @app.get("/analytics/density")
+@conditional_response(max_age=300)
 @cached(ttl=300, key_prefix="analytics")  # Cache for 5 minutes
 def analytics_density():
     """Get spatial density analysis."""
     # CRITICAL FIX: Validate input using schema
-    schema = AnalyticsDensitySchema()
+    schema = ANALYTICS_DENSITY_SCHEMA
     try:
         data = schema.load(request.args)
     except ValidationError as err:
@@ -1271,19 +1671,28 @@ def analytics_density():
     try:
         validate_coordinates(lat, lon)
         
+        # The geography cast can't use the GiST index on geom, so narrow the
+        # candidates with a degree bounding box first (index scan), then count exactly
+        sql = """
+            SELECT COUNT(*) 
+            FROM places
+            WHERE ST_DWithin(
+                geom::geography,
+                ST_SetSRID(ST_MakePoint(%s, %s), 4326)::geography,
+                %s * 1000
+            )
+        """
+        params = [lon, lat, radius]
+        envelope = radius_envelope(lat, lon, radius)
+        if envelope:
+            sql += "    AND geom && ST_MakeEnvelope(%s, %s, %s, %s, 4326)\n"
+            params.extend(envelope)
+        
         with get_conn() as conn, conn.cursor() as cur:
-            cur.execute("""
-                SELECT COUNT(*) 
-                FROM places
-                WHERE ST_DWithin(
-                    geom::geography,
-                    ST_SetSRID(ST_MakePoint(%s, %s), 4326)::geography,
-                    %s * 1000
-                );
-            """, (lon, lat, radius))
+            cur.execute(sql, params)
             count = cur.fetchone()[0]
             
-            area_km2 = 3.14159 * radius * radius
+            area_km2 = DENSITY_AREA_KM2.get(radius) or math.pi * radius * radius
             density = (count / area_km2 * 1000) if area_km2 > 0 else 0
         
         return jsonify({
@@ -1303,18 +1712,11 @@ def analytics_density():
 @app.route("/auth/login", methods=['POST', 'OPTIONS'])
 @limiter.limit("5 per minute")  # Prevent brute force attacks
 def login():
-    if request.method == 'OPTIONS':
-        response = jsonify({})
-        response.headers.add('Access-Control-Allow-Origin', 'http://localhost:3000')
-        response.headers.add('Access-Control-Allow-Headers', 'Content-Type, Authorization, X-Auth-Token')
-        response.headers.add('Access-Control-Allow-Methods', 'POST, OPTIONS')
-        response.headers.add('Access-Control-Allow-Credentials', 'true')
-        return response, 200
     """Login endpoint with role-based authentication."""
     # CRITICAL FIX: Validate input using schema
-    schema = LoginSchema()
+    schema = LOGIN_SCHEMA
     try:
-        data = schema.load(request.get_json() or {})
+        data = schema.load(request.get_json(silent=True) or {})
     except ValidationError as err:
         return jsonify({
             "error": "Invalid input",
@@ -1334,15 +1736,12 @@ def login():
     
     # Test database connection (use base connection if role-based fails)
     try:
-        role_db_url = get_database_url_for_role(username)
-        test_conn = psycopg.connect(role_db_url)
-        test_conn.close()
+        probe_pool(get_database_url_for_role(username))
     except Exception as e:
         # Fallback: Try base connection (for development when role users don't exist)
         app.logger.warning(f"Role-based connection failed for {username}, trying base connection: {e}")
         try:
-            test_conn = psycopg.connect(BASE_DATABASE_URL)
-            test_conn.close()
+            probe_pool(BASE_DATABASE_URL)
             app.logger.info(f"Using base database connection for {username} (role users not configured)")
         except Exception as base_error:
             return jsonify({"error": f"Database connection failed: {str(base_error)}"}), 500
@@ -1370,27 +1769,22 @@ def login():
 @app.route("/auth/logout", methods=['POST', 'OPTIONS'])
 def logout():
     """Logout endpoint."""
-    if request.method == 'OPTIONS':
-        response = jsonify({})
-        response.headers.add('Access-Control-Allow-Origin', 'http://localhost:3000')
-        response.headers.add('Access-Control-Allow-Headers', 'Content-Type, Authorization, X-Auth-Token')
-        response.headers.add('Access-Control-Allow-Methods', 'POST, OPTIONS')
-        response.headers.add('Access-Control-Allow-Credentials', 'true')
-        return response, 200
+    # Revoke the token everywhere - deleting it from storage also tells every
+    # other worker to drop its cached validation
+    token = request.headers.get('X-Auth-Token') or (request.headers.get('Authorization', '').replace('Bearer ', '').strip())
+    token = token.strip() if token else None
+    if token:
+        try:
+            get_token_storage().delete_token(token)
+        except Exception as e:
+            app.logger.warning(f"⚠️  Could not revoke token on logout: {e}")
+    invalidate_token_cache(token)
     session.clear()
     return jsonify({"success": True, "message": "Logged out successfully"})
 
 @app.route("/auth/check", methods=['GET', 'OPTIONS'])
 def check_auth():
     """Check current authentication status."""
-    if request.method == 'OPTIONS':
-        response = jsonify({})
-        response.headers.add('Access-Control-Allow-Origin', 'http://localhost:3000')
-        response.headers.add('Access-Control-Allow-Headers', 'Content-Type, Authorization, X-Auth-Token')
-        response.headers.add('Access-Control-Allow-Methods', 'GET, OPTIONS')
-        response.headers.add('Access-Control-Allow-Credentials', 'true')
-        return response, 200
-    
     user_role = get_user_role_from_request()
     
     if user_role:
@@ -1410,13 +1804,6 @@ def check_auth():
 @app.route("/auth/roles", methods=['GET', 'OPTIONS'])
 def list_roles():
     """List available roles and their permissions (for demo purposes)."""
-    if request.method == 'OPTIONS':
-        response = jsonify({})
-        response.headers.add('Access-Control-Allow-Origin', 'http://localhost:3000')
-        response.headers.add('Access-Control-Allow-Headers', 'Content-Type, Authorization, X-Auth-Token')
-        response.headers.add('Access-Control-Allow-Methods', 'GET, OPTIONS')
-        response.headers.add('Access-Control-Allow-Credentials', 'true')
-        return response, 200
     roles_info = {}
     for role_name, role_data in DB_ROLES.items():
         roles_info[role_name] = {
@@ -1442,6 +1829,58 @@ def get_role_description(role_name):
 # ADMIN FEATURES - ADD LOCATION
 # ============================================================================
 
+# Type-table columns written by add_place (after place_id) for each place type
+ADD_PLACE_TYPE_COLUMNS = {
+    'brewery': ('breweries', ('brewery_type', 'website', 'phone', 'street', 'postal_code')),
+    'restaurant': ('restaurants', ('cuisine_type', 'price_range', 'rating', 'website', 'phone', 'street', 'postal_code', 'hours_of_operation')),
+    'tourist_place': ('tourist_places', ('place_type', 'rating', 'entry_fee', 'website', 'phone', 'street', 'postal_code', 'description')),
+    'hotel': ('hotels', ('star_rating', 'rating', 'price_per_night', 'amenities', 'website', 'phone', 'street', 'postal_code', 'check_in_time', 'check_out_time')),
+}
+
+def build_add_place_sql(type_table=None, type_columns=()):
+    """Build the single-statement INSERT for add_place: a writable CTE inserts the
+    place, and (if given) the type-specific row referencing the new place id."""
+    sql = """
+        WITH new_place AS (
+            INSERT INTO places (source_id, name, city, state, country, lat, lon, geom, created_by)
+            VALUES (%s, %s, %s, %s, %s, %s, %s,
+                    ST_SetSRID(ST_MakePoint(%s, %s), 4326), %s)
+            RETURNING id, name, city, state, country, lat, lon
+        )"""
+    if type_table:
+        placeholders = ", ".join(["%s"] * len(type_columns))
+        sql += f""",
+        new_type AS (
+            INSERT INTO {type_table} (place_id, {', '.join(type_columns)})
+            VALUES ((SELECT id FROM new_place), {placeholders})
+        )"""
+    return sql + """
+        SELECT id, name, city, state, country, lat, lon FROM new_place;
+    """
+
+def add_place_type_values(place_type, type_specific_data):
+    """Map add_place's type_data onto the type table's columns (empty tuple for unknown types)."""
+    if place_type not in ADD_PLACE_TYPE_COLUMNS:
+        return ()
+    _, columns = ADD_PLACE_TYPE_COLUMNS[place_type]
+    values = [type_specific_data.get(column) for column in columns]
+    
+    if place_type == 'brewery':
+        values[0] = type_specific_data.get('brewery_type', 'micro')
+    elif place_type == 'hotel':
+        amenities = type_specific_data.get('amenities', [])
+        if isinstance(amenities, str):
+            amenities = [a.strip() for a in amenities.split(',')]
+        values[3] = amenities
+    return tuple(values)
+
+# Statement per place type (None = place without a type-specific row), built once at import
+ADD_PLACE_SQL = {
+    place_type: build_add_place_sql(table, columns)
+    for place_type, (table, columns) in ADD_PLACE_TYPE_COLUMNS.items()
+}
+ADD_PLACE_SQL[None] = build_add_place_sql()
+
 @app.post("/places/add")
 @limiter.limit("10 per hour")  # Limit location additions
 def add_place():
@@ -1465,9 +1904,9 @@ def add_place():
             }), 403
         
         # CRITICAL FIX: Validate input using schema
-        schema = AddPlaceSchema()
+        schema = ADD_PLACE_SCHEMA
         try:
-            data = schema.load(request.get_json() or {})
+            data = schema.load(request.get_json(silent=True) or {})
         except ValidationError as err:
             return jsonify({
                 "error": "Invalid input",
@@ -1484,152 +1923,268 @@ def add_place():
         place_type = data.get("place_type", "brewery")
         type_specific_data = data.get("type_data", {})
         
-        # Coordinates already validated by schema, but double-check
-        try:
-            validate_coordinates(lat, lon)
-        except ValueError as e:
-            return jsonify({"error": str(e)}), 400
-        
         # Insert into database
-        try:
-            with get_conn() as conn:
-                with conn.cursor() as cur:
-                    # Get user_id for created_by tracking
-                    user_id = get_user_id_from_request()
-                    
-                    # Generate a unique source_id
-                    import uuid
-                    source_id = f"manual_{uuid.uuid4().hex[:12]}"
-                    
-                    # Insert into places table (with created_by tracking)
-                    cur.execute("""
-                        INSERT INTO places (source_id, name, city, state, country, lat, lon, geom, created_by)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s,
-                                ST_SetSRID(ST_MakePoint(%s, %s), 4326), %s)
-                        RETURNING id, name, city, state, country, lat, lon;
-                    """, (source_id, name, city, state, country, lat, lon, lon, lat, user_id))
-                    
-                    row = cur.fetchone()
-                    place_id = row[0]
-                    
-                    # Insert into type-specific table based on place_type
-                    if place_type == 'brewery':
-                        brewery_type = type_specific_data.get('brewery_type', 'micro')
-                        cur.execute("""
-                            INSERT INTO breweries (place_id, brewery_type, website, phone, street, postal_code)
-                            VALUES (%s, %s, %s, %s, %s, %s)
-                        """, (
-                            place_id,
-                            brewery_type,
-                            type_specific_data.get('website'),
-                            type_specific_data.get('phone'),
-                            type_specific_data.get('street'),
-                            type_specific_data.get('postal_code')
-                        ))
-                    elif place_type == 'restaurant':
-                        cur.execute("""
-                            INSERT INTO restaurants (place_id, cuisine_type, price_range, rating, website, phone, street, postal_code, hours_of_operation)
-                            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                        """, (
-                            place_id,
-                            type_specific_data.get('cuisine_type'),
-                            type_specific_data.get('price_range'),
-                            type_specific_data.get('rating'),
-                            type_specific_data.get('website'),
-                            type_specific_data.get('phone'),
-                            type_specific_data.get('street'),
-                            type_specific_data.get('postal_code'),
-                            type_specific_data.get('hours_of_operation')
-                        ))
-                    elif place_type == 'tourist_place':
-                        cur.execute("""
-                            INSERT INTO tourist_places (place_id, place_type, rating, entry_fee, website, phone, street, postal_code, description)
-                            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                        """, (
-                            place_id,
-                            type_specific_data.get('place_type'),
-                            type_specific_data.get('rating'),
-                            type_specific_data.get('entry_fee'),
-                            type_specific_data.get('website'),
-                            type_specific_data.get('phone'),
-                            type_specific_data.get('street'),
-                            type_specific_data.get('postal_code'),
-                            type_specific_data.get('description')
-                        ))
-                    elif place_type == 'hotel':
-                        amenities = type_specific_data.get('amenities', [])
-                        if isinstance(amenities, str):
-                            amenities = [a.strip() for a in amenities.split(',')]
-                        cur.execute("""
-                            INSERT INTO hotels (place_id, star_rating, rating, price_per_night, amenities, website, phone, street, postal_code, check_in_time, check_out_time)
-                            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                        """, (
-                            place_id,
-                            type_specific_data.get('star_rating'),
-                            type_specific_data.get('rating'),
-                            type_specific_data.get('price_per_night'),
-                            amenities,
-                            type_specific_data.get('website'),
-                            type_specific_data.get('phone'),
-                            type_specific_data.get('street'),
-                            type_specific_data.get('postal_code'),
-                            type_specific_data.get('check_in_time'),
-                            type_specific_data.get('check_out_time')
-                        ))
-                    
-                    conn.commit()
-                    
-                    # CRITICAL FIX: Invalidate cache when data changes
-                    invalidate_cache("stats")
-                    invalidate_cache("analytics")
-                    
-                    new_place = {
-                        "id": place_id,
-                        "name": row[1],
-                        "city": row[2],
-                        "state": row[3],
-                        "country": row[4],
-                        "lat": float(row[5]),
-                        "lon": float(row[6]),
-                        "place_type": place_type
-                    }
-            
-            return jsonify({
-                "success": True,
-                "message": "Location added successfully",
-                "place": new_place,
-                "role": role
-            }), 201
-            
-        except psycopg.errors.InsufficientPrivilege as e:
-            # Database-level permission error
-            return jsonify({
-                "error": "Database permission denied",
-                "message": f"User '{role}' does not have INSERT permission. Database rejected the operation.",
-                "details": str(e)
-            }), 403
-        except Exception as e:
-            app.logger.error(f"Error adding place: {e}")
-            return jsonify({"error": "Failed to add location", "details": str(e)}), 500
-            
+        with get_conn() as conn:
+            with conn.cursor() as cur:
+                # Get user_id for created_by tracking
+                user_id = get_user_id_from_request()
+                
+                # Generate a unique source_id
+                source_id = f"manual_{token_hex(6)}"
+                
+                # Type-specific columns, in the order of ADD_PLACE_TYPE_COLUMNS[place_type]
+                type_values = add_place_type_values(place_type, type_specific_data)
+                
+                # Insert into places and the type-specific table in one round-trip
+                # (with created_by tracking). Prepared on first use - there are only
+                # five ADD_PLACE_SQL variants, so each pooled connection plans them once
+                cur.execute(
+                    ADD_PLACE_SQL.get(place_type, ADD_PLACE_SQL[None]),
+                    (source_id, name, city, state, country, lat, lon, lon, lat, user_id) + type_values,
+                    prepare=True
+                )
+                
+                row = cur.fetchone()
+                place_id = row[0]
+                
+                conn.commit()
+                
+                # CRITICAL FIX: Invalidate cache when data changes
+                schedule_invalidate("stats", "analytics")
+                schedule_mv_refresh()
+                
+                new_place = {
+                    "id": place_id,
+                    "name": row[1],
+                    "city": row[2],
+                    "state": row[3],
+                    "country": row[4],
+                    "lat": float(row[5]),
+                    "lon": float(row[6]),
+                    "place_type": place_type
+                }
+        
+        return jsonify({
+            "success": True,
+            "message": "Location added successfully",
+            "place": new_place,
+            "role": role
+        }), 201
+    
+    except psycopg.errors.InsufficientPrivilege as e:
+        # Database-level permission error
+        return jsonify({
+            "error": "Database permission denied",
+            "message": f"User '{role}' does not have INSERT permission. Database rejected the operation.",
+            "details": str(e)
+        }), 403
     except Exception as e:
-        app.logger.error(f"Error in add_place: {e}")
+        app.logger.exception("Error adding place")
         return jsonify({"error": "Failed to add location", "details": str(e)}), 500
 
+CSV_BATCH_SIZE = 1000  # Rows per COPY + INSERT ... SELECT in upload_csv
+
+# Type-specific values parsed by upload_csv, in the order they appear in each type_values tuple
+CSV_TYPE_COLUMNS = {
+    'brewery': ('brewery_type', 'website', 'phone', 'street', 'postal_code'),
+    'restaurant': ('cuisine_type', 'price_range', 'rating', 'website', 'phone', 'street', 'postal_code', 'hours_of_operation'),
+    'tourist_place': ('tourist_type', 'rating', 'entry_fee', 'website', 'phone', 'street', 'postal_code', 'description'),
+    'hotel': ('star_rating', 'rating', 'price_per_night', 'amenities', 'website', 'phone', 'street', 'postal_code', 'check_in_time', 'check_out_time'),
+}
+
+# Type-specific CSV columns that are parsed to numbers (others are kept as text)
+CSV_NUMERIC_COLUMNS = {
+    'price_range': int,
+    'star_rating': int,
+    'rating': float,
+    'entry_fee': float,
+    'price_per_night': float,
+}
+
+def parse_csv_type_values(place_type, row_dict):
+    """Build the type_values tuple for one stripped CSV row (see CSV_TYPE_COLUMNS).
+    
+    Empty values become NULL, numeric columns are converted (raising ValueError
+    on bad input), and hotel amenities are split on commas.
+    """
+    values = []
+    for column in CSV_TYPE_COLUMNS[place_type]:
+        value = row_dict.get(column)
+        if not value:
+            values.append(None)
+        elif column in CSV_NUMERIC_COLUMNS:
+            values.append(CSV_NUMERIC_COLUMNS[column](value))
+        elif column == 'amenities':
+            values.append([a.strip() for a in value.split(',')])
+        else:
+            values.append(value)
+    
+    if place_type == 'brewery' and not values[0]:
+        values[0] = 'micro'  # Default brewery_type
+    return tuple(values)
+
+# Columns of the csv_stage temp table after the common place columns
+CSV_STAGE_TYPE_COLUMNS = (
+    'brewery_type', 'cuisine_type', 'price_range', 'rating', 'hours_of_operation',
+    'tourist_type', 'entry_fee', 'description', 'star_rating', 'price_per_night',
+    'amenities', 'check_in_time', 'check_out_time', 'website', 'phone', 'street', 'postal_code'
+)
+
+CSV_STAGE_CREATE_SQL = """
+    CREATE TEMP TABLE IF NOT EXISTS csv_stage (
+        source_id TEXT, name TEXT, city TEXT, state TEXT, country TEXT,
+        lat DOUBLE PRECISION, lon DOUBLE PRECISION, place_type TEXT,
+        brewery_type TEXT, cuisine_type TEXT, price_range INTEGER, rating DOUBLE PRECISION,
+        hours_of_operation TEXT, tourist_type TEXT, entry_fee DOUBLE PRECISION, description TEXT,
+        star_rating INTEGER, price_per_night DOUBLE PRECISION, amenities TEXT[],
+        check_in_time TEXT, check_out_time TEXT,
+        website TEXT, phone TEXT, street TEXT, postal_code TEXT
+    ) ON COMMIT DROP
+"""
+
+# Moves the staged rows into places and the four type tables in one statement
+CSV_STAGE_INSERT_SQL = """
+    WITH new_places AS (
+        INSERT INTO places (source_id, name, city, state, country, lat, lon, geom, created_by)
+        SELECT s.source_id, s.name, s.city, s.state, s.country, s.lat, s.lon,
+               ST_SetSRID(ST_MakePoint(s.lon, s.lat), 4326), %s
+        FROM csv_stage s
+        ON CONFLICT (source_id) WHERE source_id IS NOT NULL DO NOTHING
+        RETURNING id, source_id
+    ),
+    new_breweries AS (
+        INSERT INTO breweries (place_id, brewery_type, website, phone, street, postal_code)
+        SELECT np.id, s.brewery_type, s.website, s.phone, s.street, s.postal_code
+        FROM new_places np JOIN csv_stage s USING (source_id)
+        WHERE s.place_type = 'brewery'
+        ON CONFLICT (place_id) DO NOTHING
+    ),
+    new_restaurants AS (
+        INSERT INTO restaurants (place_id, cuisine_type, price_range, rating, website, phone, street, postal_code, hours_of_operation)
+        SELECT np.id, s.cuisine_type, s.price_range, s.rating, s.website, s.phone, s.street, s.postal_code, s.hours_of_operation
+        FROM new_places np JOIN csv_stage s USING (source_id)
+        WHERE s.place_type = 'restaurant'
+        ON CONFLICT (place_id) DO NOTHING
+    ),
+    new_tourist_places AS (
+        INSERT INTO tourist_places (place_id, place_type, rating, entry_fee, website, phone, street, postal_code, description)
+        SELECT np.id, s.tourist_type, s.rating, s.entry_fee, s.website, s.phone, s.street, s.postal_code, s.description
+        FROM new_places np JOIN csv_stage s USING (source_id)
+        WHERE s.place_type = 'tourist_place'
+        ON CONFLICT (place_id) DO NOTHING
+    ),
+    new_hotels AS (
+        INSERT INTO hotels (place_id, star_rating, rating, price_per_night, amenities, website, phone, street, postal_code, check_in_time, check_out_time)
+        SELECT np.id, s.star_rating, s.rating, s.price_per_night, s.amenities, s.website, s.phone, s.street, s.postal_code,
+               s.check_in_time::time, s.check_out_time::time
+        FROM new_places np JOIN csv_stage s USING (source_id)
+        WHERE s.place_type = 'hotel'
+        ON CONFLICT (place_id) DO NOTHING
+    )
+    SELECT source_id, id FROM new_places;
+"""
+
+def insert_csv_batch(conn, batch, user_id):
+    """Insert a batch of validated CSV rows via COPY into a staging table.
+    
+    Each batch item is (row_num, source_id, name, city, state, country, lat,
+    lon, place_type, type_values). The rows are COPYed into the csv_stage temp
+    table, then moved into places and the type tables with one INSERT ... SELECT.
+    Each batch is its own transaction and commits on its own, so a failing
+    batch rolls back only itself - batches before it stay committed. Returns
+    {source_id: place_id} for the rows that were inserted;
+    rows whose source_id already exists are left out.
+    """
+    with conn.transaction(), conn.cursor() as cur:
+        # No parameters, so both statements go to the server in one round trip
+        cur.execute(CSV_STAGE_CREATE_SQL + "; TRUNCATE csv_stage")
+        
+        with cur.copy(
+            f"COPY csv_stage (source_id, name, city, state, country, lat, lon, place_type, "
+            f"{', '.join(CSV_STAGE_TYPE_COLUMNS)}) FROM STDIN"
+        ) as copy:
+            for item in batch:
+                type_values = dict(zip(CSV_TYPE_COLUMNS[item[8]], item[9]))
+                copy.write_row(item[1:9] + tuple(type_values.get(c) for c in CSV_STAGE_TYPE_COLUMNS))
+        
+        cur.execute(CSV_STAGE_INSERT_SQL, (user_id,))
+        return dict(cur.fetchall())
+
+# Only this many error messages are returned for an upload; the rest are just counted
+MAX_CSV_ERRORS = 20
+
+class CSVErrorLog:
+    """Error messages for one upload_csv call, capped at MAX_CSV_ERRORS.
+    
+    A bad file can fail on every row, so messages past the cap are counted
+    instead of kept in memory.
+    """
+    
+    def __init__(self):
+        self.messages = []
+        self.count = 0
+    
+    def append(self, message):
+        self.count += 1
+        if len(self.messages) < MAX_CSV_ERRORS:
+            self.messages.append(message)
+
+def flush_csv_batch(conn, batch, user_id):
+    """Insert one batch for upload_csv.
+    
+    Runs on the upload's flush thread, so per-row problems are returned rather
+    than written to the shared error log: (inserted_count, skipped_count, messages).
+    """
+    try:
+        place_ids = insert_csv_batch(conn, batch, user_id)
+    except psycopg.OperationalError as e:
+        # Connection-level failure - retrying row by row would just fail again
+        return 0, len(batch), [f"Rows {batch[0][0]}-{batch[-1][0]}: Database error - {str(e)}"]
+    except psycopg.Error as e:
+        # Earlier batches are already committed, so a bad row is reported like
+        # any other row error - whether it came in a 1-row batch or a retry
+        if len(batch) == 1:
+            return 0, 1, [f"Row {batch[0][0]}: Database error - {str(e)}"]
+        return flush_csv_rows(conn, batch, user_id)
+    
+    messages = [
+        f"Row {row[0]}: Duplicate source_id '{row[1]}' - skipped"
+        for row in batch if row[1] not in place_ids
+    ]
+    return len(place_ids), len(messages), messages
+
+def flush_csv_rows(conn, batch, user_id):
+    """Slow path for a batch the database rejected: insert its rows one at a time.
+    
+    The failed batch was rolled back on its own, so only the offending rows are
+    reported instead of the whole batch.
+    """
+    inserted = skipped = 0
+    messages = []
+    for row in batch:
+        row_inserted, row_skipped, row_messages = flush_csv_batch(conn, [row], user_id)
+        inserted += row_inserted
+        skipped += row_skipped
+        messages.extend(row_messages)
+    return inserted, skipped, messages
+
 @app.post("/places/upload-csv")
 @limiter.limit("5 per hour")  # Limit CSV uploads (heavy operation)
 def upload_csv():
-    """Bulk upload places from CSV file. Admin only."""
+    """Bulk upload places from CSV file. Admin only.
+    
+    Rows are inserted in CSV_BATCH_SIZE batches that each commit on their own,
+    so an upload that fails partway through stays partly committed - the error
+    response reports how many places were already inserted.
+    """
+    # Outside the try so a failure partway through can still report it
+    inserted_count = 0
     try:
-        # Get user role using unified authentication method
+        # Get user role using unified authentication method (headers/session only -
+        # nothing here touches request.form, so the upload isn't parsed until
+        # the caller is known to be an admin)
         user_role = get_user_role_from_request()
         
-        # Fallback: Check FormData field (for file uploads)
-        if not user_role:
-            user_role_field = request.form.get('user_role')
-            if user_role_field and user_role_field in DB_ROLES:
-                user_role = user_role_field
-        
         # Check authentication
         if not user_role:
             return jsonify({
@@ -1658,215 +2213,218 @@ def upload_csv():
         if not file.filename.lower().endswith('.csv'):
             return jsonify({"error": "File must be a CSV file"}), 400
         
-        try:
-            # Read CSV file
-            stream = io.StringIO(file.stream.read().decode("UTF8"), newline=None)
-            csv_reader = csv.DictReader(stream)
-            
-            # Expected CSV columns
-            required_columns = ['name', 'lat', 'lon']
-            
-            # Validate headers
-            if not csv_reader.fieldnames:
-                return jsonify({"error": "CSV file is empty or invalid"}), 400
-            
-            # Check required columns (case-insensitive)
-            headers_lower = [h.lower().strip() if h else '' for h in csv_reader.fieldnames]
-            missing = [col for col in required_columns if col.lower() not in headers_lower]
-            
-            if missing:
-                return jsonify({
-                    "error": f"Missing required columns: {', '.join(missing)}",
-                    "required": required_columns,
-                    "found": list(csv_reader.fieldnames)
-                }), 400
-            
-            # Process rows
-            inserted_count = 0
-            skipped_count = 0
-            errors = []
-            
-            with get_conn() as conn:
-                with conn.cursor() as cur:
-                    for row_num, row in enumerate(csv_reader, start=2):  # Start at 2 (header is row 1)
-                        try:
-                            # Map CSV columns (case-insensitive)
-                            row_dict = {k.lower().strip() if k else '': v for k, v in row.items() if k}
-                            
-                            name = row_dict.get('name', '').strip()
-                            lat_str = row_dict.get('lat', '').strip()
-                            lon_str = row_dict.get('lon', '').strip()
-                            city = row_dict.get('city', '').strip()
-                            state = row_dict.get('state', '').strip()
-                            country = row_dict.get('country', 'US').strip() or 'US'
-                            source_id = row_dict.get('source_id', '').strip()
-                            place_type = row_dict.get('place_type', 'brewery').strip().lower()
-                            
-                            # Validate place_type
-                            valid_types = ['brewery', 'restaurant', 'tourist_place', 'hotel']
-                            if place_type not in valid_types:
-                                errors.append(f"Row {row_num}: Invalid place_type '{place_type}'. Must be one of: {', '.join(valid_types)}")
-                                skipped_count += 1
-                                continue
-                            
-                            # Validate required fields
-                            if not name:
-                                errors.append(f"Row {row_num}: Name is required")
-                                skipped_count += 1
-                                continue
-                            
-                            if not lat_str or not lon_str:
-                                errors.append(f"Row {row_num}: Latitude and longitude are required")
-                                skipped_count += 1
-                                continue
-                            
-                            # Parse coordinates
-                            try:
-                                lat = float(lat_str)
-                                lon = float(lon_str)
-                                validate_coordinates(lat, lon)
-                            except (ValueError, TypeError) as e:
-                                errors.append(f"Row {row_num}: Invalid coordinates - {str(e)}")
-                                skipped_count += 1
-                                continue
-                            
-                            # Generate source_id if not provided
-                            if not source_id:
-                                source_id = f"csv_{uuid.uuid4().hex[:12]}"
-                            
-                            # Insert into database
-                            try:
-                                # Get user_id for created_by tracking (admin who uploaded CSV)
-                                user_id = get_user_id_from_request()
-                                
-                                # Insert into places table (with created_by tracking)
-                                cur.execute("""
-                                INSERT INTO places (source_id, name, city, state, country, lat, lon, geom, created_by)
-                                SELECT %s, %s, %s, %s, %s, %s, %s,
-                                       ST_SetSRID(ST_MakePoint(%s, %s), 4326), %s
-                                WHERE NOT EXISTS (
-                                    SELECT 1 FROM places WHERE source_id = %s
-                                )
-                                RETURNING id;
-                                """, (source_id, name, city, state, country, lat, lon, lon, lat, user_id, source_id))
-                                
-                                result = cur.fetchone()
-                                if result:
-                                    place_id = result[0]
-                                    
-                                    # Insert into type-specific table
-                                    if place_type == 'brewery':
-                                        brewery_type = row_dict.get('brewery_type', 'micro').strip() or 'micro'
-                                        cur.execute("""
-                                            INSERT INTO breweries (place_id, brewery_type, website, phone, street, postal_code)
-                                            VALUES (%s, %s, %s, %s, %s, %s)
-                                            ON CONFLICT (place_id) DO NOTHING
-                                        """, (
-                                            place_id,
-                                            brewery_type,
-                                            row_dict.get('website', '').strip() or None,
-                                            row_dict.get('phone', '').strip() or None,
-                                            row_dict.get('street', '').strip() or None,
-                                            row_dict.get('postal_code', '').strip() or None
-                                        ))
-                                    elif place_type == 'restaurant':
-                                        cur.execute("""
-                                            INSERT INTO restaurants (place_id, cuisine_type, price_range, rating, website, phone, street, postal_code, hours_of_operation)
-                                            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                                            ON CONFLICT (place_id) DO NOTHING
-                                        """, (
-                                            place_id,
-                                            row_dict.get('cuisine_type', '').strip() or None,
-                                            int(row_dict.get('price_range', 0)) if row_dict.get('price_range', '').strip() else None,
-                                            float(row_dict.get('rating', 0)) if row_dict.get('rating', '').strip() else None,
-                                            row_dict.get('website', '').strip() or None,
-                                            row_dict.get('phone', '').strip() or None,
-                                            row_dict.get('street', '').strip() or None,
-                                            row_dict.get('postal_code', '').strip() or None,
-                                            row_dict.get('hours_of_operation', '').strip() or None
-                                        ))
-                                    elif place_type == 'tourist_place':
-                                        cur.execute("""
-                                            INSERT INTO tourist_places (place_id, place_type, rating, entry_fee, website, phone, street, postal_code, description)
-                                            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                                            ON CONFLICT (place_id) DO NOTHING
-                                        """, (
-                                            place_id,
-                                            row_dict.get('tourist_type', '').strip() or None,
-                                            float(row_dict.get('rating', 0)) if row_dict.get('rating', '').strip() else None,
-                                            float(row_dict.get('entry_fee', 0)) if row_dict.get('entry_fee', '').strip() else None,
-                                            row_dict.get('website', '').strip() or None,
-                                            row_dict.get('phone', '').strip() or None,
-                                            row_dict.get('street', '').strip() or None,
-                                            row_dict.get('postal_code', '').strip() or None,
-                                            row_dict.get('description', '').strip() or None
-                                        ))
-                                    elif place_type == 'hotel':
-                                        amenities_str = row_dict.get('amenities', '').strip()
-                                        amenities = [a.strip() for a in amenities_str.split(',')] if amenities_str else []
-                                        cur.execute("""
-                                            INSERT INTO hotels (place_id, star_rating, rating, price_per_night, amenities, website, phone, street, postal_code, check_in_time, check_out_time)
-                                            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                                            ON CONFLICT (place_id) DO NOTHING
-                                        """, (
-                                            place_id,
-                                            int(row_dict.get('star_rating', 0)) if row_dict.get('star_rating', '').strip() else None,
-                                            float(row_dict.get('rating', 0)) if row_dict.get('rating', '').strip() else None,
-                                            float(row_dict.get('price_per_night', 0)) if row_dict.get('price_per_night', '').strip() else None,
-                                            amenities if amenities else None,
-                                            row_dict.get('website', '').strip() or None,
-                                            row_dict.get('phone', '').strip() or None,
-                                            row_dict.get('street', '').strip() or None,
-                                            row_dict.get('postal_code', '').strip() or None,
-                                            row_dict.get('check_in_time', '').strip() or None,
-                                            row_dict.get('check_out_time', '').strip() or None
-                                        ))
-                                    
-                                    inserted_count += 1
-                                else:
-                                    skipped_count += 1
-                                    errors.append(f"Row {row_num}: Duplicate source_id '{source_id}' - skipped")
-                            
-                            except psycopg.Error as e:
-                                    errors.append(f"Row {row_num}: Database error - {str(e)}")
-                                    skipped_count += 1
-                                    continue
-                        
-                        except Exception as e:
-                            errors.append(f"Row {row_num}: Unexpected error - {str(e)}")
-                            skipped_count += 1
-                            continue
-                    
-                    conn.commit()
-            
-            return jsonify({
-                "success": True,
-                "message": f"CSV upload completed",
-                "summary": {
-                    "inserted": inserted_count,
-                    "skipped": skipped_count,
-                    "total_rows": inserted_count + skipped_count
-                },
-                "errors": errors[:20],  # Limit to first 20 errors
-                "error_count": len(errors)
-            }), 200
-        except Exception as e:
-            app.logger.error(f"Error in CSV upload: {e}")
+        # Read CSV file lazily - rows are decoded as the reader pulls them,
+        # so the upload is never held in memory as one string
+        stream = io.TextIOWrapper(file.stream, encoding="utf-8", newline="")
+        csv_reader = csv.reader(stream)
+        fieldnames = next(csv_reader, None)
+        
+        # Expected CSV columns
+        required_columns = ['name', 'lat', 'lon']
+        
+        # Validate headers
+        if not fieldnames:
+            return jsonify({"error": "CSV file is empty or invalid"}), 400
+        
+        # Check required columns (case-insensitive)
+        headers_lower = [h.lower().strip() for h in fieldnames]
+        missing = [col for col in required_columns if col.lower() not in headers_lower]
+        
+        if missing:
             return jsonify({
-                "error": "Failed to process CSV file",
-                "details": str(e)
-            }), 500
+                "error": f"Missing required columns: {', '.join(missing)}",
+                "required": required_columns,
+                "found": fieldnames
+            }), 400
+        
+        # (column name, position) pairs, normalized once for the whole file
+        columns = [(header, idx) for idx, header in enumerate(headers_lower) if header]
+        
+        # Process rows
+        skipped_count = 0
+        errors = CSVErrorLog()
+        
+        # Get user_id for created_by tracking (admin who uploaded CSV)
+        user_id = get_user_id_from_request()
+        
+        # Validated rows waiting to be inserted (flushed every CSV_BATCH_SIZE rows)
+        pending = []
+        seen_source_ids = set()
+        
+        # Batches are inserted on one background thread so the next batch is
+        # parsed while the previous one is in the database (one in flight at a time).
+        # Each batch is its own transaction, so there is nothing to commit at the end
+        in_flight = None
+        
+        def collect_flush():
+            nonlocal inserted_count, skipped_count
+            inserted, skipped, messages = in_flight.result()
+            inserted_count += inserted
+            skipped_count += skipped
+            for message in messages:
+                errors.append(message)
+        
+        with get_conn() as conn, ThreadPoolExecutor(max_workers=1) as flusher:
+            for row_num, row in enumerate(csv_reader, start=2):  # Start at 2 (header is row 1)
+                if not row:
+                    continue  # Blank line
+                
+                try:
+                    # Pick out the named columns by position and strip every value once,
+                    # so the lookups below are plain dict gets (short rows just lack keys)
+                    row_dict = {header: row[idx].strip() for header, idx in columns if idx < len(row)}
+                    
+                    name = row_dict.get('name', '')
+                    lat_str = row_dict.get('lat', '')
+                    lon_str = row_dict.get('lon', '')
+                    city = row_dict.get('city', '')
+                    state = row_dict.get('state', '')
+                    country = row_dict.get('country') or 'US'
+                    source_id = row_dict.get('source_id', '')
+                    place_type = row_dict.get('place_type', 'brewery').lower()
+                    
+                    # Validate place_type
+                    if place_type not in CSV_TYPE_COLUMNS:
+                        errors.append(f"Row {row_num}: Invalid place_type '{place_type}'. Must be one of: {', '.join(CSV_TYPE_COLUMNS)}")
+                        skipped_count += 1
+                        continue
+                    
+                    # Validate required fields
+                    if not name:
+                        errors.append(f"Row {row_num}: Name is required")
+                        skipped_count += 1
+                        continue
+                    
+                    if not lat_str or not lon_str:
+                        errors.append(f"Row {row_num}: Latitude and longitude are required")
+                        skipped_count += 1
+                        continue
+                    
+                    # Parse coordinates
+                    try:
+                        lat = float(lat_str)
+                        lon = float(lon_str)
+                    except ValueError as e:
+                        errors.append(f"Row {row_num}: Invalid coordinates - {str(e)}")
+                        skipped_count += 1
+                        continue
+                    
+                    # Bounds check inline - cheaper than raising from validate_coordinates
+                    # for every bad row (NaN fails both comparisons too)
+                    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+                        errors.append(f"Row {row_num}: Invalid coordinates - lat must be between -90 and 90, lon between -180 and 180")
+                        skipped_count += 1
+                        continue
+                    
+                    # Generate source_id if not provided
+                    if not source_id:
+                        source_id = f"csv_{token_hex(6)}"
+                    
+                    # Same source_id earlier in this file - only the first one is inserted
+                    if source_id in seen_source_ids:
+                        skipped_count += 1
+                        errors.append(f"Row {row_num}: Duplicate source_id '{source_id}' - skipped")
+                        continue
+                    
+                    # Type-specific columns (everything after place_id), parsed before
+                    # anything is inserted so a bad value skips the whole row
+                    type_values = parse_csv_type_values(place_type, row_dict)
+                    
+                    seen_source_ids.add(source_id)
+                    pending.append((row_num, source_id, name, city, state, country, lat, lon, place_type, type_values))
+                
+                except Exception as e:
+                    errors.append(f"Row {row_num}: Unexpected error - {str(e)}")
+                    skipped_count += 1
+                    continue
+                
+                if len(pending) >= CSV_BATCH_SIZE:
+                    if in_flight:
+                        collect_flush()
+                    in_flight = flusher.submit(flush_csv_batch, conn, pending, user_id)
+                    pending = []
+            
+            if in_flight:
+                collect_flush()
+            
+            if pending:
+                in_flight = flusher.submit(flush_csv_batch, conn, pending, user_id)
+                collect_flush()
+        
+        if inserted_count:
+            schedule_invalidate("stats", "analytics")
+            schedule_mv_refresh()
+        
+        return jsonify({
+            "success": True,
+            "message": f"CSV upload completed",
+            "summary": {
+                "inserted": inserted_count,
+                "skipped": skipped_count,
+                "total_rows": inserted_count + skipped_count
+            },
+            "errors": errors.messages,  # First MAX_CSV_ERRORS errors
+            "error_count": errors.count
+        }), 200
     except Exception as e:
-        app.logger.error(f"Error in upload_csv endpoint: {e}")
+        app.logger.exception("Error processing CSV upload")
+        if inserted_count:
+            # Earlier batches are already committed
+            schedule_invalidate("stats", "analytics")
+            schedule_mv_refresh()
         return jsonify({
-            "error": "Failed to process request",
-            "details": str(e)
+            "error": "Failed to process CSV file",
+            "details": str(e),
+            "inserted": inserted_count  # Places saved before the failure
         }), 500
 
 # ============================================================================
 # USER ACCOUNTS & PERSONAL LISTS ENDPOINTS
 # ============================================================================
 
+# bcrypt is deliberately slow (~100-300 ms of CPU). It releases the GIL, so run it
+# on a small dedicated pool: concurrent logins are capped at BCRYPT_WORKERS cores
+# instead of taking every request thread's CPU away from the other endpoints.
+BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS", str(min(os.cpu_count() or 1, 4))))
+_bcrypt_pool = ThreadPoolExecutor(max_workers=BCRYPT_WORKERS, thread_name_prefix="bcrypt")
+
+# Work factor for new hashes (each +1 doubles the cost). Stored hashes below it are
+# upgraded on the user's next successful login.
+BCRYPT_COST = int(os.getenv("BCRYPT_COST", "12"))
+
+def hash_password(password):
+    """Hash a password with bcrypt (BCRYPT_COST rounds) on the bcrypt pool."""
+    hashed = _bcrypt_pool.submit(bcrypt.hashpw, password.encode('utf-8'), bcrypt.gensalt(BCRYPT_COST)).result()
+    return hashed.decode('utf-8')
+
+def password_needs_rehash(password_hash):
+    """True if a stored hash ($2b$<cost>$...) uses fewer rounds than BCRYPT_COST."""
+    try:
+        return int(password_hash.split('$')[2]) < BCRYPT_COST
+    except (IndexError, ValueError):
+        return False
+
+def check_password(password, password_hash):
+    """Verify a password against its stored bcrypt hash on the bcrypt pool.
+    
+    Re-hashes with the stored salt and compares in constant time.
+    """
+    stored = password_hash.encode('utf-8')
+    recomputed = _bcrypt_pool.submit(bcrypt.hashpw, password.encode('utf-8'), stored).result()
+    return hmac.compare_digest(recomputed, stored)
+
+_dummy_password_hash = None  # Built on first use so startup doesn't pay for a bcrypt hash
+
+def burn_password_check(password):
+    """Spend the same bcrypt time as check_password when there is no user to check.
+    
+    Keeps "unknown username" and "wrong password" indistinguishable by timing.
+    """
+    global _dummy_password_hash
+    if _dummy_password_hash is None:
+        _dummy_password_hash = hash_password(token_hex(16))
+    check_password(password, _dummy_password_hash)
+
 @app.post("/api/users/register")
 def register_user():
     """Register a new user account for personal lists."""
@@ -1886,7 +2444,7 @@ def register_user():
             return jsonify({"error": "Password must be at least 6 characters"}), 400
         
         # Hash password
-        password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        password_hash = hash_password(password)
         
         # Use admin connection for registration (requires INSERT permission on users table)
         with get_admin_conn() as conn, conn.cursor() as cur:
@@ -1937,34 +2495,72 @@ def login_user():
         with get_conn() as conn, conn.cursor() as cur:
             cur.execute("SELECT user_id, username, email, password_hash FROM users WHERE username = %s", (username,))
             user = cur.fetchone()
-            
-            if not user:
-                return jsonify({"error": "Invalid username or password"}), 401
-            
-            user_id, db_username, email, password_hash = user
-            
-            # Verify password
-            if not bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8')):
-                return jsonify({"error": "Invalid username or password"}), 401
-            
-            # Generate token with user_id
-            token = generate_token(db_username, user_id=user_id)
-            
-            return jsonify({
-                "success": True,
-                "token": token,
-                "user": {
-                    "user_id": user_id,
-                    "username": db_username,
-                    "email": email
-                },
-                "message": "Login successful"
-            }), 200
-            
+        
+        if not user:
+            burn_password_check(password)
+            return jsonify({"error": "Invalid username or password"}), 401
+        
+        user_id, db_username, email, password_hash = user
+        
+        # Verify password (after the connection is back in the pool - bcrypt is slow)
+        if not check_password(password, password_hash):
+            return jsonify({"error": "Invalid username or password"}), 401
+        
+        # Upgrade hashes created with a lower BCRYPT_COST now that we have the password
+        if password_needs_rehash(password_hash):
+            try:
+                new_hash = hash_password(password)
+                with get_admin_conn() as conn, conn.cursor() as cur:
+                    cur.execute("UPDATE users SET password_hash = %s WHERE user_id = %s", (new_hash, user_id))
+                    conn.commit()
+            except Exception as e:
+                # Not fatal - the old hash still works and we'll try again next login
+                app.logger.warning(f"Password rehash failed for user {user_id}: {e}")
+        
+        # Generate token with user_id
+        token = generate_token(db_username, user_id=user_id)
+        
+        return jsonify({
+            "success": True,
+            "token": token,
+            "user": {
+                "user_id": user_id,
+                "username": db_username,
+                "email": email
+            },
+            "message": "Login successful"
+        }), 200
+        
     except Exception as e:
         app.logger.error(f"User login error: {e}")
         return jsonify({"error": "Login failed", "details": str(e)}), 500
 
+# users columns added by db/schema_user_profile.sql, in profile response order
+USER_OPTIONAL_COLUMNS = ('updated_at', 'display_name', 'profile_photo_url', 'bio', 'location', 'website')
+_user_optional_columns = None
+
+def get_user_optional_columns(cur):
+    """Return the USER_OPTIONAL_COLUMNS that exist on the users table.
+    
+    Remembered for the life of the process once all of them exist; until then
+    the migration may still be run, so keep checking.
+    """
+    global _user_optional_columns
+    if _user_optional_columns is not None:
+        return _user_optional_columns
+    
+    # Own cursor, so the caller's row factory doesn't matter
+    with cur.connection.cursor() as column_cur:
+        column_cur.execute("""
+            SELECT column_name 
+            FROM information_schema.columns 
+            WHERE table_name = 'users' AND column_name = ANY(%s)
+        """, (list(USER_OPTIONAL_COLUMNS),))
+        existing = frozenset(row[0] for row in column_cur.fetchall())
+    if len(existing) == len(USER_OPTIONAL_COLUMNS):
+        _user_optional_columns = existing
+    return existing
+
 @app.get("/api/users/profile")
 def get_user_profile():
     """Get current user profile and list statistics."""
@@ -1973,77 +2569,40 @@ def get_user_profile():
         return jsonify({"error": "Authentication required"}), 401
     
     try:
-        with get_conn() as conn, conn.cursor() as cur:
-            # Check if profile columns exist first (before any queries that might fail)
-            cur.execute("""
-                SELECT column_name 
-                FROM information_schema.columns 
-                WHERE table_name = 'users' AND column_name IN ('display_name', 'profile_photo_url', 'bio', 'location', 'website', 'updated_at')
-            """)
-            existing_columns = {row[0] for row in cur.fetchall()}
-            
-            # Build SELECT query based on available columns
-            base_cols = ["user_id", "username", "email", "created_at"]
-            if 'updated_at' in existing_columns:
-                base_cols.append("updated_at")
-            else:
-                base_cols.append("NULL as updated_at")
+        with get_read_conn() as conn, conn.cursor(row_factory=dict_row) as cur:
+            existing_columns = get_user_optional_columns(cur)
             
-            # Add profile columns if they exist, otherwise use NULL
-            for col in ['display_name', 'profile_photo_url', 'bio', 'location', 'website']:
-                if col in existing_columns:
-                    base_cols.append(col)
-                else:
-                    base_cols.append(f"NULL as {col}")
+            # Optional columns that haven't been migrated yet come back as NULL
+            optional_cols = [
+                col if col in existing_columns else f"NULL as {col}"
+                for col in USER_OPTIONAL_COLUMNS
+            ]
             
-            query = f"""
-                SELECT {', '.join(base_cols)}
+            # Profile and list counts in one row
+            cur.execute(f"""
+                SELECT user_id, username, email, created_at, {', '.join(optional_cols)},
+                    (SELECT COUNT(*) FROM user_visited_places v WHERE v.user_id = users.user_id) as visited_count,
+                    (SELECT COUNT(*) FROM user_wishlist w WHERE w.user_id = users.user_id) as wishlist_count,
+                    (SELECT COUNT(*) FROM user_liked_places l WHERE l.user_id = users.user_id) as liked_count
                 FROM users WHERE user_id = %s
-            """
-            
-            cur.execute(query, (user_id,))
+            """, (user_id,))
             user = cur.fetchone()
             
             if not user:
                 return jsonify({"error": "User not found"}), 404
             
-            # Get list counts
-            cur.execute("SELECT COUNT(*) FROM user_visited_places WHERE user_id = %s", (user_id,))
-            visited_count = cur.fetchone()[0]
-            
-            cur.execute("SELECT COUNT(*) FROM user_wishlist WHERE user_id = %s", (user_id,))
-            wishlist_count = cur.fetchone()[0]
-            
-            cur.execute("SELECT COUNT(*) FROM user_liked_places WHERE user_id = %s", (user_id,))
-            liked_count = cur.fetchone()[0]
-            
-            # Build user dict based on query results (columns are in fixed order)
-            idx = 0
-            user_dict = {
-                "user_id": user[idx],
-                "username": user[idx + 1],
-                "email": user[idx + 2],
-                "created_at": user[idx + 3].isoformat() if user[idx + 3] else None,
+            statistics = {
+                "visited_count": user.pop("visited_count"),
+                "wishlist_count": user.pop("wishlist_count"),
+                "liked_count": user.pop("liked_count")
             }
-            idx = 4
-            
-            # Add updated_at (always included in query, may be NULL)
-            user_dict["updated_at"] = user[idx].isoformat() if user[idx] else None
-            idx += 1
-            
-            # Add profile fields (always included in query as columns or NULL, in fixed order)
-            profile_fields = ['display_name', 'profile_photo_url', 'bio', 'location', 'website']
-            for col in profile_fields:
-                user_dict[col] = user[idx] if idx < len(user) and user[idx] is not None else None
-                idx += 1
+            for col in ("created_at", "updated_at"):
+                if user[col]:
+                    user[col] = user[col].isoformat()
             
             return jsonify({
-                "user": user_dict,
-                "statistics": {
-                    "visited_count": visited_count,
-                    "wishlist_count": wishlist_count,
-                    "liked_count": liked_count
-                }
+                "user": user,
+                "statistics": statistics
             }), 200
             
     except Exception as e:
@@ -2102,12 +2661,7 @@ def update_user_profile():
         
         with get_conn() as conn, conn.cursor() as cur:
             # Check if profile columns exist
-            cur.execute("""
-                SELECT column_name 
-                FROM information_schema.columns 
-                WHERE table_name = 'users' AND column_name IN ('display_name', 'profile_photo_url', 'bio', 'location', 'website')
-            """)
-            existing_columns = {row[0] for row in cur.fetchall()}
+            existing_columns = get_user_optional_columns(cur) - {'updated_at'}
             
             if not existing_columns:
                 return jsonify({"error": "Profile columns not available. Please run the database migration (db/schema_user_profile.sql)."}), 400
@@ -2208,33 +2762,37 @@ def update_user_profile():
 def get_users_stats():
     """Get statistics about registered users (public endpoint)."""
     try:
-        with get_conn() as conn, conn.cursor() as cur:
-            # Get total users
-            cur.execute("SELECT COUNT(*) FROM users")
-            total_users = cur.fetchone()[0]
-            
-            # Get users with list activity
-            cur.execute("""
-                SELECT COUNT(DISTINCT user_id) 
-                FROM (
-                    SELECT user_id FROM user_visited_places
-                    UNION
-                    SELECT user_id FROM user_wishlist
-                    UNION
-                    SELECT user_id FROM user_liked_places
-                ) active_users
-            """)
-            active_users = cur.fetchone()[0]
-            
-            # Get total list entries
-            cur.execute("SELECT COUNT(*) FROM user_visited_places")
-            total_visited = cur.fetchone()[0]
-            
-            cur.execute("SELECT COUNT(*) FROM user_wishlist")
-            total_wishlist = cur.fetchone()[0]
-            
-            cur.execute("SELECT COUNT(*) FROM user_liked_places")
-            total_liked = cur.fetchone()[0]
+        with get_read_conn() as conn, conn.cursor() as cur:
+            # Precomputed by db/schema_user_list_stats_mv.sql (refreshed out-of-band)
+            try:
+                cur.execute("""
+                    SELECT total_users, active_users, total_visited, total_wishlist, total_liked
+                    FROM user_list_stats_mv
+                """)
+                row = cur.fetchone()
+            except psycopg.errors.UndefinedTable:
+                conn.rollback()  # View not created yet - compute live below
+                row = None
+            
+            if not row:
+                # Same numbers as the view, in one round trip
+                cur.execute("""
+                    SELECT
+                        (SELECT COUNT(*) FROM users),
+                        (SELECT COUNT(*) FROM (
+                            SELECT user_id FROM user_visited_places
+                            UNION
+                            SELECT user_id FROM user_wishlist
+                            UNION
+                            SELECT user_id FROM user_liked_places
+                        ) active_users),
+                        (SELECT COUNT(*) FROM user_visited_places),
+                        (SELECT COUNT(*) FROM user_wishlist),
+                        (SELECT COUNT(*) FROM user_liked_places)
+                """)
+                row = cur.fetchone()
+            
+            total_users, active_users, total_visited, total_wishlist, total_liked = row
             
             return jsonify({
                 "total_users": total_users,
@@ -2250,6 +2808,68 @@ def get_users_stats():
         app.logger.error(f"Error getting users stats: {e}")
         return jsonify({"error": "Failed to get users stats", "details": str(e)}), 500
 
+def list_version_etag(cur, user_id, list_name, *variant):
+    """Weak ETag for one of the user's lists, or None if it can't be versioned.
+    
+    Built from the user_list_versions counter (db/schema_user_list_versions.sql)
+    plus `variant` - request args that change the body, like the distance
+    reference point - so checking it is a single primary key lookup.
+    """
+    try:
+        cur.execute(
+            "SELECT version FROM user_list_versions WHERE user_id = %s AND list_name = %s",
+            (user_id, list_name), prepare=True
+        )
+        row = cur.fetchone()
+    except (psycopg.errors.UndefinedTable, psycopg.errors.InsufficientPrivilege):
+        cur.connection.rollback()  # Versions table not installed - serve without ETags
+        return None
+    version = row[0] if row else 0
+    return hashlib.blake2b(f"{user_id}:{list_name}:{version}:{variant}".encode(), digest_size=8).hexdigest()
+
+# Table behind each personal list (also the <list_name> values of the batch routes)
+USER_LIST_TABLES = {
+    "visited": "user_visited_places",
+    "wishlist": "user_wishlist",
+    "liked": "user_liked_places",
+}
+
+def remove_from_user_list(user_id, list_name, place_ids):
+    """Remove places from one of the user's lists with a single DELETE.
+    
+    Returns the place_ids that were actually on the list.
+    """
+    with get_conn() as conn, conn.cursor() as cur:
+        cur.execute(
+            f"DELETE FROM {USER_LIST_TABLES[list_name]} WHERE user_id = %s AND place_id = ANY(%s) RETURNING place_id",
+            (user_id, place_ids), prepare=True
+        )
+        removed = [row[0] for row in cur.fetchall()]
+        conn.commit()
+    
+    for place_id in place_ids:
+        invalidate_list_status_cache(user_id, place_id)
+    return removed
+
+def parse_place_ids(data, max_ids):
+    """Validate a {"place_ids": [...]} body. Returns (place_ids, None) or (None, error response)."""
+    place_ids = data.get("place_ids")
+    if not isinstance(place_ids, list):
+        return None, (jsonify({"error": "place_ids must be a list"}), 400)
+    if len(place_ids) > max_ids:
+        return None, (jsonify({"error": f"At most {max_ids} place_ids per request"}), 400)
+    try:
+        return list({int(pid) for pid in place_ids}), None
+    except (TypeError, ValueError):
+        return None, (jsonify({"error": "place_ids must be integers"}), 400)
+
+def tag_list_response(response, etag):
+    """Attach a list ETag; clients must revalidate, since the list is per-user."""
+    if etag:
+        response.set_etag(etag, weak=True)
+        response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
 # ============================================================================
 # VISITED LIST ENDPOINTS
 # ============================================================================
@@ -2267,62 +2887,58 @@ def get_visited_list():
     calculate_distance = ref_lat is not None and ref_lon is not None
     
     try:
-        with get_conn() as conn, conn.cursor() as cur:
+        with get_read_conn() as conn, conn.cursor() as cur:
+            # Client already has this version of the list - skip the query entirely
+            etag = list_version_etag(cur, user_id, "visited", ref_lat, ref_lon)
+            if etag and request.if_none_match.contains_weak(etag):
+                return tag_list_response(make_response("", 304), etag)
+            
+            cur.row_factory = dict_row
             if calculate_distance:
-                # Use PostGIS to calculate distance in kilometers
-                ref_point = f"ST_SetSRID(ST_MakePoint({ref_lon}, {ref_lat}), 4326)"
-                cur.execute(f"""
+                # Great-circle distance in kilometers straight from the 4326 geometry
+                cur.execute("""
                     SELECT p.id, p.name, p.city, p.state, p.country, p.lat, p.lon,
                            v.visited_at, v.notes,
-                           ST_Distance(
-                               ST_Transform(p.geom, 3857),
-                               ST_Transform({ref_point}, 3857)
-                           ) / 1000.0 as distance_km
+                           round((ST_DistanceSphere(p.geom, ST_SetSRID(ST_MakePoint(%s, %s), 4326)) / 1000.0)::numeric, 2)::float8 as distance_km
                     FROM user_visited_places v
                     JOIN places p ON v.place_id = p.id
                     WHERE v.user_id = %s
                     ORDER BY distance_km ASC, v.visited_at DESC
-                """, (user_id,))
+                """, (ref_lon, ref_lat, user_id), prepare=True)
             else:
                 cur.execute("""
                     SELECT p.id, p.name, p.city, p.state, p.country, p.lat, p.lon,
-                           v.visited_at, v.notes,
-                           NULL as distance_km
+                           v.visited_at, v.notes
                     FROM user_visited_places v
                     JOIN places p ON v.place_id = p.id
                     WHERE v.user_id = %s
                     ORDER BY v.visited_at DESC
-                """, (user_id,))
+                """, (user_id,), prepare=True)
             
-            places = []
-            for row in cur.fetchall():
-                place_data = {
-                    "id": row[0],
-                    "name": row[1],
-                    "city": row[2],
-                    "state": row[3],
-                    "country": row[4],
-                    "lat": float(row[5]) if row[5] else None,
-                    "lon": float(row[6]) if row[6] else None,
-                    "visited_at": row[7].isoformat() if row[7] else None,
-                    "notes": row[8]
-                }
-                if calculate_distance and row[9] is not None:
-                    place_data["distance_km"] = round(float(row[9]), 2)
-                
-                places.append(place_data)
+            # Rows come back as dicts keyed by the column names above,
+            # which are already the response field names
+            places = cur.fetchall()
+            for place in places:
+                if place["visited_at"]:
+                    place["visited_at"] = place["visited_at"].isoformat()
             
-            return jsonify({
+            return tag_list_response(json_response({
                 "success": True, 
                 "places": places, 
                 "count": len(places),
                 "reference_location": {"lat": ref_lat, "lon": ref_lon} if calculate_distance else None
-            }), 200
+            }), etag), 200
             
     except Exception as e:
         app.logger.error(f"Error getting visited list: {e}")
         return jsonify({"error": "Failed to get visited list", "details": str(e)}), 500
 
+# place_id foreign keys on the list tables (schema_user_lists.sql declares both
+# an inline REFERENCES and a named constraint, so either can report the violation)
+VISITED_PLACE_FKEYS = {"user_visited_places_place_id_fkey", "fk_place_visited"}
+WISHLIST_PLACE_FKEYS = {"user_wishlist_place_id_fkey", "fk_place_wish"}
+LIKED_PLACE_FKEYS = {"user_liked_places_place_id_fkey", "fk_place_liked"}
+
 @app.post("/api/user/visited")
 def add_to_visited():
     """Mark a place as visited."""
@@ -2339,11 +2955,6 @@ def add_to_visited():
             return jsonify({"error": "place_id required"}), 400
         
         with get_conn() as conn, conn.cursor() as cur:
-            # Check if place exists
-            cur.execute("SELECT id FROM places WHERE id = %s", (place_id,))
-            if not cur.fetchone():
-                return jsonify({"error": "Place not found"}), 404
-            
             # Add to visited (or update if exists)
             cur.execute("""
                 INSERT INTO user_visited_places (user_id, place_id, notes)
@@ -2351,10 +2962,11 @@ def add_to_visited():
                 ON CONFLICT (user_id, place_id)
                 DO UPDATE SET notes = EXCLUDED.notes, visited_at = CURRENT_TIMESTAMP
                 RETURNING visit_id, visited_at
-            """, (user_id, place_id, notes))
+            """, (user_id, place_id, notes), prepare=True)
             
             result = cur.fetchone()
             conn.commit()
+            invalidate_list_status_cache(user_id, place_id)
             
             return jsonify({
                 "success": True,
@@ -2363,6 +2975,12 @@ def add_to_visited():
                 "message": "Place marked as visited"
             }), 201
             
+    except psycopg.errors.ForeignKeyViolation as e:
+        # The INSERT's place_id foreign key doubles as the existence check
+        if e.diag.constraint_name in VISITED_PLACE_FKEYS:
+            return jsonify({"error": "Place not found"}), 404
+        app.logger.error(f"Error adding to visited: {e}")
+        return jsonify({"error": "Failed to add to visited", "details": str(e)}), 500
     except Exception as e:
         app.logger.error(f"Error adding to visited: {e}")
         return jsonify({"error": "Failed to add to visited", "details": str(e)}), 500
@@ -2375,12 +2993,9 @@ def remove_from_visited(place_id):
         return jsonify({"error": "Authentication required"}), 401
     
     try:
-        with get_conn() as conn, conn.cursor() as cur:
-            cur.execute("DELETE FROM user_visited_places WHERE user_id = %s AND place_id = %s", (user_id, place_id))
-            conn.commit()
-            
-            return jsonify({"success": True, "message": "Removed from visited list"}), 200
-            
+        remove_from_user_list(user_id, "visited", [place_id])
+        return jsonify({"success": True, "message": "Removed from visited list"}), 200
+        
     except Exception as e:
         app.logger.error(f"Error removing from visited: {e}")
         return jsonify({"error": "Failed to remove from visited", "details": str(e)}), 500
@@ -2402,58 +3017,47 @@ def get_wishlist():
     calculate_distance = ref_lat is not None and ref_lon is not None
     
     try:
-        with get_conn() as conn, conn.cursor() as cur:
+        with get_read_conn() as conn, conn.cursor() as cur:
+            # Client already has this version of the list - skip the query entirely
+            etag = list_version_etag(cur, user_id, "wishlist", ref_lat, ref_lon)
+            if etag and request.if_none_match.contains_weak(etag):
+                return tag_list_response(make_response("", 304), etag)
+            
+            cur.row_factory = dict_row
             if calculate_distance:
-                # Use PostGIS to calculate distance in kilometers
-                ref_point = f"ST_SetSRID(ST_MakePoint({ref_lon}, {ref_lat}), 4326)"
-                cur.execute(f"""
+                # Great-circle distance in kilometers straight from the 4326 geometry
+                cur.execute("""
                     SELECT p.id, p.name, p.city, p.state, p.country, p.lat, p.lon,
                            w.priority, w.added_at, w.notes,
-                           ST_Distance(
-                               ST_Transform(p.geom, 3857),
-                               ST_Transform({ref_point}, 3857)
-                           ) / 1000.0 as distance_km
+                           round((ST_DistanceSphere(p.geom, ST_SetSRID(ST_MakePoint(%s, %s), 4326)) / 1000.0)::numeric, 2)::float8 as distance_km
                     FROM user_wishlist w
                     JOIN places p ON w.place_id = p.id
                     WHERE w.user_id = %s
                     ORDER BY distance_km ASC, w.priority DESC, w.added_at DESC
-                """, (user_id,))
+                """, (ref_lon, ref_lat, user_id), prepare=True)
             else:
                 cur.execute("""
                     SELECT p.id, p.name, p.city, p.state, p.country, p.lat, p.lon,
-                           w.priority, w.added_at, w.notes,
-                           NULL as distance_km
+                           w.priority, w.added_at, w.notes
                     FROM user_wishlist w
                     JOIN places p ON w.place_id = p.id
                     WHERE w.user_id = %s
                     ORDER BY w.priority DESC, w.added_at DESC
-                """, (user_id,))
+                """, (user_id,), prepare=True)
             
-            places = []
-            for row in cur.fetchall():
-                place_data = {
-                    "id": row[0],
-                    "name": row[1],
-                    "city": row[2],
-                    "state": row[3],
-                    "country": row[4],
-                    "lat": float(row[5]) if row[5] else None,
-                    "lon": float(row[6]) if row[6] else None,
-                    "priority": row[7],
-                    "added_at": row[8].isoformat() if row[8] else None,
-                    "notes": row[9]
-                }
-                if calculate_distance and row[10] is not None:
-                    place_data["distance_km"] = round(float(row[10]), 2)
-                
-                places.append(place_data)
+            # Rows come back as dicts keyed by the column names above,
+            # which are already the response field names
+            places = cur.fetchall()
+            for place in places:
+                if place["added_at"]:
+                    place["added_at"] = place["added_at"].isoformat()
             
-            return jsonify({
+            return tag_list_response(json_response({
                 "success": True, 
                 "places": places, 
                 "count": len(places),
                 "reference_location": {"lat": ref_lat, "lon": ref_lon} if calculate_distance else None
-            }), 200
+            }), etag), 200
             
     except Exception as e:
         app.logger.error(f"Error getting wishlist: {e}")
@@ -2479,11 +3083,6 @@ def add_to_wishlist():
             priority = 1
         
         with get_conn() as conn, conn.cursor() as cur:
-            # Check if place exists
-            cur.execute("SELECT id FROM places WHERE id = %s", (place_id,))
-            if not cur.fetchone():
-                return jsonify({"error": "Place not found"}), 404
-            
             # Add to wishlist
             cur.execute("""
                 INSERT INTO user_wishlist (user_id, place_id, priority, notes)
@@ -2491,10 +3090,11 @@ def add_to_wishlist():
                 ON CONFLICT (user_id, place_id)
                 DO UPDATE SET priority = EXCLUDED.priority, notes = EXCLUDED.notes
                 RETURNING wish_id, added_at
-            """, (user_id, place_id, priority, notes))
+            """, (user_id, place_id, priority, notes), prepare=True)
             
             result = cur.fetchone()
             conn.commit()
+            invalidate_list_status_cache(user_id, place_id)
             
             return jsonify({
                 "success": True,
@@ -2503,6 +3103,12 @@ def add_to_wishlist():
                 "message": "Added to wishlist"
             }), 201
             
+    except psycopg.errors.ForeignKeyViolation as e:
+        # The INSERT's place_id foreign key doubles as the existence check
+        if e.diag.constraint_name in WISHLIST_PLACE_FKEYS:
+            return jsonify({"error": "Place not found"}), 404
+        app.logger.error(f"Error adding to wishlist: {e}")
+        return jsonify({"error": "Failed to add to wishlist", "details": str(e)}), 500
     except Exception as e:
         app.logger.error(f"Error adding to wishlist: {e}")
         return jsonify({"error": "Failed to add to wishlist", "details": str(e)}), 500
@@ -2515,12 +3121,9 @@ def remove_from_wishlist(place_id):
         return jsonify({"error": "Authentication required"}), 401
     
     try:
-        with get_conn() as conn, conn.cursor() as cur:
-            cur.execute("DELETE FROM user_wishlist WHERE user_id = %s AND place_id = %s", (user_id, place_id))
-            conn.commit()
-            
-            return jsonify({"success": True, "message": "Removed from wishlist"}), 200
-            
+        remove_from_user_list(user_id, "wishlist", [place_id])
+        return jsonify({"success": True, "message": "Removed from wishlist"}), 200
+        
     except Exception as e:
         app.logger.error(f"Error removing from wishlist: {e}")
         return jsonify({"error": "Failed to remove from wishlist", "details": str(e)}), 500
@@ -2542,58 +3145,47 @@ def get_liked_list():
     calculate_distance = ref_lat is not None and ref_lon is not None
     
     try:
-        with get_conn() as conn, conn.cursor() as cur:
+        with get_read_conn() as conn, conn.cursor() as cur:
+            # Client already has this version of the list - skip the query entirely
+            etag = list_version_etag(cur, user_id, "liked", ref_lat, ref_lon)
+            if etag and request.if_none_match.contains_weak(etag):
+                return tag_list_response(make_response("", 304), etag)
+            
+            cur.row_factory = dict_row
             if calculate_distance:
-                # Use PostGIS to calculate distance in kilometers
-                ref_point = f"ST_SetSRID(ST_MakePoint({ref_lon}, {ref_lat}), 4326)"
-                cur.execute(f"""
+                # Great-circle distance in kilometers straight from the 4326 geometry
+                cur.execute("""
                     SELECT p.id, p.name, p.city, p.state, p.country, p.lat, p.lon,
                            l.rating, l.liked_at, l.notes,
-                           ST_Distance(
-                               ST_Transform(p.geom, 3857),
-                               ST_Transform({ref_point}, 3857)
-                           ) / 1000.0 as distance_km
+                           round((ST_DistanceSphere(p.geom, ST_SetSRID(ST_MakePoint(%s, %s), 4326)) / 1000.0)::numeric, 2)::float8 as distance_km
                     FROM user_liked_places l
                     JOIN places p ON l.place_id = p.id
                     WHERE l.user_id = %s
                     ORDER BY distance_km ASC, l.liked_at DESC
-                """, (user_id,))
+                """, (ref_lon, ref_lat, user_id), prepare=True)
             else:
                 cur.execute("""
                     SELECT p.id, p.name, p.city, p.state, p.country, p.lat, p.lon,
-                           l.rating, l.liked_at, l.notes,
-                           NULL as distance_km
+                           l.rating, l.liked_at, l.notes
                     FROM user_liked_places l
                     JOIN places p ON l.place_id = p.id
                     WHERE l.user_id = %s
                     ORDER BY l.liked_at DESC
-                """, (user_id,))
+                """, (user_id,), prepare=True)
             
-            places = []
-            for row in cur.fetchall():
-                place_data = {
-                    "id": row[0],
-                    "name": row[1],
-                    "city": row[2],
-                    "state": row[3],
-                    "country": row[4],
-                    "lat": float(row[5]) if row[5] else None,
-                    "lon": float(row[6]) if row[6] else None,
-                    "rating": row[7],
-                    "liked_at": row[8].isoformat() if row[8] else None,
-                    "notes": row[9]
-                }
-                if calculate_distance and row[10] is not None:
-                    place_data["distance_km"] = round(float(row[10]), 2)
-                
-                places.append(place_data)
+            # Rows come back as dicts keyed by the column names above,
+            # which are already the response field names
+            places = cur.fetchall()
+            for place in places:
+                if place["liked_at"]:
+                    place["liked_at"] = place["liked_at"].isoformat()
             
-            return jsonify({
+            return tag_list_response(json_response({
                 "success": True, 
                 "places": places, 
                 "count": len(places),
                 "reference_location": {"lat": ref_lat, "lon": ref_lon} if calculate_distance else None
-            }), 200
+            }), etag), 200
             
     except Exception as e:
         app.logger.error(f"Error getting liked list: {e}")
@@ -2619,11 +3211,6 @@ def add_to_liked():
             rating = None
         
         with get_conn() as conn, conn.cursor() as cur:
-            # Check if place exists
-            cur.execute("SELECT id FROM places WHERE id = %s", (place_id,))
-            if not cur.fetchone():
-                return jsonify({"error": "Place not found"}), 404
-            
             # Add to liked
             cur.execute("""
                 INSERT INTO user_liked_places (user_id, place_id, rating, notes)
@@ -2632,10 +3219,11 @@ def add_to_liked():
                 DO UPDATE SET rating = COALESCE(EXCLUDED.rating, user_liked_places.rating),
                               notes = EXCLUDED.notes
                 RETURNING like_id, liked_at
-            """, (user_id, place_id, rating, notes))
+            """, (user_id, place_id, rating, notes), prepare=True)
             
             result = cur.fetchone()
             conn.commit()
+            invalidate_list_status_cache(user_id, place_id)
             
             return jsonify({
                 "success": True,
@@ -2644,6 +3232,12 @@ def add_to_liked():
                 "message": "Place liked"
             }), 201
             
+    except psycopg.errors.ForeignKeyViolation as e:
+        # The INSERT's place_id foreign key doubles as the existence check
+        if e.diag.constraint_name in LIKED_PLACE_FKEYS:
+            return jsonify({"error": "Place not found"}), 404
+        app.logger.error(f"Error adding to liked: {e}")
+        return jsonify({"error": "Failed to like place", "details": str(e)}), 500
     except Exception as e:
         app.logger.error(f"Error adding to liked: {e}")
         return jsonify({"error": "Failed to like place", "details": str(e)}), 500
@@ -2656,12 +3250,9 @@ def remove_from_liked(place_id):
         return jsonify({"error": "Authentication required"}), 401
     
     try:
-        with get_conn() as conn, conn.cursor() as cur:
-            cur.execute("DELETE FROM user_liked_places WHERE user_id = %s AND place_id = %s", (user_id, place_id))
-            conn.commit()
-            
-            return jsonify({"success": True, "message": "Removed from liked list"}), 200
-            
+        remove_from_user_list(user_id, "liked", [place_id])
+        return jsonify({"success": True, "message": "Removed from liked list"}), 200
+        
     except Exception as e:
         app.logger.error(f"Error removing from liked: {e}")
         return jsonify({"error": "Failed to remove from liked", "details": str(e)}), 500
@@ -2682,13 +3273,13 @@ def get_place_status(place_id):
         }), 200  # Return defaults if not authenticated
     
     try:
-        with get_conn() as conn, conn.cursor() as cur:
+        with get_read_conn() as conn, conn.cursor() as cur:
             cur.execute("""
                 SELECT 
-                    (SELECT COUNT(*) FROM user_visited_places WHERE user_id = %s AND place_id = %s) > 0 as is_visited,
-                    (SELECT COUNT(*) FROM user_wishlist WHERE user_id = %s AND place_id = %s) > 0 as in_wishlist,
-                    (SELECT COUNT(*) FROM user_liked_places WHERE user_id = %s AND place_id = %s) > 0 as is_liked
-            """, (user_id, place_id, user_id, place_id, user_id, place_id))
+                    EXISTS (SELECT 1 FROM user_visited_places WHERE user_id = %s AND place_id = %s) as is_visited,
+                    EXISTS (SELECT 1 FROM user_wishlist WHERE user_id = %s AND place_id = %s) as in_wishlist,
+                    EXISTS (SELECT 1 FROM user_liked_places WHERE user_id = %s AND place_id = %s) as is_liked
+            """, (user_id, place_id, user_id, place_id, user_id, place_id), prepare=True)
             
             result = cur.fetchone()
             
@@ -2707,24 +3298,69 @@ def get_place_status(place_id):
             "error": str(e)
         }), 200  # Return defaults on error
 
+MAX_PLACE_ID_BATCH = 1000  # place_ids accepted by the batch status/delete endpoints
+
+@app.post("/api/user/place-status")
+def get_place_status_batch():
+    """Get list status for many places at once. Body: {"place_ids": [1, 2, ...]}.
+    
+    Returns {"statuses": {place_id: {"visited", "in_wishlist", "liked"}}} with an
+    entry for every requested place, so a map or list view needs one request
+    instead of one per place.
+    """
+    place_ids, error = parse_place_ids(request.get_json(silent=True) or {}, MAX_PLACE_ID_BATCH)
+    if error:
+        return error
+    
+    # Not logged in: nothing is on any list (same as GET /api/user/place-status/<id>)
+    user_id = get_user_id_from_request()
+    status = get_places_list_status(user_id, place_ids)
+    
+    return json_response({
+        "statuses": {str(pid): status.get(pid, _NO_STATUS) for pid in place_ids}
+    }), 200
+
+@app.post("/api/user/<any(visited, wishlist, liked):list_name>/delete-batch")
+def remove_from_list_batch(list_name):
+    """Remove many places from a list in one request. Body: {"place_ids": [1, 2, ...]}."""
+    user_id = get_user_id_from_request()
+    if not user_id:
+        return jsonify({"error": "Authentication required"}), 401
+    
+    place_ids, error = parse_place_ids(request.get_json(silent=True) or {}, MAX_PLACE_ID_BATCH)
+    if error:
+        return error
+    
+    try:
+        removed = remove_from_user_list(user_id, list_name, place_ids)
+        return jsonify({"success": True, "removed": removed, "count": len(removed)}), 200
+    except Exception as e:
+        app.logger.error(f"Error batch removing from {list_name}: {e}")
+        return jsonify({"error": f"Failed to remove from {list_name}", "details": str(e)}), 500
+
 # ============================================================================
 # GROUPS ENDPOINTS
 # ============================================================================
 
+def get_group_role(cur, group_id, user_id):
+    """Return the user's role in the group, or None if they aren't a member.
+    
+    Every group endpoint gates on this lookup, so it's sent as a prepared
+    statement and Postgres skips parse/plan on each pooled connection after
+    the first call.
+    """
+    cur.execute("""
+        SELECT role FROM group_members
+        WHERE group_id = %s AND user_id = %s
+    """, (group_id, user_id), prepare=True)
+    row = cur.fetchone()
+    return row[0] if row else None
+
 @app.route("/api/groups", methods=['POST', 'OPTIONS'])
+@require_auth
 def create_group():
     """Create a new group."""
-    if request.method == 'OPTIONS':
-        response = jsonify({})
-        response.headers.add('Access-Control-Allow-Origin', 'http://localhost:3000')
-        response.headers.add('Access-Control-Allow-Headers', 'Content-Type, Authorization, X-Auth-Token')
-        response.headers.add('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        response.headers.add('Access-Control-Allow-Credentials', 'true')
-        return response, 200
-    
-    user_id = get_user_id_from_request()
-    if not user_id:
-        return jsonify({"error": "Authentication required"}), 401
+    user_id = g.user_id
     
     try:
         data = request.get_json()
@@ -2770,24 +3406,13 @@ def create_group():
         return jsonify({"error": "Failed to create group", "details": str(e)}), 500
 
 @app.route("/api/groups", methods=['GET', 'OPTIONS'])
+@require_auth
 def get_user_groups():
     """Get all groups the current user belongs to."""
-    if request.method == 'OPTIONS':
-        # CORS preflight - Flask-CORS should handle this, but explicit handling for safety
-        response = jsonify({})
-        response.headers.add('Access-Control-Allow-Origin', 'http://localhost:3000')
-        response.headers.add('Access-Control-Allow-Headers', 'Content-Type, Authorization, X-Auth-Token')
-        response.headers.add('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        response.headers.add('Access-Control-Allow-Credentials', 'true')
-        return response, 200
-    
-    user_id = get_user_id_from_request()
-    if not user_id:
-        app.logger.warning(f"Groups request without authentication. Headers: {dict(request.headers)}")
-        return jsonify({"error": "Authentication required"}), 401
+    user_id = g.user_id
     
     try:
-        with get_conn() as conn, conn.cursor() as cur:
+        with get_read_conn() as conn, conn.cursor() as cur:
             # Check if profile columns exist
             cur.execute("""
                 SELECT column_name 
@@ -2797,18 +3422,17 @@ def get_user_groups():
             existing_columns = {row[0] for row in cur.fetchall()}
             has_profile_fields = 'display_name' in existing_columns and 'profile_photo_url' in existing_columns
             
-            # Get groups
+            # Get groups (member counts come with the previews below)
             cur.execute("""
                 SELECT g.group_id, g.name, g.description, g.created_by, g.created_at,
                        u.username as creator_username,
-                       gm.role, gm.joined_at,
-                       (SELECT COUNT(*) FROM group_members WHERE group_id = g.group_id) as member_count
+                       gm.role, gm.joined_at
                 FROM groups g
                 JOIN group_members gm ON g.group_id = gm.group_id
                 JOIN users u ON g.created_by = u.user_id
                 WHERE gm.user_id = %s
                 ORDER BY g.created_at DESC
-            """, (user_id,))
+            """, (user_id,), prepare=True)
             
             groups = []
             group_ids = []
@@ -2824,137 +3448,104 @@ def get_user_groups():
                     "creator_username": row[5],
                     "your_role": row[6],
                     "joined_at": row[7].isoformat() if row[7] else None,
-                    "member_count": row[8],
+                    "member_count": 0,  # Will be populated below
                     "member_preview": []  # Will be populated below
                 })
             
-            # Get member previews for all groups
+            # Member counts and the first 4 members (creator first) of every group in
+            # one pass over group_members, instead of a COUNT(*) subquery per group
+            # and fetching every member just to keep 4
             if group_ids:
                 if has_profile_fields:
-                    cur.execute("""
-                        SELECT gm.group_id, u.user_id, u.username, 
-                               COALESCE(u.display_name, u.username) as display_name,
-                               u.profile_photo_url
-                        FROM group_members gm
-                        JOIN users u ON gm.user_id = u.user_id
-                        WHERE gm.group_id = ANY(%s)
-                        ORDER BY 
-                            CASE WHEN u.user_id = (SELECT created_by FROM groups WHERE group_id = gm.group_id) THEN 0 ELSE 1 END,
-                            gm.joined_at
-                    """, (group_ids,))
+                    profile_columns = "COALESCE(u.display_name, u.username) as display_name, u.profile_photo_url"
                 else:
-                    cur.execute("""
-                        SELECT gm.group_id, u.user_id, u.username, 
-                               u.username as display_name,
-                               NULL as profile_photo_url
+                    profile_columns = "u.username as display_name, NULL as profile_photo_url"
+                cur.execute(f"""
+                    SELECT group_id, user_id, username, display_name, profile_photo_url, member_count
+                    FROM (
+                        SELECT gm.group_id, u.user_id, u.username, {profile_columns},
+                               COUNT(*) OVER (PARTITION BY gm.group_id) as member_count,
+                               ROW_NUMBER() OVER (
+                                   PARTITION BY gm.group_id
+                                   ORDER BY CASE WHEN u.user_id = g.created_by THEN 0 ELSE 1 END,
+                                            gm.joined_at
+                               ) as preview_rank
                         FROM group_members gm
+                        JOIN groups g ON g.group_id = gm.group_id
                         JOIN users u ON gm.user_id = u.user_id
                         WHERE gm.group_id = ANY(%s)
-                        ORDER BY 
-                            CASE WHEN u.user_id = (SELECT created_by FROM groups WHERE group_id = gm.group_id) THEN 0 ELSE 1 END,
-                            gm.joined_at
-                    """, (group_ids,))
-                
-                # Group members by group_id and limit to 4 per group
-                members_by_group = {}
-                for row in cur.fetchall():
-                    gid, uid, username, display_name, photo_url = row
-                    if gid not in members_by_group:
-                        members_by_group[gid] = []
-                    if len(members_by_group[gid]) < 4:
-                        members_by_group[gid].append({
-                            "user_id": uid,
-                            "username": username,
-                            "display_name": display_name,
-                            "profile_photo_url": photo_url
-                        })
-                
-                # Assign member previews to groups
-                for group in groups:
-                    group["member_preview"] = members_by_group.get(group["group_id"], [])
-            
-            app.logger.info(f"Successfully retrieved {len(groups)} groups for user {user_id}")
-            return jsonify({"success": True, "groups": groups}), 200
-            
-    except Exception as e:
-        app.logger.error(f"Error getting groups for user {user_id}: {e}", exc_info=True)
-        import traceback
-        app.logger.error(f"Traceback: {traceback.format_exc()}")
-        return jsonify({"error": "Failed to get groups", "details": str(e)}), 500
-
-@app.route("/api/groups/<int:group_id>", methods=['GET', 'OPTIONS'])
-def get_group_details(group_id):
-    """Get group details including members."""
-    if request.method == 'OPTIONS':
-        # CORS preflight - Flask-CORS should handle this, but explicit handling for safety
-        response = jsonify({})
-        response.headers.add('Access-Control-Allow-Origin', 'http://localhost:3000')
-        response.headers.add('Access-Control-Allow-Headers', 'Content-Type, Authorization, X-Auth-Token')
-        response.headers.add('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS')
-        response.headers.add('Access-Control-Allow-Credentials', 'true')
-        return response, 200
-    
-    user_id = get_user_id_from_request()
-    if not user_id:
-        app.logger.warning(f"Group details request without authentication for group {group_id}. Headers: {dict(request.headers)}")
-        return jsonify({"error": "Authentication required"}), 401
-    
-    try:
-        with get_conn() as conn, conn.cursor() as cur:
-            # Check if user is a member
-            cur.execute("""
-                SELECT role FROM group_members
-                WHERE group_id = %s AND user_id = %s
-            """, (group_id, user_id))
-            membership = cur.fetchone()
-            
-            if not membership:
-                app.logger.warning(f"User {user_id} attempted to access group {group_id} but is not a member")
-                return jsonify({"error": "You are not a member of this group"}), 403
+                    ) ranked
+                    WHERE preview_rank <= 4
+                    ORDER BY group_id, preview_rank
+                """, (group_ids,))
+                
+                groups_by_id = {group["group_id"]: group for group in groups}
+                for gid, uid, username, display_name, photo_url, member_count in cur.fetchall():
+                    group = groups_by_id[gid]
+                    group["member_count"] = member_count
+                    group["member_preview"].append({
+                        "user_id": uid,
+                        "username": username,
+                        "display_name": display_name,
+                        "profile_photo_url": photo_url
+                    })
             
-            # Get group info
-            cur.execute("""
-                SELECT g.group_id, g.name, g.description, g.created_by, g.created_at,
-                       u.username as creator_username
-                FROM groups g
-                JOIN users u ON g.created_by = u.user_id
-                WHERE g.group_id = %s
-            """, (group_id,))
+            app.logger.info(f"Successfully retrieved {len(groups)} groups for user {user_id}")
+            return json_response({"success": True, "groups": groups}), 200
             
-            group_row = cur.fetchone()
-            if not group_row:
-                app.logger.warning(f"Group {group_id} not found")
-                return jsonify({"error": "Group not found"}), 404
+    except Exception as e:
+        app.logger.error(f"Error getting groups for user {user_id}: {e}", exc_info=True)
+        return jsonify({"error": "Failed to get groups", "details": str(e)}), 500
+
+@app.route("/api/groups/<int:group_id>", methods=['GET', 'OPTIONS'])
+@require_auth
+def get_group_details(group_id):
+    """Get group details including members."""
+    user_id = g.user_id
+    
+    try:
+        with get_read_conn() as conn, conn.cursor() as cur:
+            # Pick the member columns up front rather than retrying on an
+            # undefined-column error, which would abort the transaction
+            if {'display_name', 'profile_photo_url'} <= get_user_optional_columns(cur):
+                profile_columns = "COALESCE(u.display_name, u.username) as display_name, u.profile_photo_url"
+            else:
+                profile_columns = "u.username as display_name, NULL as profile_photo_url"
             
-            # Get members with profile fields (handle case where columns don't exist)
-            try:
-                cur.execute("""
-                    SELECT u.user_id, u.username, u.email, 
-                           COALESCE(u.display_name, u.username) as display_name,
-                           u.profile_photo_url, gm.role, gm.joined_at
-                    FROM group_members gm
-                    JOIN users u ON gm.user_id = u.user_id
-                    WHERE gm.group_id = %s
-                    ORDER BY gm.role DESC, gm.joined_at ASC
-                """, (group_id,))
-            except Exception as e:
-                # Fallback if profile columns don't exist
-                error_msg = str(e).lower()
-                if 'does not exist' in error_msg or 'undefined_column' in error_msg or 'column' in error_msg:
+            # Group info (with the caller's role) and the member list don't depend on
+            # each other, so send both in one pipeline batch. A NULL role means the
+            # group exists but the user is not a member; the members are then discarded.
+            with conn.cursor() as members_cur:
+                with conn.pipeline():
                     cur.execute("""
-                        SELECT u.user_id, u.username, u.email, 
-                               u.username as display_name,
-                               NULL as profile_photo_url, gm.role, gm.joined_at
+                        SELECT g.group_id, g.name, g.description, g.created_by, g.created_at,
+                               u.username as creator_username, gm.role
+                        FROM groups g
+                        JOIN users u ON g.created_by = u.user_id
+                        LEFT JOIN group_members gm ON gm.group_id = g.group_id AND gm.user_id = %s
+                        WHERE g.group_id = %s
+                    """, (user_id, group_id))
+                    members_cur.execute(f"""
+                        SELECT u.user_id, u.username, u.email, {profile_columns},
+                               gm.role, gm.joined_at
                         FROM group_members gm
                         JOIN users u ON gm.user_id = u.user_id
                         WHERE gm.group_id = %s
                         ORDER BY gm.role DESC, gm.joined_at ASC
                     """, (group_id,))
-                else:
-                    raise
+                group_row = cur.fetchone()
+                member_rows = members_cur.fetchall()
+            
+            if not group_row:
+                app.logger.warning(f"Group {group_id} not found")
+                return jsonify({"error": "Group not found"}), 404
+            
+            if group_row[6] is None:
+                app.logger.warning(f"User {user_id} attempted to access group {group_id} but is not a member")
+                return jsonify({"error": "You are not a member of this group"}), 403
             
             members = []
-            for row in cur.fetchall():
+            for row in member_rows:
                 members.append({
                     "user_id": row[0],
                     "username": row[1],
@@ -2966,7 +3557,7 @@ def get_group_details(group_id):
                 })
             
             app.logger.info(f"Successfully retrieved details for group {group_id} with {len(members)} members")
-            return jsonify({
+            return json_response({
                 "success": True,
                 "group": {
                     "group_id": group_row[0],
@@ -2975,7 +3566,7 @@ def get_group_details(group_id):
                     "created_by": group_row[3],
                     "created_at": group_row[4].isoformat() if group_row[4] else None,
                     "creator_username": group_row[5],
-                    "your_role": membership[0]
+                    "your_role": group_row[6]
                 },
                 "members": members,
                 "current_user_id": user_id
@@ -2983,24 +3574,13 @@ def get_group_details(group_id):
             
     except Exception as e:
         app.logger.error(f"Error getting group details for group {group_id}: {e}", exc_info=True)
-        import traceback
-        app.logger.error(f"Traceback: {traceback.format_exc()}")
         return jsonify({"error": "Failed to get group details", "details": str(e)}), 500
 
 @app.route("/api/groups/<int:group_id>/members", methods=['POST', 'OPTIONS'])
+@require_auth
 def add_group_member(group_id):
     """Add a member to a group by username or email."""
-    if request.method == 'OPTIONS':
-        response = jsonify({})
-        response.headers.add('Access-Control-Allow-Origin', 'http://localhost:3000')
-        response.headers.add('Access-Control-Allow-Headers', 'Content-Type, Authorization, X-Auth-Token')
-        response.headers.add('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS')
-        response.headers.add('Access-Control-Allow-Credentials', 'true')
-        return response, 200
-    
-    user_id = get_user_id_from_request()
-    if not user_id:
-        return jsonify({"error": "Authentication required"}), 401
+    user_id = g.user_id
     
     try:
         data = request.get_json()
@@ -3010,43 +3590,43 @@ def add_group_member(group_id):
             return jsonify({"error": "Username or email is required"}), 400
         
         with get_conn() as conn, conn.cursor() as cur:
-            # Check if current user is admin
+            # Admin check, user lookup and insert in a single round-trip.
+            # The insert only runs when the caller is an admin; ON CONFLICT
+            # leaves existing members alone so "inserted" tells them apart.
             cur.execute("""
-                SELECT role FROM group_members
-                WHERE group_id = %s AND user_id = %s
-            """, (group_id, user_id))
-            membership = cur.fetchone()
-            
-            if not membership or membership[0] != 'admin':
+                WITH admin_check AS (
+                    SELECT 1 FROM group_members
+                    WHERE group_id = %s AND user_id = %s AND role = 'admin'
+                ),
+                target AS (
+                    SELECT user_id, username, email FROM users
+                    WHERE username = %s OR email = %s
+                    LIMIT 1
+                ),
+                inserted AS (
+                    INSERT INTO group_members (group_id, user_id, role)
+                    SELECT %s, t.user_id, 'member' FROM target t
+                    WHERE EXISTS (SELECT 1 FROM admin_check)
+                    ON CONFLICT (group_id, user_id) DO NOTHING
+                    RETURNING user_id
+                )
+                SELECT EXISTS (SELECT 1 FROM admin_check),
+                       t.user_id, t.username, t.email,
+                       EXISTS (SELECT 1 FROM inserted)
+                FROM (SELECT 1) AS one
+                LEFT JOIN target t ON TRUE
+            """, (group_id, user_id, identifier, identifier, group_id))
+            is_admin, new_member_id, member_username, member_email, was_inserted = cur.fetchone()
+            
+            if not is_admin:
                 return jsonify({"error": "Only group admins can add members"}), 403
             
-            # Find user by username or email
-            cur.execute("""
-                SELECT user_id, username, email FROM users 
-                WHERE username = %s OR email = %s
-            """, (identifier, identifier))
-            new_member = cur.fetchone()
-            
-            if not new_member:
+            if new_member_id is None:
                 return jsonify({"error": f"User not found with username/email: {identifier}"}), 404
             
-            new_member_id, member_username, member_email = new_member
-            
-            # Check if already a member
-            cur.execute("""
-                SELECT user_id FROM group_members
-                WHERE group_id = %s AND user_id = %s
-            """, (group_id, new_member_id))
-            
-            if cur.fetchone():
+            if not was_inserted:
                 return jsonify({"error": f"User {member_username} is already a member"}), 400
             
-            # Add member
-            cur.execute("""
-                INSERT INTO group_members (group_id, user_id, role)
-                VALUES (%s, %s, 'member')
-            """, (group_id, new_member_id))
-            
             conn.commit()
             
             return jsonify({
@@ -3064,46 +3644,44 @@ def add_group_member(group_id):
         return jsonify({"error": "Failed to add member", "details": str(e)}), 500
 
 @app.route("/api/groups/<int:group_id>/members/<int:member_id>", methods=['DELETE', 'OPTIONS'])
+@require_auth
 def remove_group_member(group_id, member_id):
     """Remove a member from a group."""
-    if request.method == 'OPTIONS':
-        response = jsonify({})
-        response.headers.add('Access-Control-Allow-Origin', 'http://localhost:3000')
-        response.headers.add('Access-Control-Allow-Headers', 'Content-Type, Authorization, X-Auth-Token')
-        response.headers.add('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS')
-        response.headers.add('Access-Control-Allow-Credentials', 'true')
-        return response, 200
-    
-    user_id = get_user_id_from_request()
-    if not user_id:
-        return jsonify({"error": "Authentication required"}), 401
+    user_id = g.user_id
     
     try:
         with get_conn() as conn, conn.cursor() as cur:
-            # Check if current user is admin
+            # Admin check and delete in a single round-trip. The delete never
+            # touches the caller's own row, so the self-removal check below
+            # keeps its place after the admin check.
             cur.execute("""
-                SELECT role FROM group_members
-                WHERE group_id = %s AND user_id = %s
-            """, (group_id, user_id))
-            membership = cur.fetchone()
+                WITH admin_check AS (
+                    SELECT 1 FROM group_members
+                    WHERE group_id = %s AND user_id = %s AND role = 'admin'
+                ),
+                removed AS (
+                    DELETE FROM group_members
+                    WHERE group_id = %s AND user_id = %s AND user_id <> %s
+                      AND EXISTS (SELECT 1 FROM admin_check)
+                    RETURNING user_id
+                )
+                SELECT EXISTS (SELECT 1 FROM admin_check),
+                       EXISTS (SELECT 1 FROM removed)
+            """, (group_id, user_id, group_id, member_id, user_id))
+            is_admin, was_removed = cur.fetchone()
             
-            if not membership or membership[0] != 'admin':
+            if not is_admin:
                 return jsonify({"error": "Only group admins can remove members"}), 403
             
             # Can't remove yourself
             if member_id == user_id:
                 return jsonify({"error": "Cannot remove yourself from group"}), 400
             
-            # Remove member
-            cur.execute("""
-                DELETE FROM group_members
-                WHERE group_id = %s AND user_id = %s
-            """, (group_id, member_id))
-            
-            if cur.rowcount == 0:
+            if not was_removed:
                 return jsonify({"error": "Member not found in group"}), 404
             
             conn.commit()
+            invalidate_route_cache(group_id, member_id)
             
             return jsonify({
                 "success": True,
@@ -3115,30 +3693,17 @@ def remove_group_member(group_id, member_id):
         return jsonify({"error": "Failed to remove member", "details": str(e)}), 500
 
 @app.route("/api/groups/<int:group_id>/messages", methods=['GET', 'OPTIONS'])
+@require_auth
 def get_group_messages(group_id):
     """Get messages for a group."""
-    if request.method == 'OPTIONS':
-        response = jsonify({})
-        response.headers.add('Access-Control-Allow-Origin', 'http://localhost:3000')
-        response.headers.add('Access-Control-Allow-Headers', 'Content-Type, Authorization, X-Auth-Token')
-        response.headers.add('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        response.headers.add('Access-Control-Allow-Credentials', 'true')
-        return response, 200
-    
-    user_id = get_user_id_from_request()
-    if not user_id:
-        return jsonify({"error": "Authentication required"}), 401
+    user_id = g.user_id
     
     try:
-        with get_conn() as conn, conn.cursor() as cur:
+        with get_read_conn() as conn, conn.cursor() as cur:
             # Check if user is a member
-            cur.execute("""
-                SELECT role FROM group_members
-                WHERE group_id = %s AND user_id = %s
-            """, (group_id, user_id))
-            membership = cur.fetchone()
+            role = get_group_role(cur, group_id, user_id)
             
-            if not membership:
+            if not role:
                 return jsonify({"error": "You are not a member of this group"}), 403
             
             # Get messages with user profile info
@@ -3167,26 +3732,17 @@ def get_group_messages(group_id):
                     "profile_photo_url": row[8]
                 })
             
-            return jsonify({"success": True, "messages": messages}), 200
+            return json_response({"success": True, "messages": messages}), 200
             
     except Exception as e:
         app.logger.error(f"Error getting messages for group {group_id}: {e}", exc_info=True)
         return jsonify({"error": "Failed to get messages", "details": str(e)}), 500
 
 @app.route("/api/groups/<int:group_id>/messages", methods=['POST', 'OPTIONS'])
+@require_auth
 def send_group_message(group_id):
     """Send a message to a group."""
-    if request.method == 'OPTIONS':
-        response = jsonify({})
-        response.headers.add('Access-Control-Allow-Origin', 'http://localhost:3000')
-        response.headers.add('Access-Control-Allow-Headers', 'Content-Type, Authorization, X-Auth-Token')
-        response.headers.add('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        response.headers.add('Access-Control-Allow-Credentials', 'true')
-        return response, 200
-    
-    user_id = get_user_id_from_request()
-    if not user_id:
-        return jsonify({"error": "Authentication required"}), 401
+    user_id = g.user_id
     
     try:
         data = request.get_json()
@@ -3200,13 +3756,9 @@ def send_group_message(group_id):
         
         with get_conn() as conn, conn.cursor() as cur:
             # Check if user is a member
-            cur.execute("""
-                SELECT role FROM group_members
-                WHERE group_id = %s AND user_id = %s
-            """, (group_id, user_id))
-            membership = cur.fetchone()
+            role = get_group_role(cur, group_id, user_id)
             
-            if not membership:
+            if not role:
                 return jsonify({"error": "You are not a member of this group"}), 403
             
             # Insert message
@@ -3245,126 +3797,112 @@ def send_group_message(group_id):
         app.logger.error(f"Error sending message to group {group_id}: {e}", exc_info=True)
         return jsonify({"error": "Failed to send message", "details": str(e)}), 500
 
+# Rows per round-trip when streaming group places from server-side cursors
+GROUP_PLACES_FETCH_SIZE = 500
+
 @app.route("/api/groups/<int:group_id>/places", methods=['GET', 'OPTIONS'])
+@require_auth
 def get_group_places(group_id):
-    if request.method == 'OPTIONS':
-        response = jsonify({})
-        response.headers.add('Access-Control-Allow-Origin', 'http://localhost:3000')
-        response.headers.add('Access-Control-Allow-Headers', 'Content-Type, Authorization, X-Auth-Token')
-        response.headers.add('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        response.headers.add('Access-Control-Allow-Credentials', 'true')
-        return response, 200
     """Get all places with member list statuses for a group."""
-    user_id = get_user_id_from_request()
-    if not user_id:
-        return jsonify({"error": "Authentication required"}), 401
+    user_id = g.user_id
     
     try:
         with get_conn() as conn, conn.cursor() as cur:
             # Check if user is a member
-            cur.execute("""
-                SELECT role FROM group_members
-                WHERE group_id = %s AND user_id = %s
-            """, (group_id, user_id))
-            membership = cur.fetchone()
+            role = get_group_role(cur, group_id, user_id)
             
-            if not membership:
+            if not role:
                 return jsonify({"error": "You are not a member of this group"}), 403
             
             # Get all places with member statuses
-            # We'll get places that at least one member has in their lists, plus all places
-            # For now, let's get places from search results or all places
+            # We'll get places that at least one member has in their lists
             # The frontend will filter by group member lists
             
-            # First, get all group member user IDs for debugging
-            cur.execute("""
-                SELECT gm.user_id, u.username FROM group_members gm
-                JOIN users u ON gm.user_id = u.user_id
-                WHERE gm.group_id = %s
-            """, (group_id,))
-            group_members_list = cur.fetchall()
-            member_ids = [row[0] for row in group_members_list]
-            app.logger.info(f"Group {group_id} has {len(member_ids)} members: {[row[1] for row in group_members_list]}")
-            
             # Get unique places from all group members' lists (with place_type)
-            cur.execute("""
-                SELECT DISTINCT p.id, p.name, p.city, p.state, p.country, p.lat, p.lon, pwt.place_type
-                FROM places p
-                LEFT JOIN places_with_types pwt ON p.id = pwt.id
-                WHERE p.id IN (
-                    SELECT DISTINCT place_id FROM user_visited_places
-                    WHERE user_id IN (SELECT user_id FROM group_members WHERE group_id = %s)
-                    UNION
-                    SELECT DISTINCT place_id FROM user_wishlist
-                    WHERE user_id IN (SELECT user_id FROM group_members WHERE group_id = %s)
-                    UNION
-                    SELECT DISTINCT place_id FROM user_liked_places
-                    WHERE user_id IN (SELECT user_id FROM group_members WHERE group_id = %s)
-                )
-                ORDER BY p.name
-            """, (group_id, group_id, group_id))
+            # Member ids are computed once; the IN below dedupes the place ids.
+            # Both queries use server-side cursors so rows arrive in batches
+            # instead of being buffered client-side before we build the response
+            places = []
+            places_by_id = {}
+            with conn.cursor(name="group_places") as places_cur:
+                places_cur.itersize = GROUP_PLACES_FETCH_SIZE
+                places_cur.execute("""
+                    WITH gm AS (
+                        SELECT user_id FROM group_members WHERE group_id = %s
+                    ),
+                    pids AS (
+                        SELECT place_id FROM user_visited_places
+                        WHERE user_id IN (SELECT user_id FROM gm)
+                        UNION ALL
+                        SELECT place_id FROM user_wishlist
+                        WHERE user_id IN (SELECT user_id FROM gm)
+                        UNION ALL
+                        SELECT place_id FROM user_liked_places
+                        WHERE user_id IN (SELECT user_id FROM gm)
+                    )
+                    SELECT DISTINCT p.id, p.name, p.city, p.state, p.country, p.lat, p.lon, pwt.place_type
+                    FROM places p
+                    LEFT JOIN places_with_types pwt ON p.id = pwt.id
+                    WHERE p.id IN (SELECT place_id FROM pids)
+                    ORDER BY p.name
+                """, (group_id,))
+                
+                for place_row in places_cur:
+                    place = {
+                        "id": place_row[0],
+                        "name": place_row[1],
+                        "city": place_row[2],
+                        "state": place_row[3],
+                        "country": place_row[4],
+                        "lat": float(place_row[5]) if place_row[5] else None,
+                        "lon": float(place_row[6]) if place_row[6] else None,
+                        "place_type": place_row[7] or "unknown",
+                        "members": []
+                    }
+                    places.append(place)
+                    places_by_id[place["id"]] = place
             
-            places_data = cur.fetchall()
-            app.logger.info(f"Found {len(places_data)} places in group {group_id} from member lists")
+            app.logger.debug(f"Found {len(places)} places in group {group_id} from member lists")
             
-            for member_id, member_username in group_members_list:
-                cur.execute("""
-                    SELECT COUNT(*) FROM user_visited_places WHERE user_id = %s
-                    UNION ALL
-                    SELECT COUNT(*) FROM user_wishlist WHERE user_id = %s
-                    UNION ALL
-                    SELECT COUNT(*) FROM user_liked_places WHERE user_id = %s
-                """, (member_id, member_id, member_id))
-                counts = cur.fetchall()
-                visited_count = counts[0][0] if len(counts) > 0 else 0
-                wishlist_count = counts[1][0] if len(counts) > 1 else 0
-                liked_count = counts[2][0] if len(counts) > 2 else 0
-                app.logger.info(f"Member {member_username} (ID: {member_id}) has: {visited_count} visited, {wishlist_count} wishlist, {liked_count} liked")
-            places = []
+            # No member has saved anything yet - nothing to look up statuses for
+            if not places:
+                return json_response({"success": True, "group_id": group_id, "places": []}), 200
             
-            for place_row in places_data:
-                place_id = place_row[0]
-                
-                # Get member statuses for this place
-                cur.execute("""
+            # Every member's status for every place in one query (rows ordered by place,
+            # then username), instead of one query per place
+            with conn.cursor(name="group_place_members") as members_cur:
+                members_cur.itersize = GROUP_PLACES_FETCH_SIZE
+                members_cur.execute("""
                     SELECT 
+                        pid,
                         u.user_id,
                         u.username,
-                        CASE WHEN v.visit_id IS NOT NULL THEN TRUE ELSE FALSE END as visited,
-                        CASE WHEN w.wish_id IS NOT NULL THEN TRUE ELSE FALSE END as in_wishlist,
-                        CASE WHEN l.like_id IS NOT NULL THEN TRUE ELSE FALSE END as liked
-                    FROM group_members gm
+                        v.visit_id IS NOT NULL as visited,
+                        w.wish_id IS NOT NULL as in_wishlist,
+                        l.like_id IS NOT NULL as liked
+                    FROM unnest(%s::int[]) AS pid
+                    CROSS JOIN group_members gm
                     JOIN users u ON gm.user_id = u.user_id
-                    LEFT JOIN user_visited_places v ON v.user_id = u.user_id AND v.place_id = %s
-                    LEFT JOIN user_wishlist w ON w.user_id = u.user_id AND w.place_id = %s
-                    LEFT JOIN user_liked_places l ON l.user_id = u.user_id AND l.place_id = %s
+                    LEFT JOIN user_visited_places v ON v.user_id = u.user_id AND v.place_id = pid
+                    LEFT JOIN user_wishlist w ON w.user_id = u.user_id AND w.place_id = pid
+                    LEFT JOIN user_liked_places l ON l.user_id = u.user_id AND l.place_id = pid
                     WHERE gm.group_id = %s
-                    ORDER BY u.username
-                """, (place_id, place_id, place_id, group_id))
-                
-                members = []
-                for member_row in cur.fetchall():
-                    members.append({
-                        "user_id": member_row[0],
-                        "username": member_row[1],
-                        "visited": member_row[2],
-                        "in_wishlist": member_row[3],
-                        "liked": member_row[4]
-                    })
+                    ORDER BY pid, u.username
+                """, (list(places_by_id), group_id))
                 
-                places.append({
-                    "id": place_id,
-                    "name": place_row[1],
-                    "city": place_row[2],
-                    "state": place_row[3],
-                    "country": place_row[4],
-                    "lat": float(place_row[5]) if place_row[5] else None,
-                    "lon": float(place_row[6]) if place_row[6] else None,
-                    "place_type": place_row[7] if len(place_row) > 7 and place_row[7] else "unknown",
-                    "members": members
-                })
-            
-            return jsonify({
+                for place_id, member_rows in groupby(members_cur, key=lambda row: row[0]):
+                    places_by_id[place_id]["members"] = [
+                        {
+                            "user_id": member_row[1],
+                            "username": member_row[2],
+                            "visited": member_row[3],
+                            "in_wishlist": member_row[4],
+                            "liked": member_row[5]
+                        }
+                        for member_row in member_rows
+                    ]
+            
+            return json_response({
                 "success": True,
                 "group_id": group_id,
                 "places": places
@@ -3378,87 +3916,114 @@ def get_group_places(group_id):
 # GROUP ROUTES ENDPOINTS
 # ============================================================================
 
+# The route is fetched on every map render but only changes through the
+# endpoints below, which drop the cached copy. The TTL bounds staleness from
+# changes made elsewhere (e.g. a place being renamed).
+ROUTE_CACHE_TTL = 30  # seconds
+
+def route_cache_key(group_id, user_id):
+    return f"route:{group_id}:{user_id}"
+
+def invalidate_route_cache(group_id, user_id=None):
+    """Drop one member's cached route, or every member's if user_id is None."""
+    if user_id is None:
+        # Keys are "route:{group_id}:{user_id}"
+        invalidate_cache(f"route:{group_id}")
+        return
+    cache = get_cache()
+    if not cache:
+        return
+    try:
+        cache.delete(route_cache_key(group_id, user_id))
+    except redis.RedisError as e:
+        app.logger.warning(f"Failed to invalidate route cache for group {group_id}: {e}")
+
+def cache_route_response(func):
+    """Serve the caller's route from Redis, caching successful responses for ROUTE_CACHE_TTL.
+    
+    Keys are per member, so a cached route is only ever returned to a user who
+    passed the membership check when it was built; removing a member drops their key.
+    """
+    @wraps(func)
+    def wrapper(group_id):
+        cache = get_cache()
+        key = route_cache_key(group_id, g.user_id)
+        if cache:
+            try:
+                body = cache.get(key)
+                if body:
+                    return Response(body, mimetype='application/json')
+            except redis.RedisError as e:
+                app.logger.warning(f"Route cache read failed: {e}")
+        
+        response = app.make_response(func(group_id))
+        if cache and response.status_code == 200:
+            try:
+                cache.setex(key, ROUTE_CACHE_TTL, response.get_data(as_text=True))
+            except redis.RedisError as e:
+                app.logger.warning(f"Route cache write failed: {e}")
+        return response
+    return wrapper
+
 @app.route("/api/groups/<int:group_id>/route", methods=['GET', 'OPTIONS'])
+@require_auth
+@cache_route_response
 def get_group_route(group_id):
     """Get route for a group (user customization if exists, otherwise group default)."""
-    if request.method == 'OPTIONS':
-        response = jsonify({})
-        response.headers.add('Access-Control-Allow-Origin', 'http://localhost:3000')
-        response.headers.add('Access-Control-Allow-Headers', 'Content-Type, Authorization, X-Auth-Token')
-        response.headers.add('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS')
-        response.headers.add('Access-Control-Allow-Credentials', 'true')
-        return response, 200
-    
-    user_id = get_user_id_from_request()
-    if not user_id:
-        return jsonify({"error": "Authentication required"}), 401
+    user_id = g.user_id
     
     try:
-        with get_conn() as conn, conn.cursor() as cur:
-            # Check if user is a member
-            cur.execute("""
-                SELECT role FROM group_members
-                WHERE group_id = %s AND user_id = %s
-            """, (group_id, user_id))
-            membership = cur.fetchone()
-            
-            if not membership:
-                return jsonify({"error": "You are not a member of this group"}), 403
-            
-            # Try to get user-customized route first
-            # Handle case where route tables don't exist yet (return empty route)
-            route_id = None
-            route_type = None
-            user_route = None
-            
+        with get_read_conn() as conn, conn.cursor() as cur:
+            # Membership, the route to show (user customization if exists,
+            # otherwise group default) and its places in one round-trip. Every
+            # row repeats role/route; route_place_id is NULL for an empty route.
             try:
                 cur.execute("""
-                    SELECT route_id FROM user_group_routes
-                    WHERE group_id = %s AND user_id = %s
-                """, (group_id, user_id))
-                user_route = cur.fetchone()
-            except Exception as e:
-                # Check if it's a table doesn't exist error
-                error_msg = str(e).lower()
-                if 'does not exist' in error_msg or 'undefined_table' in error_msg or 'relation' in error_msg:
-                    # Route tables don't exist yet - return empty route
-                    return jsonify({
-                        "success": True,
-                        "route_id": None,
-                        "route_type": None,
-                        "places": []
-                    }), 200
-                # Otherwise, re-raise the error
-                raise
+                    WITH user_route AS (
+                        SELECT route_id FROM user_group_routes
+                        WHERE group_id = %(group_id)s AND user_id = %(user_id)s
+                    ),
+                    chosen AS (
+                        SELECT route_id, 'user' AS route_type FROM user_route
+                        UNION ALL
+                        SELECT route_id, 'group' AS route_type FROM group_routes
+                        WHERE group_id = %(group_id)s
+                          AND NOT EXISTS (SELECT 1 FROM user_route)
+                    )
+                    SELECT m.role, c.route_id, c.route_type,
+                           rp.route_place_id, rp.place_id, rp.order_index,
+                           p.name, p.city, p.state, p.country, p.lat, p.lon,
+                           COALESCE(pwt.place_type, 'unknown') as place_type
+                    FROM (
+                        SELECT (
+                            SELECT role FROM group_members
+                            WHERE group_id = %(group_id)s AND user_id = %(user_id)s
+                        ) AS role
+                    ) m
+                    LEFT JOIN chosen c ON m.role IS NOT NULL
+                    LEFT JOIN (
+                        route_places rp
+                        JOIN places p ON rp.place_id = p.id
+                    ) ON rp.route_id = c.route_id AND rp.route_type = c.route_type
+                    LEFT JOIN places_with_types pwt ON p.id = pwt.id
+                    ORDER BY rp.order_index ASC
+                """, {"group_id": group_id, "user_id": user_id}, prepare=True)
+                rows = cur.fetchall()
+            except psycopg.errors.UndefinedTable:
+                # Route tables don't exist yet - members get an empty route
+                if not get_group_role(cur, group_id, user_id):
+                    return jsonify({"error": "You are not a member of this group"}), 403
+                return jsonify({
+                    "success": True,
+                    "route_id": None,
+                    "route_type": None,
+                    "places": []
+                }), 200
             
-            if user_route:
-                route_id = user_route[0]
-                route_type = 'user'
-            else:
-                # Fall back to group default route
-                try:
-                    cur.execute("""
-                        SELECT route_id FROM group_routes
-                        WHERE group_id = %s
-                    """, (group_id,))
-                    group_route = cur.fetchone()
-                except Exception as e:
-                    # Check if it's a table doesn't exist error
-                    error_msg = str(e).lower()
-                    if 'does not exist' in error_msg or 'undefined_table' in error_msg or 'relation' in error_msg:
-                        # Route tables don't exist yet - return empty route
-                        return jsonify({
-                            "success": True,
-                            "route_id": None,
-                            "route_type": None,
-                            "places": []
-                        }), 200
-                    # Otherwise, re-raise the error
-                    raise
-                
-                if group_route:
-                    route_id = group_route[0]
-                    route_type = 'group'
+            role, route_id, route_type = rows[0][:3]
+            
+            if not role:
+                return jsonify({"error": "You are not a member of this group"}), 403
             
             if not route_id:
                 return jsonify({
@@ -3468,76 +4033,56 @@ def get_group_route(group_id):
                     "places": []
                 }), 200
             
-            # Get places in route ordered by order_index
-            cur.execute("""
-                SELECT rp.route_place_id, rp.place_id, rp.order_index,
-                       p.name, p.city, p.state, p.country, p.lat, p.lon,
-                       COALESCE(pwt.place_type, 'unknown') as place_type
-                FROM route_places rp
-                JOIN places p ON rp.place_id = p.id
-                LEFT JOIN places_with_types pwt ON p.id = pwt.id
-                WHERE rp.route_id = %s AND rp.route_type = %s
-                ORDER BY rp.order_index ASC
-            """, (route_id, route_type))
-            
             places = []
-            for row in cur.fetchall():
+            for row in rows:
+                if row[3] is None:
+                    continue  # Route exists but has no places yet
                 places.append({
-                    "route_place_id": row[0],
-                    "place_id": row[1],
-                    "order_index": row[2],
-                    "name": row[3],
-                    "city": row[4],
-                    "state": row[5],
-                    "country": row[6],
-                    "lat": float(row[7]) if row[7] else None,
-                    "lon": float(row[8]) if row[8] else None,
-                    "place_type": row[9]
+                    "route_place_id": row[3],
+                    "place_id": row[4],
+                    "order_index": row[5],
+                    "name": row[6],
+                    "city": row[7],
+                    "state": row[8],
+                    "country": row[9],
+                    "lat": float(row[10]) if row[10] else None,
+                    "lon": float(row[11]) if row[11] else None,
+                    "place_type": row[12]
                 })
             
-            # Get may cover places
+            # Get may cover places. The connection is in autocommit mode, so a
+            # failure here (e.g. the table doesn't exist yet) doesn't poison the
+            # queries above - no savepoint needed.
             may_cover_places = []
             try:
-                # Use a savepoint so we can rollback if the table doesn't exist
-                cur.execute("SAVEPOINT may_cover_query")
-                try:
-                    cur.execute("""
-                        SELECT mcp.may_cover_place_id, mcp.place_id,
-                               p.name, p.city, p.state, p.country, p.lat, p.lon,
-                               COALESCE(pwt.place_type, 'unknown') as place_type
-                        FROM may_cover_places mcp
-                        JOIN places p ON mcp.place_id = p.id
-                        LEFT JOIN places_with_types pwt ON p.id = pwt.id
-                        WHERE mcp.route_id = %s AND mcp.route_type = %s
-                        ORDER BY mcp.added_at ASC
-                    """, (route_id, route_type))
-                    
-                    for row in cur.fetchall():
-                        may_cover_places.append({
-                            "may_cover_place_id": row[0],
-                            "place_id": row[1],
-                            "id": row[1],
-                            "name": row[2],
-                            "city": row[3],
-                            "state": row[4],
-                            "country": row[5],
-                            "lat": float(row[6]) if row[6] else None,
-                            "lon": float(row[7]) if row[7] else None,
-                            "place_type": row[8]
-                        })
-                    cur.execute("RELEASE SAVEPOINT may_cover_query")
-                except Exception as e:
-                    # If may_cover_places table doesn't exist yet, rollback to savepoint and continue
-                    error_msg = str(e).lower()
-                    if 'does not exist' in error_msg or 'undefined_table' in error_msg or 'relation' in error_msg:
-                        app.logger.warning(f"may_cover_places table doesn't exist yet: {e}")
-                        cur.execute("ROLLBACK TO SAVEPOINT may_cover_query")
-                        may_cover_places = []
-                    else:
-                        cur.execute("ROLLBACK TO SAVEPOINT may_cover_query")
-                        raise
-            except Exception as e:
-                # Fallback: if savepoint fails, just log and continue with empty list
+                cur.execute("""
+                    SELECT mcp.may_cover_place_id, mcp.place_id,
+                           p.name, p.city, p.state, p.country, p.lat, p.lon,
+                           COALESCE(pwt.place_type, 'unknown') as place_type
+                    FROM may_cover_places mcp
+                    JOIN places p ON mcp.place_id = p.id
+                    LEFT JOIN places_with_types pwt ON p.id = pwt.id
+                    WHERE mcp.route_id = %s AND mcp.route_type = %s
+                    ORDER BY mcp.added_at ASC
+                """, (route_id, route_type), prepare=True)
+                
+                for row in cur.fetchall():
+                    may_cover_places.append({
+                        "may_cover_place_id": row[0],
+                        "place_id": row[1],
+                        "id": row[1],
+                        "name": row[2],
+                        "city": row[3],
+                        "state": row[4],
+                        "country": row[5],
+                        "lat": float(row[6]) if row[6] else None,
+                        "lon": float(row[7]) if row[7] else None,
+                        "place_type": row[8]
+                    })
+            except psycopg.errors.UndefinedTable as e:
+                app.logger.warning(f"may_cover_places table doesn't exist yet: {e}")
+                may_cover_places = []
+            except psycopg.Error as e:
                 app.logger.warning(f"Error querying may_cover_places: {e}")
                 may_cover_places = []
             
@@ -3559,14 +4104,6 @@ def save_group_route(group_id):
     POST: Save as group default (admin only)
     PUT: Save as user customization
     """
-    if request.method == 'OPTIONS':
-        response = jsonify({})
-        response.headers.add('Access-Control-Allow-Origin', 'http://localhost:3000')
-        response.headers.add('Access-Control-Allow-Headers', 'Content-Type, Authorization, X-Auth-Token')
-        response.headers.add('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS')
-        response.headers.add('Access-Control-Allow-Credentials', 'true')
-        return response, 200
-    
     user_id = get_user_id_from_request()
     if not user_id:
         return jsonify({"error": "Authentication required"}), 401
@@ -3582,15 +4119,27 @@ def save_group_route(group_id):
         if not isinstance(may_cover_places, list):
             return jsonify({"error": "may_cover_places must be an array"}), 400
         
+        # Entries without a place_id are skipped, as before
+        try:
+            route_place_ids = []
+            route_order_indexes = []
+            for idx, place_data in enumerate(places):
+                if place_data.get("place_id"):
+                    route_place_ids.append(int(place_data["place_id"]))
+                    route_order_indexes.append(int(place_data.get("order_index", idx)))
+            may_cover_place_ids = [
+                int(place_data["place_id"])
+                for place_data in may_cover_places
+                if place_data.get("place_id")
+            ]
+        except (TypeError, ValueError, AttributeError):
+            return jsonify({"error": "place_id and order_index must be integers"}), 400
+        
         with get_conn() as conn, conn.cursor() as cur:
             # Check if user is a member
-            cur.execute("""
-                SELECT role FROM group_members
-                WHERE group_id = %s AND user_id = %s
-            """, (group_id, user_id))
-            membership = cur.fetchone()
+            role = get_group_role(cur, group_id, user_id)
             
-            if not membership:
+            if not role:
                 return jsonify({"error": "You are not a member of this group"}), 403
             
             route_type = None
@@ -3598,7 +4147,7 @@ def save_group_route(group_id):
             
             if request.method == 'POST':
                 # Save as group default (admin only)
-                if membership[0] != 'admin':
+                if role != 'admin':
                     return jsonify({"error": "Only group admins can save group default routes"}), 403
                 
                 route_type = 'group'
@@ -3657,23 +4206,16 @@ def save_group_route(group_id):
                 WHERE route_id = %s AND route_type = %s
             """, (route_id, route_type))
             
-            # Insert new route places
-            for idx, place_data in enumerate(places):
-                place_id = place_data.get("place_id")
-                order_index = place_data.get("order_index", idx)
-                
-                if not place_id:
-                    continue
-                
-                # Verify place exists
-                cur.execute("SELECT id FROM places WHERE id = %s", (place_id,))
-                if not cur.fetchone():
-                    continue
-                
+            # Insert new route places in one statement; the join drops ids of
+            # places that don't exist
+            if route_place_ids:
                 cur.execute("""
                     INSERT INTO route_places (route_id, route_type, place_id, order_index)
-                    VALUES (%s, %s, %s, %s)
-                """, (route_id, route_type, place_id, order_index))
+                    SELECT %s, %s, r.place_id, r.order_index
+                    FROM unnest(%s::int[], %s::int[]) WITH ORDINALITY AS r(place_id, order_index, n)
+                    JOIN places p ON p.id = r.place_id
+                    ORDER BY r.n
+                """, (route_id, route_type, route_place_ids, route_order_indexes))
             
             # Delete existing may cover places and insert new ones (if table exists)
             try:
@@ -3686,31 +4228,21 @@ def save_group_route(group_id):
                         WHERE route_id = %s AND route_type = %s
                     """, (route_id, route_type))
                     
-                    # Insert new may cover places
-                    for place_data in may_cover_places:
-                        place_id = place_data.get("place_id")
-                        
-                        if not place_id:
-                            continue
-                        
-                        # Verify place exists
-                        cur.execute("SELECT id FROM places WHERE id = %s", (place_id,))
-                        if not cur.fetchone():
-                            continue
-                        
-                        # Check if already in route places (don't add duplicates)
-                        cur.execute("""
-                            SELECT route_place_id FROM route_places
-                            WHERE route_id = %s AND route_type = %s AND place_id = %s
-                        """, (route_id, route_type, place_id))
-                        if cur.fetchone():
-                            continue  # Skip if already in route
-                        
+                    # Insert new may cover places that exist and aren't already
+                    # in the route (don't add duplicates)
+                    if may_cover_place_ids:
                         cur.execute("""
                             INSERT INTO may_cover_places (route_id, route_type, place_id)
-                            VALUES (%s, %s, %s)
+                            SELECT %s, %s, p.id
+                            FROM unnest(%s::int[]) WITH ORDINALITY AS m(place_id, n)
+                            JOIN places p ON p.id = m.place_id
+                            WHERE NOT EXISTS (
+                                SELECT 1 FROM route_places rp
+                                WHERE rp.route_id = %s AND rp.route_type = %s AND rp.place_id = p.id
+                            )
+                            ORDER BY m.n
                             ON CONFLICT (route_id, route_type, place_id) DO NOTHING
-                        """, (route_id, route_type, place_id))
+                        """, (route_id, route_type, may_cover_place_ids, route_id, route_type))
                     
                     cur.execute("RELEASE SAVEPOINT may_cover_save")
                 except Exception as e:
@@ -3727,6 +4259,8 @@ def save_group_route(group_id):
                 app.logger.warning(f"Error saving may_cover_places: {e}")
             
             conn.commit()
+            # A new group default changes the route of every member without their own
+            invalidate_route_cache(group_id, None if route_type == 'group' else user_id)
             
             return jsonify({
                 "success": True,
@@ -3742,14 +4276,6 @@ def save_group_route(group_id):
 @app.route("/api/groups/<int:group_id>/route/places/<int:place_id>", methods=['DELETE', 'OPTIONS'])
 def remove_route_place(group_id, place_id):
     """Remove a place from the current user's route (user customization only)."""
-    if request.method == 'OPTIONS':
-        response = jsonify({})
-        response.headers.add('Access-Control-Allow-Origin', 'http://localhost:3000')
-        response.headers.add('Access-Control-Allow-Headers', 'Content-Type, Authorization, X-Auth-Token')
-        response.headers.add('Access-Control-Allow-Methods', 'DELETE, OPTIONS')
-        response.headers.add('Access-Control-Allow-Credentials', 'true')
-        return response, 200
-    
     user_id = get_user_id_from_request()
     if not user_id:
         return jsonify({"error": "Authentication required"}), 401
@@ -3757,13 +4283,9 @@ def remove_route_place(group_id, place_id):
     try:
         with get_conn() as conn, conn.cursor() as cur:
             # Check if user is a member
-            cur.execute("""
-                SELECT role FROM group_members
-                WHERE group_id = %s AND user_id = %s
-            """, (group_id, user_id))
-            membership = cur.fetchone()
+            role = get_group_role(cur, group_id, user_id)
             
-            if not membership:
+            if not role:
                 return jsonify({"error": "You are not a member of this group"}), 403
             
             # Get user route (must be user customization, not group default)
@@ -3784,22 +4306,23 @@ def remove_route_place(group_id, place_id):
                 WHERE route_id = %s AND route_type = 'user' AND place_id = %s
             """, (route_id, place_id))
             
-            # Reorder remaining places
+            # Renumber remaining places 0..n-1 in one statement, only touching
+            # rows whose index actually changes
             cur.execute("""
-                SELECT route_place_id FROM route_places
-                WHERE route_id = %s AND route_type = 'user'
-                ORDER BY order_index ASC
+                UPDATE route_places rp
+                SET order_index = t.new_index
+                FROM (
+                    SELECT route_place_id,
+                           ROW_NUMBER() OVER (ORDER BY order_index ASC) - 1 AS new_index
+                    FROM route_places
+                    WHERE route_id = %s AND route_type = 'user'
+                ) t
+                WHERE rp.route_place_id = t.route_place_id
+                  AND rp.order_index <> t.new_index
             """, (route_id,))
             
-            remaining_ids = [row[0] for row in cur.fetchall()]
-            
-            for idx, rp_id in enumerate(remaining_ids):
-                cur.execute("""
-                    UPDATE route_places SET order_index = %s
-                    WHERE route_place_id = %s
-                """, (idx, rp_id))
-            
             conn.commit()
+            invalidate_route_cache(group_id, user_id)
             
             return jsonify({
                 "success": True,
@@ -3818,28 +4341,30 @@ def get_place_groups(place_id):
         return jsonify({"error": "Authentication required"}), 401
     
     try:
-        with get_conn() as conn, conn.cursor() as cur:
+        with get_read_conn() as conn, conn.cursor() as cur:
             # Get groups where:
-            # 1. User is a member
+            # 1. User is a member (one group_members row per group, so no DISTINCT)
             # 2. Place is in at least one member's list (visited, wishlist, or liked)
             cur.execute("""
-                SELECT DISTINCT g.group_id, g.name, g.description, gm.role as your_role
-                FROM groups g
-                JOIN group_members gm ON g.group_id = gm.group_id
-                WHERE gm.user_id = %s
-                AND g.group_id IN (
-                    SELECT DISTINCT gm2.group_id
+                WITH relevant_users AS (
+                    SELECT user_id FROM user_visited_places WHERE place_id = %(place_id)s
+                    UNION ALL
+                    SELECT user_id FROM user_wishlist WHERE place_id = %(place_id)s
+                    UNION ALL
+                    SELECT user_id FROM user_liked_places WHERE place_id = %(place_id)s
+                )
+                SELECT g.group_id, g.name, g.description, gm.role as your_role
+                FROM group_members gm
+                JOIN groups g ON g.group_id = gm.group_id
+                WHERE gm.user_id = %(user_id)s
+                AND EXISTS (
+                    SELECT 1
                     FROM group_members gm2
-                    WHERE gm2.user_id IN (
-                        SELECT user_id FROM user_visited_places WHERE place_id = %s
-                        UNION
-                        SELECT user_id FROM user_wishlist WHERE place_id = %s
-                        UNION
-                        SELECT user_id FROM user_liked_places WHERE place_id = %s
-                    )
+                    JOIN relevant_users ru ON ru.user_id = gm2.user_id
+                    WHERE gm2.group_id = gm.group_id
                 )
                 ORDER BY g.name
-            """, (user_id, place_id, place_id, place_id))
+            """, {"user_id": user_id, "place_id": place_id})
             
             groups = []
             for row in cur.fetchall():
@@ -3930,21 +4455,6 @@ def update_place(place_id):
                 "message": "You don't have permission to edit places"
             }), 403
         
-        # Check if user owns the place (for non-admin users)
-        if role != 'admin_user':
-            with get_conn() as conn, conn.cursor() as cur:
-                cur.execute("SELECT created_by FROM places WHERE id = %s", (place_id,))
-                result = cur.fetchone()
-                if not result:
-                    return jsonify({"error": "Place not found"}), 404
-                
-                place_creator = result[0]
-                if place_creator != user_id:
-                    return jsonify({
-                        "error": "Permission denied",
-                        "message": "You can only edit places you created"
-                    }), 403
-        
         # Get update data
         data = request.get_json()
         
@@ -3987,15 +4497,30 @@ def update_place(place_id):
         updates.append("updated_at = CURRENT_TIMESTAMP")
         params.append(place_id)
         
+        # Non-admins can only edit their own places - checked by the UPDATE itself
+        owner_filter = ""
+        if role != 'admin_user':
+            owner_filter = " AND created_by = %s"
+            params.append(user_id)
+        
         with get_conn() as conn, conn.cursor() as cur:
-            sql = f"UPDATE places SET {', '.join(updates)} WHERE id = %s RETURNING id, name, city, state, country, lat, lon, updated_at"
+            sql = f"UPDATE places SET {', '.join(updates)} WHERE id = %s{owner_filter} RETURNING id, name, city, state, country, lat, lon, updated_at"
             cur.execute(sql, params)
             result = cur.fetchone()
             
             if not result:
+                # Only now find out whether the place is missing or someone else's
+                cur.execute("SELECT 1 FROM places WHERE id = %s", (place_id,))
+                if cur.fetchone():
+                    return jsonify({
+                        "error": "Permission denied",
+                        "message": "You can only edit places you created"
+                    }), 403
                 return jsonify({"error": "Place not found"}), 404
             
             conn.commit()
+            schedule_invalidate("stats", "analytics")
+            schedule_mv_refresh()
             
             return jsonify({
                 "success": True,
@@ -4033,30 +4558,28 @@ def delete_place(place_id):
                 "message": "Only admin and curator users can delete places"
             }), 403
         
-        # Check if user owns the place (for curator)
-        if role == 'curator_user':
-            with get_conn() as conn, conn.cursor() as cur:
-                cur.execute("SELECT created_by FROM places WHERE id = %s", (place_id,))
-                result = cur.fetchone()
-                if not result:
-                    return jsonify({"error": "Place not found"}), 404
-                
-                place_creator = result[0]
-                if place_creator != user_id:
-                    return jsonify({
-                        "error": "Permission denied",
-                        "message": "You can only delete places you created"
-                    }), 403
-        
-        # Delete place (CASCADE will handle type-specific tables)
+        # Delete place (CASCADE will handle type-specific tables).
+        # Curators can only delete their own places - checked by the DELETE itself
         with get_conn() as conn, conn.cursor() as cur:
-            cur.execute("DELETE FROM places WHERE id = %s RETURNING id, name", (place_id,))
+            if role == 'curator_user':
+                cur.execute("DELETE FROM places WHERE id = %s AND created_by = %s RETURNING id, name", (place_id, user_id))
+            else:
+                cur.execute("DELETE FROM places WHERE id = %s RETURNING id, name", (place_id,))
             result = cur.fetchone()
             
             if not result:
+                # Only now find out whether the place is missing or someone else's
+                cur.execute("SELECT 1 FROM places WHERE id = %s", (place_id,))
+                if cur.fetchone():
+                    return jsonify({
+                        "error": "Permission denied",
+                        "message": "You can only delete places you created"
+                    }), 403
                 return jsonify({"error": "Place not found"}), 404
             
             conn.commit()
+            schedule_invalidate("stats", "analytics")
+            schedule_mv_refresh()
             
             return jsonify({
                 "success": True,
@@ -4090,13 +4613,7 @@ def internal_error(error):
     """Handle 500 errors - Sentry automatically captures these."""
     # Skip error handling for OPTIONS requests
     if request.method == 'OPTIONS':
-        from flask import Response
-        resp = Response(status=200)
-        resp.headers.add('Access-Control-Allow-Origin', 'http://localhost:3000')
-        resp.headers.add('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS')
-        resp.headers.add('Access-Control-Allow-Headers', 'Content-Type, Authorization, X-Auth-Token')
-        resp.headers.add('Access-Control-Allow-Credentials', 'true')
-        return resp
+        return preflight_response()
     
     app.logger.error(f"Internal server error: {error}", exc_info=True, extra={
         "path": request.path,
@@ -4121,23 +4638,14 @@ def handle_exception(e):
     
     # Skip error handling for OPTIONS requests - return proper CORS response
     if has_request_context() and request.method == 'OPTIONS':
-        from flask import Response
-        resp = Response(status=200)
-        resp.headers.add('Access-Control-Allow-Origin', 'http://localhost:3000')
-        resp.headers.add('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS')
-        resp.headers.add('Access-Control-Allow-Headers', 'Content-Type, Authorization, X-Auth-Token')
-        resp.headers.add('Access-Control-Allow-Credentials', 'true')
-        return resp
-    
-    # Log the error
-    import traceback
-    error_trace = traceback.format_exc()
+        return preflight_response()
+    
+    # Log the error (exc_info=True already includes the traceback)
     app.logger.error(f"Unhandled exception: {e}", exc_info=True, extra={
         "path": request.path if has_request_context() else "unknown",
         "method": request.method if has_request_context() else "unknown",
         "ip": request.remote_addr if has_request_context() else "unknown"
     })
-    app.logger.error(f"Traceback: {error_trace}")
     
     # Send to Sentry (if available)
     if SENTRY_AVAILABLE:
@@ -4150,7 +4658,8 @@ def handle_exception(e):
         "message": str(e) if is_dev else "Internal server error"
     }
     if is_dev:
-        error_response["traceback"] = error_trace.split('\n')[-5:]  # Last 5 lines
+        import traceback
+        error_response["traceback"] = traceback.format_exc().split('\n')[-5:]  # Last 5 lines
     
     return jsonify(error_response), 500
 
@@ -11,6 +11,7 @@ import redis
 import json
 import hashlib
 import os
+import threading
 from functools import wraps
 from typing import Optional, Callable, Any
 
@@ -18,6 +19,13 @@ REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 
 _cache_client = None
 
+# Writes can come in bursts (CSV uploads, several adds in a row); collect the
+# patterns and flush them together shortly after instead of on every request.
+INVALIDATION_DELAY = 0.1
+_pending_invalidations = set()
+_invalidation_lock = threading.Lock()
+_invalidation_timer = None
+
 def get_cache():
     """Get Redis cache client (or None if unavailable)."""
     global _cache_client
@@ -106,13 +114,40 @@ def invalidate_cache(pattern: str):
         return
     
     try:
-        keys = cache.keys(f"cache:{pattern}*")
+        # Keys are built as "{key_prefix}:{func}:{hash}" by @cached
+        keys = list(cache.scan_iter(f"{pattern}:*"))
         if keys:
             cache.delete(*keys)
             print(f"✅ Invalidated {len(keys)} cache entries")
     except redis.RedisError as e:
         print(f"Cache invalidation error: {e}")
 
+def _flush_invalidations():
+    """Run all invalidations queued since the timer was started."""
+    global _invalidation_timer
+    with _invalidation_lock:
+        patterns = set(_pending_invalidations)
+        _pending_invalidations.clear()
+        _invalidation_timer = None
+    
+    for pattern in patterns:
+        invalidate_cache(pattern)
+
+def schedule_invalidate(*patterns: str):
+    """
+    Queue cache invalidation off the request path.
+    
+    Repeated patterns within INVALIDATION_DELAY are coalesced into one
+    invalidation by a single background timer.
+    """
+    global _invalidation_timer
+    with _invalidation_lock:
+        _pending_invalidations.update(patterns)
+        if _invalidation_timer is None:
+            _invalidation_timer = threading.Timer(INVALIDATION_DELAY, _flush_invalidations)
+            _invalidation_timer.daemon = True
+            _invalidation_timer.start()
+
 def clear_all_cache():
     """Clear all cache entries (use with caution!)."""
     cache = get_cache()
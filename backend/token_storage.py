@@ -22,6 +22,7 @@ except ImportError:
 
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 TOKEN_TTL = 1800  # 30 minutes
+REVOCATION_CHANNEL = "token:revoked"  # Pub/sub channel other workers listen on
 
 # Fallback in-memory storage (ONLY for development)
 _fallback_storage = {}
@@ -97,9 +98,10 @@ class TokenStorage:
             return token_data
     
     def delete_token(self, token: str) -> None:
-        """Delete token."""
+        """Delete token and tell other workers to drop any cached copy."""
         if self.use_redis:
             self.redis_client.delete(f"token:{token}")
+            self.redis_client.publish(REVOCATION_CHANNEL, token)
         else:
             # Fallback: in-memory storage
             _fallback_storage.pop(token, None)
@@ -114,6 +116,19 @@ class TokenStorage:
                 _fallback_storage[token]["expires_at"] = time.time() + additional_seconds
                 return True
             return False
+    
+    def subscribe_revocations(self, callback) -> bool:
+        """Call callback(token) for every token deleted by any worker.
+        
+        Listens on a daemon thread; returns False when there is no Redis to
+        listen on (the in-memory fallback is single-process anyway).
+        """
+        if not self.use_redis:
+            return False
+        pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{REVOCATION_CHANNEL: lambda message: callback(message["data"])})
+        pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+        return True
 
 # Global instance
 _token_storage = None
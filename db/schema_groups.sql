@@ -35,14 +35,17 @@ CREATE TABLE IF NOT EXISTS group_members (
     joined_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     role VARCHAR(20) DEFAULT 'member',  -- 'admin', 'member'
     
-    PRIMARY KEY (group_id, user_id),
+    -- INCLUDE lets the per-request (group_id, user_id) role check run as an
+    -- index-only scan; the key also serves group_id-only lookups
+    PRIMARY KEY (group_id, user_id) INCLUDE (role, joined_at),
     CONSTRAINT chk_member_role CHECK (role IN ('admin', 'member')),
     CONSTRAINT fk_group_member_group FOREIGN KEY (group_id) REFERENCES groups(group_id),
     CONSTRAINT fk_group_member_user FOREIGN KEY (user_id) REFERENCES users(user_id)
 );
 
-CREATE INDEX IF NOT EXISTS idx_group_members_group ON group_members(group_id);
-CREATE INDEX IF NOT EXISTS idx_group_members_user ON group_members(user_id);
+-- A user's groups (/api/groups), index-only
+CREATE INDEX IF NOT EXISTS idx_group_members_user
+    ON group_members(user_id) INCLUDE (group_id, role, joined_at);
 COMMENT ON TABLE group_members IS 'Membership of users in groups';
 
 -- ============================================================================
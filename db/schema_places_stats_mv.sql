@@ -0,0 +1,52 @@
+-- Geospatial Web Application - Materialized Place Statistics
+-- Course: CSCI 765 – Intro to Database Systems
+-- Project: Geospatial Web Application
+-- Student: Yethin Chandra Sai Mannem
+-- Date: 2024
+--
+-- Description:
+--   Single-row materialized view with the numbers behind GET /stats (total
+--   count, top 10 states, lat/lon bounds). Computing them needs three full
+--   scans of places, so they are precomputed here and refreshed out-of-band
+--   (hourly is plenty for dashboard statistics). The backend falls back to
+--   live queries if this view has not been created.
+--
+--   Run after schema.sql.
+
+-- ============================================================================
+-- PLACES_STATS_MV MATERIALIZED VIEW
+-- ============================================================================
+CREATE MATERIALIZED VIEW IF NOT EXISTS places_stats_mv AS
+SELECT
+    1 AS id,
+    (SELECT COUNT(*) FROM places) AS total_places,
+    (SELECT COALESCE(json_agg(t), '[]'::json)
+     FROM (
+         SELECT state, COUNT(*) AS count
+         FROM places
+         WHERE state IS NOT NULL
+         GROUP BY state
+         ORDER BY count DESC
+         LIMIT 10
+     ) t) AS top_states,
+    (SELECT row_to_json(b)
+     FROM (
+         SELECT
+             MIN(lat) AS min_lat, MAX(lat) AS max_lat,
+             MIN(lon) AS min_lon, MAX(lon) AS max_lon
+         FROM places
+     ) b) AS bounds;
+
+-- Unique index is required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS idx_places_stats_mv_id ON places_stats_mv (id);
+
+COMMENT ON MATERIALIZED VIEW places_stats_mv IS 'Precomputed /stats numbers (refresh hourly)';
+
+-- ============================================================================
+-- REFRESH SCHEDULE
+-- ============================================================================
+-- With the pg_cron extension installed:
+--   SELECT cron.schedule('refresh-places-stats', '0 * * * *',
+--                        'REFRESH MATERIALIZED VIEW CONCURRENTLY places_stats_mv');
+-- Or from the system crontab:
+--   0 * * * * psql "$DATABASE_URL" -c 'REFRESH MATERIALIZED VIEW CONCURRENTLY places_stats_mv'
@@ -0,0 +1,32 @@
+-- Geospatial Web Application - Materialized Places With Types
+-- Course: CSCI 765 – Intro to Database Systems
+-- Project: Geospatial Web Application
+-- Student: Yethin Chandra Sai Mannem
+-- Date: 2024
+--
+-- Description:
+--   Materialized copy of the places_with_types view. The regular view re-runs
+--   its four LEFT JOINs on every search; the API is read-heavy, so we pay the
+--   join cost once at write time instead. The backend refreshes this view
+--   (CONCURRENTLY) after places are added, updated, or deleted.
+--
+--   Run after schema_place_types.sql and add_*_filter_fields.sql.
+
+-- ============================================================================
+-- PLACES_WITH_TYPES_MV MATERIALIZED VIEW
+-- ============================================================================
+CREATE MATERIALIZED VIEW IF NOT EXISTS places_with_types_mv AS
+SELECT * FROM places_with_types;
+
+-- Unique index is required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS idx_places_with_types_mv_id ON places_with_types_mv (id);
+
+-- Spatial index for radius/bbox searches; INCLUDE lets the place_type/state
+-- filters run inside the index scan without extra heap fetches
+CREATE INDEX IF NOT EXISTS idx_places_with_types_mv_geom
+    ON places_with_types_mv USING GIST (geom) INCLUDE (place_type, state);
+
+-- Index for place type and state filters
+CREATE INDEX IF NOT EXISTS idx_places_with_types_mv_type_state ON places_with_types_mv (place_type, state);
+
+COMMENT ON MATERIALIZED VIEW places_with_types_mv IS 'Materialized places_with_types for fast searches (refresh after writes to places)';
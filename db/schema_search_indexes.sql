@@ -0,0 +1,38 @@
+-- Geospatial Web Application - Search Filter Indexes
+-- Course: CSCI 765 – Intro to Database Systems
+-- Project: Geospatial Web Application
+-- Student: Yethin Chandra Sai Mannem
+-- Date: 2024
+--
+-- Description:
+--   Indexes for the filters that /within_radius, /within_bbox and /nearest
+--   apply on top of the spatial predicate: place_type = ANY(...),
+--   state ILIKE '%...%' and name ILIKE '%...%'.
+--
+--   Plain btree indexes can't serve ILIKE with a leading wildcard, so name
+--   and state get pg_trgm GIN indexes. The materialized view's covering
+--   GiST index is defined with the view in schema_places_with_types_mv.sql.
+--
+--   Run after schema_places_with_types_mv.sql. CREATE INDEX CONCURRENTLY
+--   cannot run inside a transaction block, so run this file with plain psql
+--   (no --single-transaction).
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- ============================================================================
+-- PLACES (used by places_with_types, /within_bbox, /nearest and exports)
+-- ============================================================================
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_places_name_trgm
+    ON places USING GIN (name gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_places_state_trgm
+    ON places USING GIN (state gin_trgm_ops);
+
+-- ============================================================================
+-- PLACES_WITH_TYPES_MV (used by /within_radius)
+-- ============================================================================
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_places_with_types_mv_name_trgm
+    ON places_with_types_mv USING GIN (name gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_places_with_types_mv_state_trgm
+    ON places_with_types_mv USING GIN (state gin_trgm_ops);
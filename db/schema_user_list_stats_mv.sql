@@ -0,0 +1,47 @@
+-- Geospatial Web Application - Materialized User List Statistics
+-- Course: CSCI 765 – Intro to Database Systems
+-- Project: Geospatial Web Application
+-- Student: Yethin Chandra Sai Mannem
+-- Date: 2024
+--
+-- Description:
+--   Single-row materialized view with the numbers behind GET /api/users/stats
+--   (user count, users with any list activity, per-list totals). The active
+--   users figure needs a UNION over all three list tables, so these are
+--   precomputed and refreshed out-of-band like places_stats_mv. The backend
+--   falls back to a live query if this view has not been created.
+--
+--   Run after schema_user_lists.sql.
+
+-- ============================================================================
+-- USER_LIST_STATS_MV MATERIALIZED VIEW
+-- ============================================================================
+CREATE MATERIALIZED VIEW IF NOT EXISTS user_list_stats_mv AS
+SELECT
+    1 AS id,
+    (SELECT COUNT(*) FROM users) AS total_users,
+    (SELECT COUNT(*)
+     FROM (
+         SELECT user_id FROM user_visited_places
+         UNION
+         SELECT user_id FROM user_wishlist
+         UNION
+         SELECT user_id FROM user_liked_places
+     ) active_users) AS active_users,
+    (SELECT COUNT(*) FROM user_visited_places) AS total_visited,
+    (SELECT COUNT(*) FROM user_wishlist) AS total_wishlist,
+    (SELECT COUNT(*) FROM user_liked_places) AS total_liked;
+
+-- Unique index is required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS idx_user_list_stats_mv_id ON user_list_stats_mv (id);
+
+COMMENT ON MATERIALIZED VIEW user_list_stats_mv IS 'Precomputed /api/users/stats numbers (refresh every few minutes)';
+
+-- ============================================================================
+-- REFRESH SCHEDULE
+-- ============================================================================
+-- With the pg_cron extension installed:
+--   SELECT cron.schedule('refresh-user-list-stats', '*/5 * * * *',
+--                        'REFRESH MATERIALIZED VIEW CONCURRENTLY user_list_stats_mv');
+-- Or from the system crontab:
+--   */5 * * * * psql "$DATABASE_URL" -c 'REFRESH MATERIALIZED VIEW CONCURRENTLY user_list_stats_mv'
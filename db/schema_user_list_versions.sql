@@ -0,0 +1,104 @@
+-- Geospatial Web Application - User List Versions
+-- Course: CSCI 765 – Intro to Database Systems
+-- Project: Geospatial Web Application
+-- Student: Yethin Chandra Sai Mannem
+-- Date: 2024
+--
+-- Description:
+--   A change counter per (user, list), bumped by triggers on every insert,
+--   update, or delete in user_visited_places, user_wishlist and
+--   user_liked_places, and for every user holding a place when that place's
+--   listed columns (name, location) change. The list GET endpoints read it
+--   (one primary key lookup) to build an ETag, and answer 304 Not Modified
+--   without running the list query when the client already has the current
+--   version. The backend skips ETags if this table has not been created.
+--
+--   Run after schema_user_lists.sql.
+
+-- ============================================================================
+-- USER_LIST_VERSIONS TABLE
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS user_list_versions (
+    user_id INTEGER NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
+    list_name VARCHAR(20) NOT NULL,  -- 'visited', 'wishlist' or 'liked'
+    version BIGINT NOT NULL DEFAULT 1,
+    PRIMARY KEY (user_id, list_name)
+);
+
+COMMENT ON TABLE user_list_versions IS 'Change counters for personal lists (ETags for list GETs)';
+
+-- ============================================================================
+-- TRIGGERS
+-- ============================================================================
+-- SECURITY DEFINER so the role that edits a list doesn't also need
+-- write access to user_list_versions; search_path is pinned so callers
+-- can't shadow user_list_versions with their own objects
+CREATE OR REPLACE FUNCTION bump_user_list_version()
+RETURNS TRIGGER AS $$
+DECLARE
+    changed_user_id INTEGER;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        changed_user_id := OLD.user_id;
+    ELSE
+        changed_user_id := NEW.user_id;
+    END IF;
+    
+    INSERT INTO user_list_versions (user_id, list_name)
+    VALUES (changed_user_id, TG_ARGV[0])
+    ON CONFLICT (user_id, list_name)
+    DO UPDATE SET version = user_list_versions.version + 1;
+    
+    IF TG_OP = 'DELETE' THEN
+        RETURN OLD;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER
+SET search_path = public, pg_temp;
+
+DROP TRIGGER IF EXISTS trg_user_visited_places_version ON user_visited_places;
+CREATE TRIGGER trg_user_visited_places_version
+AFTER INSERT OR UPDATE OR DELETE ON user_visited_places
+FOR EACH ROW
+EXECUTE FUNCTION bump_user_list_version('visited');
+
+DROP TRIGGER IF EXISTS trg_user_wishlist_version ON user_wishlist;
+CREATE TRIGGER trg_user_wishlist_version
+AFTER INSERT OR UPDATE OR DELETE ON user_wishlist
+FOR EACH ROW
+EXECUTE FUNCTION bump_user_list_version('wishlist');
+
+DROP TRIGGER IF EXISTS trg_user_liked_places_version ON user_liked_places;
+CREATE TRIGGER trg_user_liked_places_version
+AFTER INSERT OR UPDATE OR DELETE ON user_liked_places
+FOR EACH ROW
+EXECUTE FUNCTION bump_user_list_version('liked');
+
+-- Lists show the place's own name and location, so editing those must also
+-- invalidate the ETag of every list that holds the place
+CREATE OR REPLACE FUNCTION bump_list_versions_for_place()
+RETURNS TRIGGER AS $$
+BEGIN
+    -- UNIQUE (user_id, place_id) on each list means one row per (user, list)
+    INSERT INTO user_list_versions (user_id, list_name)
+    SELECT user_id, 'visited' FROM user_visited_places WHERE place_id = NEW.id
+    UNION ALL
+    SELECT user_id, 'wishlist' FROM user_wishlist WHERE place_id = NEW.id
+    UNION ALL
+    SELECT user_id, 'liked' FROM user_liked_places WHERE place_id = NEW.id
+    ON CONFLICT (user_id, list_name)
+    DO UPDATE SET version = user_list_versions.version + 1;
+    
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER
+SET search_path = public, pg_temp;
+
+DROP TRIGGER IF EXISTS trg_places_list_version ON places;
+CREATE TRIGGER trg_places_list_version
+AFTER UPDATE OF name, city, state, country, lat, lon ON places
+FOR EACH ROW
+WHEN ((OLD.name, OLD.city, OLD.state, OLD.country, OLD.lat, OLD.lon)
+      IS DISTINCT FROM (NEW.name, NEW.city, NEW.state, NEW.country, NEW.lat, NEW.lon))
+EXECUTE FUNCTION bump_list_versions_for_place();
@@ -51,8 +51,10 @@ CREATE TABLE IF NOT EXISTS user_visited_places (
     CONSTRAINT fk_place_visited FOREIGN KEY (place_id) REFERENCES places(id)
 );
 
-CREATE INDEX IF NOT EXISTS idx_visited_user ON user_visited_places(user_id);
-CREATE INDEX IF NOT EXISTS idx_visited_place ON user_visited_places(place_id);
+-- One user's list already in response order (also serves plain user_id lookups)
+CREATE INDEX IF NOT EXISTS idx_visited_user_date ON user_visited_places(user_id, visited_at DESC);
+-- Who saved a place (get_place_groups), answered from the index alone
+CREATE INDEX IF NOT EXISTS idx_visited_place_user ON user_visited_places(place_id, user_id);
 CREATE INDEX IF NOT EXISTS idx_visited_date ON user_visited_places(visited_at DESC);
 COMMENT ON TABLE user_visited_places IS 'Track places users have visited';
 
@@ -73,8 +75,10 @@ CREATE TABLE IF NOT EXISTS user_wishlist (
     CONSTRAINT fk_place_wish FOREIGN KEY (place_id) REFERENCES places(id)
 );
 
-CREATE INDEX IF NOT EXISTS idx_wishlist_user ON user_wishlist(user_id);
-CREATE INDEX IF NOT EXISTS idx_wishlist_place ON user_wishlist(place_id);
+-- One user's list already in response order (also serves plain user_id lookups)
+CREATE INDEX IF NOT EXISTS idx_wishlist_user_priority ON user_wishlist(user_id, priority DESC, added_at DESC);
+-- Who saved a place (get_place_groups), answered from the index alone
+CREATE INDEX IF NOT EXISTS idx_wishlist_place_user ON user_wishlist(place_id, user_id);
 CREATE INDEX IF NOT EXISTS idx_wishlist_priority ON user_wishlist(priority DESC, added_at DESC);
 COMMENT ON TABLE user_wishlist IS 'Places users want to visit (wishlist)';
 
@@ -95,8 +99,10 @@ CREATE TABLE IF NOT EXISTS user_liked_places (
     CONSTRAINT fk_place_liked FOREIGN KEY (place_id) REFERENCES places(id)
 );
 
-CREATE INDEX IF NOT EXISTS idx_liked_user ON user_liked_places(user_id);
-CREATE INDEX IF NOT EXISTS idx_liked_place ON user_liked_places(place_id);
+-- One user's list already in response order (also serves plain user_id lookups)
+CREATE INDEX IF NOT EXISTS idx_liked_user_date ON user_liked_places(user_id, liked_at DESC);
+-- Who saved a place (get_place_groups), answered from the index alone
+CREATE INDEX IF NOT EXISTS idx_liked_place_user ON user_liked_places(place_id, user_id);
 CREATE INDEX IF NOT EXISTS idx_liked_date ON user_liked_places(liked_at DESC);
 COMMENT ON TABLE user_liked_places IS 'Places users have liked/favorited';
 
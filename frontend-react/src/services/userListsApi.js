@@ -155,10 +155,25 @@ export async function removeFromLiked(placeId) {
   });
 }
 
+// listName: 'visited', 'wishlist' or 'liked'
+export async function removeFromListBatch(listName, placeIds) {
+  return fetchAPI(`/api/user/${listName}/delete-batch`, {
+    method: 'POST',
+    body: JSON.stringify({ place_ids: placeIds }),
+  });
+}
+
 export async function getPlaceStatus(placeId) {
   return fetchAPI(`/api/user/place-status/${placeId}`);
 }
 
+export async function getPlaceStatuses(placeIds) {
+  return fetchAPI('/api/user/place-status', {
+    method: 'POST',
+    body: JSON.stringify({ place_ids: placeIds }),
+  });
+}
+
 // ============================================================================
 // GROUPS API
 // ============================================================================